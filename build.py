@@ -3,6 +3,12 @@ import sys
 import shutil
 import subprocess
 
+def check_import_budget():
+    """Verifica o tempo de importação da inicialização (tools/check_import_budget.py)"""
+    print("Verificando o orçamento de importação da inicialização...")
+    result = subprocess.run([sys.executable, os.path.join("tools", "check_import_budget.py")])
+    return result.returncode == 0
+
 def build_executable():
     """Cria o executável do aplicativo"""
     print("Criando executável com PyInstaller...")
@@ -28,6 +34,7 @@ def build_executable():
         "--hidden-import=requests",
         "--hidden-import=reportlab",
         "--hidden-import=PIL",
+        "--collect-submodules=ui.tabs",  # Abas importadas sob demanda
         "main.py"
     ]
     
@@ -38,4 +45,8 @@ def build_executable():
     print("O executável está disponível em: dist/AutoRepairShop/AutoRepairShop.exe")
 
 if __name__ == "__main__":
+    # O executável só é gerado se a inicialização continuar dentro do orçamento
+    if not check_import_budget():
+        print("Build cancelado: a verificação do orçamento de importação falhou.")
+        sys.exit(1)
     build_executable()
\ No newline at end of file
@@ -39,4 +39,57 @@ logging.basicConfig(
 logger = logging.getLogger(APP_NAME)
 
 # Configurações da API de veículos
-VEHICLE_API_URL = "https://parallelum.com.br/fipe/api/v1"
\ No newline at end of file
+VEHICLE_API_URL = "https://parallelum.com.br/fipe/api/v1"
+
+# Livro de estoque: gravar um saldo de referência a cada N movimentações por peça
+STOCK_CHECKPOINT_INTERVAL = 50
+
+# Numeração das ordens de serviço (ex.: OS-001, OS-MTZ-2025-001)
+ORDER_NUMBER_PREFIX = "OS"
+ORDER_NUMBER_BRANCH = ""        # Código da filial; vazio para numeração única
+ORDER_NUMBER_PER_YEAR = False   # Reiniciar a numeração a cada ano
+
+# Carregamento das tabelas: linhas buscadas por página ao rolar a listagem
+TABLE_PAGE_SIZE = 200
+
+# Relatórios em PDF: linhas lidas do banco (e desenhadas) por vez
+REPORT_PAGE_SIZE = 500
+
+# Abas construídas antecipadamente, uma por vez, quando a interface está ociosa
+TAB_PREFETCH_ORDER = ['service_orders_tab', 'clients_tab']
+TAB_PREFETCH_DELAY_MS = 1500
+
+# Inicialização: threads usadas pelas etapas executadas em paralelo
+STARTUP_WORKERS = 4
+
+# Orçamento de tempo de importação do caminho de inicialização
+# (verificado por tools/check_import_budget.py)
+IMPORT_TIME_BUDGET_MS = 1000
+
+# Busca nas tabelas: atraso após a digitação e limite de linhas carregadas
+# para filtrar em memória (acima dele a busca é feita no banco de dados)
+SEARCH_DEBOUNCE_MS = 250
+SEARCH_LOCAL_MAX_ROWS = 5000
+
+# Notificações de alteração: intervalo em que as alterações publicadas são
+# agrupadas antes de atualizar a interface (aprox. um quadro)
+CHANGE_COALESCE_MS = 16
+CHANGE_RELOAD_THRESHOLD = 50    # Acima disso a tabela é recarregada em vez de atualizada linha a linha
+
+# Intervalo de verificação de alterações gravadas por outras estações no mesmo banco
+EXTERNAL_CHANGE_POLL_MS = 2000
+
+# Consultas de alterações por updated_at: margem para diferenças de relógio
+# entre estações e tempo de guarda do registro de exclusões
+CHANGE_DELTA_OVERLAP_SECONDS = 5
+TOMBSTONE_RETENTION_DAYS = 30
+
+# Dashboard: último resumo calculado, exibido na abertura enquanto os números
+# são recalculados, e intervalo máximo entre recálculos com a aba aberta
+DASHBOARD_SNAPSHOT_PATH = TEMP_DIR / "dashboard_snapshot.json"
+DASHBOARD_TTL_SECONDS = 300
+
+# Gráficos do dashboard: "painter" (QPainter, sem dependências extras),
+# "qtchart" (PyQt5.QtChart) ou "matplotlib" (opcional)
+CHART_BACKEND = "painter"
+CHART_RESIZE_THROTTLE_MS = 100  # Intervalo mínimo entre redesenhos durante um redimensionamento
@@ -1,6 +1,7 @@
 import logging
 from typing import List, Dict, Any, Optional
-from database.db_manager import get_connection
+from database.db_manager import get_connection, fetch_page, fetch_changes, RowChanges, changed_columns, update_columns
+from services.change_bus import change_bus, INSERT, UPDATE, DELETE
 import config
 
 logger = logging.getLogger(config.APP_NAME)
@@ -8,6 +9,13 @@ logger = logging.getLogger(config.APP_NAME)
 class ClientController:
     """Controlador para operações relacionadas a clientes"""
     
+    # Colunas que podem ser alteradas por update_client
+    UPDATABLE_COLUMNS = ['name', 'document', 'address', 'phone', 'email']
+
+    # Chave de ordenação e colunas de busca da listagem paginada (ver fetch_page)
+    PAGE_ORDER = [('name', 'name', ''), ('id', 'id', 0)]
+    SEARCH_COLUMNS = ('name', 'document', 'address', 'phone', 'email')
+    
     def get_all_clients(self) -> List[Dict[str, Any]]:
         """Retorna todos os clientes"""
         try:
@@ -28,6 +36,38 @@ class ClientController:
             logger.error(f"Erro ao obter clientes: {str(e)}")
             return []
     
+    def get_clients_page(self, limit: int, after: Optional[Dict[str, Any]] = None,
+                         search: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Retorna uma página de clientes ordenados por nome, a partir da linha `after`"""
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+            
+            clients = fetch_page(
+                cursor, "SELECT * FROM clients", self.PAGE_ORDER, limit, after,
+                search=search, search_columns=self.SEARCH_COLUMNS
+            )
+            conn.close()
+            
+            return clients
+        except Exception as e:
+            logger.error(f"Erro ao obter página de clientes: {str(e)}")
+            return []
+    
+    def get_clients_changed_since(self, since: str) -> Optional[RowChanges]:
+        """Retorna os clientes alterados e os IDs dos excluídos desde `since` (ver fetch_changes)"""
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+            
+            changes = fetch_changes(cursor, "SELECT * FROM clients", 'clients', since)
+            conn.close()
+            
+            return changes
+        except Exception as e:
+            logger.error(f"Erro ao obter alterações de clientes: {str(e)}")
+            return None
+    
     def get_client_by_id(self, client_id: int) -> Optional[Dict[str, Any]]:
         """Retorna um cliente pelo ID"""
         try:
@@ -48,8 +88,8 @@ class ClientController:
             logger.error(f"Erro ao obter cliente {client_id}: {str(e)}")
             return None
     
-    def add_client(self, client_data: Dict[str, Any]) -> Optional[int]:
-        """Adiciona um novo cliente"""
+    def add_client(self, client_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Adiciona um novo cliente e retorna o registro gravado (None em caso de falha)"""
         try:
             conn = get_connection()
             cursor = conn.cursor()
@@ -72,40 +112,45 @@ class ClientController:
             conn.close()
             
             logger.info(f"Cliente adicionado com ID {client_id}")
-            return client_id
+            client = self.get_client_by_id(client_id)
+            change_bus.publish('clients', client_id, INSERT, client)
+            return client
         except Exception as e:
             logger.error(f"Erro ao adicionar cliente: {str(e)}")
             return None
     
-    def update_client(self, client_id: int, client_data: Dict[str, Any]) -> bool:
-        """Atualiza um cliente existente"""
+    def update_client(self, client_id: int, client_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Atualiza um cliente existente, gravando apenas os campos informados que mudaram
+
+        Retorna o registro atualizado, ou None em caso de falha.
+        """
         try:
             conn = get_connection()
             cursor = conn.cursor()
             
-            query = '''
-            UPDATE clients
-            SET name = ?, document = ?, address = ?, phone = ?, email = ?
-            WHERE id = ?
-            '''
+            cursor.execute("SELECT * FROM clients WHERE id = ?", (client_id,))
+            current = cursor.fetchone()
             
-            cursor.execute(query, (
-                client_data['name'],
-                client_data['document'],
-                client_data['address'],
-                client_data['phone'],
-                client_data['email'],
-                client_id
-            ))
+            if not current:
+                logger.warning(f"Cliente {client_id} não encontrado")
+                conn.close()
+                return None
+            
+            # Gravar apenas os campos que mudaram em relação ao registro atual
+            changes = changed_columns(current, client_data, self.UPDATABLE_COLUMNS)
+            update_columns(cursor, 'clients', client_id, changes)
             
             conn.commit()
             conn.close()
             
             logger.info(f"Cliente {client_id} atualizado")
-            return True
+            client = self.get_client_by_id(client_id)
+            if changes:
+                change_bus.publish('clients', client_id, UPDATE, client)
+            return client
         except Exception as e:
             logger.error(f"Erro ao atualizar cliente {client_id}: {str(e)}")
-            return False
+            return None
     
     def delete_client(self, client_id: int) -> bool:
         """Exclui um cliente"""
@@ -126,6 +171,7 @@ class ClientController:
             cursor.execute("DELETE FROM clients WHERE id = ?", (client_id,))
             conn.commit()
             conn.close()
+            change_bus.publish('clients', client_id, DELETE)
             
             logger.info(f"Cliente {client_id} excluído")
             return True
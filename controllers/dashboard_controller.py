@@ -0,0 +1,100 @@
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from database.db_manager import get_connection
+import config
+
+logger = logging.getLogger(config.APP_NAME)
+
+# Status exibidos no gráfico de ordens, mesmo quando não há ordens com eles
+ORDER_STATUSES = ('em andamento', 'concluído', 'entregue')
+
+@dataclass
+class DashboardSummary:
+    """Totais exibidos nos cards e gráficos do dashboard"""
+    client_count: int = 0
+    vehicle_count: int = 0
+    order_count: int = 0
+    total_revenue: float = 0.0
+    total_expenses: float = 0.0
+    status_counts: Dict[str, int] = field(default_factory=lambda: dict.fromkeys(ORDER_STATUSES, 0))
+    expense_categories: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def profit(self) -> float:
+        return self.total_revenue - self.total_expenses
+
+class DashboardController:
+    """Controlador para os totais do dashboard"""
+
+    # Uma linha (métrica, rótulo, valor) por total; tudo calculado pelo SQLite
+    # em uma única consulta, sem trazer as tabelas para o Python
+    SUMMARY_QUERY = '''
+    SELECT 'clients' AS metric, NULL AS label, COUNT(*) AS value FROM clients
+    UNION ALL
+    SELECT 'vehicles', NULL, COUNT(*) FROM vehicles
+    UNION ALL
+    SELECT 'orders', NULL, COUNT(*) FROM service_orders
+    UNION ALL
+    SELECT 'revenue', NULL, COALESCE(SUM(total_value), 0) FROM service_orders
+    UNION ALL
+    SELECT 'expenses', NULL, COALESCE(SUM(value), 0) FROM expenses
+    UNION ALL
+    SELECT 'status', COALESCE(status, 'Sem status'), COUNT(*) FROM service_orders
+    GROUP BY COALESCE(status, 'Sem status')
+    UNION ALL
+    SELECT 'category', COALESCE(category, 'Sem categoria'), SUM(value) FROM expenses
+    GROUP BY COALESCE(category, 'Sem categoria')
+    '''
+
+    def get_summary(self) -> Optional[DashboardSummary]:
+        """Retorna contagens, faturamento, gastos, status das ordens e gastos por categoria"""
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+
+            cursor.execute(self.SUMMARY_QUERY)
+            rows = cursor.fetchall()
+            conn.close()
+
+            summary = DashboardSummary()
+            for row in rows:
+                metric, label, value = row['metric'], row['label'], row['value'] or 0
+                if metric == 'clients':
+                    summary.client_count = value
+                elif metric == 'vehicles':
+                    summary.vehicle_count = value
+                elif metric == 'orders':
+                    summary.order_count = value
+                elif metric == 'revenue':
+                    summary.total_revenue = value
+                elif metric == 'expenses':
+                    summary.total_expenses = value
+                elif metric == 'status':
+                    summary.status_counts[label] = value
+                elif metric == 'category':
+                    summary.expense_categories[label] = value
+
+            return summary
+        except Exception as e:
+            logger.error(f"Erro ao obter resumo do dashboard: {str(e)}")
+            return None
+
+    def get_daily_totals(self) -> Optional[List[Tuple[str, float, float, int]]]:
+        """Retorna (dia, faturamento, despesas, ordens) de cada dia com movimento, em ordem de dia"""
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+
+            cursor.execute('''
+            SELECT day, revenue, expenses, orders FROM daily_totals
+            WHERE revenue != 0 OR expenses != 0 OR orders != 0
+            ORDER BY day
+            ''')
+            rows = [(row['day'], row['revenue'], row['expenses'], row['orders']) for row in cursor.fetchall()]
+            conn.close()
+
+            return rows
+        except Exception as e:
+            logger.error(f"Erro ao obter totais diários: {str(e)}")
+            return None
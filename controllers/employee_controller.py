@@ -1,6 +1,7 @@
 import logging
 from typing import List, Dict, Any, Optional
-from database.db_manager import get_connection
+from database.db_manager import get_connection, fetch_page, fetch_changes, RowChanges, changed_columns, update_columns
+from services.change_bus import change_bus, INSERT, UPDATE, DELETE
 import config
 
 logger = logging.getLogger(config.APP_NAME)
@@ -8,6 +9,13 @@ logger = logging.getLogger(config.APP_NAME)
 class EmployeeController:
     """Controlador para operações relacionadas a funcionários"""
     
+    # Colunas que podem ser alteradas por update_employee
+    UPDATABLE_COLUMNS = ['name', 'document', 'role', 'hire_date']
+
+    # Chave de ordenação e colunas de busca da listagem paginada (ver fetch_page)
+    PAGE_ORDER = [('name', 'name', ''), ('id', 'id', 0)]
+    SEARCH_COLUMNS = ('name', 'document', 'role')
+    
     def get_all_employees(self) -> List[Dict[str, Any]]:
         """Retorna todos os funcionários"""
         try:
@@ -28,6 +36,38 @@ class EmployeeController:
             logger.error(f"Erro ao obter funcionários: {str(e)}")
             return []
     
+    def get_employees_page(self, limit: int, after: Optional[Dict[str, Any]] = None,
+                           search: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Retorna uma página de funcionários ordenados por nome, a partir da linha `after`"""
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+            
+            employees = fetch_page(
+                cursor, "SELECT * FROM employees", self.PAGE_ORDER, limit, after,
+                search=search, search_columns=self.SEARCH_COLUMNS
+            )
+            conn.close()
+            
+            return employees
+        except Exception as e:
+            logger.error(f"Erro ao obter página de funcionários: {str(e)}")
+            return []
+    
+    def get_employees_changed_since(self, since: str) -> Optional[RowChanges]:
+        """Retorna os funcionários alterados e os IDs dos excluídos desde `since` (ver fetch_changes)"""
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+            
+            changes = fetch_changes(cursor, "SELECT * FROM employees", 'employees', since)
+            conn.close()
+            
+            return changes
+        except Exception as e:
+            logger.error(f"Erro ao obter alterações de funcionários: {str(e)}")
+            return None
+    
     def get_employee_by_id(self, employee_id: int) -> Optional[Dict[str, Any]]:
         """Retorna um funcionário pelo ID"""
         try:
@@ -48,8 +88,8 @@ class EmployeeController:
             logger.error(f"Erro ao obter funcionário {employee_id}: {str(e)}")
             return None
     
-    def add_employee(self, employee_data: Dict[str, Any]) -> Optional[int]:
-        """Adiciona um novo funcionário"""
+    def add_employee(self, employee_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Adiciona um novo funcionário e retorna o registro gravado (None em caso de falha)"""
         try:
             conn = get_connection()
             cursor = conn.cursor()
@@ -71,39 +111,45 @@ class EmployeeController:
             conn.close()
             
             logger.info(f"Funcionário adicionado com ID {employee_id}")
-            return employee_id
+            employee = self.get_employee_by_id(employee_id)
+            change_bus.publish('employees', employee_id, INSERT, employee)
+            return employee
         except Exception as e:
             logger.error(f"Erro ao adicionar funcionário: {str(e)}")
             return None
     
-    def update_employee(self, employee_id: int, employee_data: Dict[str, Any]) -> bool:
-        """Atualiza um funcionário existente"""
+    def update_employee(self, employee_id: int, employee_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Atualiza um funcionário existente, gravando apenas os campos informados que mudaram
+
+        Retorna o registro atualizado, ou None em caso de falha.
+        """
         try:
             conn = get_connection()
             cursor = conn.cursor()
             
-            query = '''
-            UPDATE employees
-            SET name = ?, document = ?, role = ?, hire_date = ?
-            WHERE id = ?
-            '''
+            cursor.execute("SELECT * FROM employees WHERE id = ?", (employee_id,))
+            current = cursor.fetchone()
             
-            cursor.execute(query, (
-                employee_data['name'],
-                employee_data['document'],
-                employee_data['role'],
-                employee_data['hire_date'],
-                employee_id
-            ))
+            if not current:
+                logger.warning(f"Funcionário {employee_id} não encontrado")
+                conn.close()
+                return None
+            
+            # Gravar apenas os campos que mudaram em relação ao registro atual
+            changes = changed_columns(current, employee_data, self.UPDATABLE_COLUMNS)
+            update_columns(cursor, 'employees', employee_id, changes)
             
             conn.commit()
             conn.close()
             
             logger.info(f"Funcionário {employee_id} atualizado")
-            return True
+            employee = self.get_employee_by_id(employee_id)
+            if changes:
+                change_bus.publish('employees', employee_id, UPDATE, employee)
+            return employee
         except Exception as e:
             logger.error(f"Erro ao atualizar funcionário {employee_id}: {str(e)}")
-            return False
+            return None
     
     def delete_employee(self, employee_id: int) -> bool:
         """Exclui um funcionário"""
@@ -124,6 +170,7 @@ class EmployeeController:
             cursor.execute("DELETE FROM employees WHERE id = ?", (employee_id,))
             conn.commit()
             conn.close()
+            change_bus.publish('employees', employee_id, DELETE)
             
             logger.info(f"Funcionário {employee_id} excluído")
             return True
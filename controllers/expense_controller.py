@@ -1,6 +1,7 @@
 import logging
 from typing import List, Dict, Any, Optional
-from database.db_manager import get_connection
+from database.db_manager import get_connection, fetch_page, fetch_changes, RowChanges, changed_columns, update_columns
+from services.change_bus import change_bus, INSERT, UPDATE, DELETE
 import config
 
 logger = logging.getLogger(config.APP_NAME)
@@ -8,6 +9,13 @@ logger = logging.getLogger(config.APP_NAME)
 class ExpenseController:
     """Controlador para operações relacionadas a gastos"""
     
+    # Colunas que podem ser alteradas por update_expense
+    UPDATABLE_COLUMNS = ['date', 'description', 'value', 'category', 'payment_method']
+
+    # Chave de ordenação e colunas de busca da listagem paginada (ver fetch_page)
+    PAGE_ORDER = [("COALESCE(date, '')", 'date', ''), ('id', 'id', 0)]
+    SEARCH_COLUMNS = ('date', 'description', 'category')
+    
     def get_all_expenses(self) -> List[Dict[str, Any]]:
         """Retorna todos os gastos"""
         try:
@@ -28,6 +36,38 @@ class ExpenseController:
             logger.error(f"Erro ao obter gastos: {str(e)}")
             return []
     
+    def get_expenses_page(self, limit: int, after: Optional[Dict[str, Any]] = None,
+                          search: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Retorna uma página de gastos, a partir da linha `after` (mais recentes primeiro)"""
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+            
+            expenses = fetch_page(
+                cursor, "SELECT * FROM expenses", self.PAGE_ORDER, limit, after,
+                descending=True, search=search, search_columns=self.SEARCH_COLUMNS
+            )
+            conn.close()
+            
+            return expenses
+        except Exception as e:
+            logger.error(f"Erro ao obter página de gastos: {str(e)}")
+            return []
+    
+    def get_expenses_changed_since(self, since: str) -> Optional[RowChanges]:
+        """Retorna os gastos alterados e os IDs dos excluídos desde `since` (ver fetch_changes)"""
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+            
+            changes = fetch_changes(cursor, "SELECT * FROM expenses", 'expenses', since)
+            conn.close()
+            
+            return changes
+        except Exception as e:
+            logger.error(f"Erro ao obter alterações de gastos: {str(e)}")
+            return None
+    
     def get_expense_by_id(self, expense_id: int) -> Optional[Dict[str, Any]]:
         """Retorna um gasto pelo ID"""
         try:
@@ -48,8 +88,8 @@ class ExpenseController:
             logger.error(f"Erro ao obter gasto {expense_id}: {str(e)}")
             return None
     
-    def add_expense(self, expense_data: Dict[str, Any]) -> Optional[int]:
-        """Adiciona um novo gasto"""
+    def add_expense(self, expense_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Adiciona um novo gasto e retorna o registro gravado (None em caso de falha)"""
         try:
             conn = get_connection()
             cursor = conn.cursor()
@@ -72,40 +112,45 @@ class ExpenseController:
             conn.close()
             
             logger.info(f"Gasto adicionado com ID {expense_id}")
-            return expense_id
+            expense = self.get_expense_by_id(expense_id)
+            change_bus.publish('expenses', expense_id, INSERT, expense)
+            return expense
         except Exception as e:
             logger.error(f"Erro ao adicionar gasto: {str(e)}")
             return None
     
-    def update_expense(self, expense_id: int, expense_data: Dict[str, Any]) -> bool:
-        """Atualiza um gasto existente"""
+    def update_expense(self, expense_id: int, expense_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Atualiza um gasto existente, gravando apenas os campos informados que mudaram
+
+        Retorna o registro atualizado, ou None em caso de falha.
+        """
         try:
             conn = get_connection()
             cursor = conn.cursor()
             
-            query = '''
-            UPDATE expenses
-            SET date = ?, description = ?, value = ?, category = ?, payment_method = ?
-            WHERE id = ?
-            '''
+            cursor.execute("SELECT * FROM expenses WHERE id = ?", (expense_id,))
+            current = cursor.fetchone()
             
-            cursor.execute(query, (
-                expense_data['date'],
-                expense_data['description'],
-                expense_data['value'],
-                expense_data['category'],
-                expense_data['payment_method'],
-                expense_id
-            ))
+            if not current:
+                logger.warning(f"Gasto {expense_id} não encontrado")
+                conn.close()
+                return None
+            
+            # Gravar apenas os campos que mudaram em relação ao registro atual
+            changes = changed_columns(current, expense_data, self.UPDATABLE_COLUMNS)
+            update_columns(cursor, 'expenses', expense_id, changes)
             
             conn.commit()
             conn.close()
             
             logger.info(f"Gasto {expense_id} atualizado")
-            return True
+            expense = self.get_expense_by_id(expense_id)
+            if changes:
+                change_bus.publish('expenses', expense_id, UPDATE, expense)
+            return expense
         except Exception as e:
             logger.error(f"Erro ao atualizar gasto {expense_id}: {str(e)}")
-            return False
+            return None
     
     def delete_expense(self, expense_id: int) -> bool:
         """Exclui um gasto"""
@@ -116,6 +161,7 @@ class ExpenseController:
             cursor.execute("DELETE FROM expenses WHERE id = ?", (expense_id,))
             conn.commit()
             conn.close()
+            change_bus.publish('expenses', expense_id, DELETE)
             
             logger.info(f"Gasto {expense_id} excluído")
             return True
@@ -1,13 +1,99 @@
 import logging
 from typing import List, Dict, Any, Optional
-from database.db_manager import get_connection
+from datetime import datetime, timezone
+from database.db_manager import get_connection, fetch_page, fetch_changes, RowChanges, changed_columns, update_columns
+from services.change_bus import change_bus, INSERT, UPDATE, DELETE
 import config
 
 logger = logging.getLogger(config.APP_NAME)
 
+# Tipos de movimentação do livro de estoque
+MOVEMENT_PURCHASE = 'compra'
+MOVEMENT_CONSUMPTION = 'consumo'
+MOVEMENT_ADJUSTMENT = 'ajuste'
+MOVEMENT_RETURN = 'devolução'
+MOVEMENT_TYPES = (MOVEMENT_PURCHASE, MOVEMENT_CONSUMPTION, MOVEMENT_ADJUSTMENT, MOVEMENT_RETURN)
+
+def apply_stock_movement(cursor, part_id: int, movement_type: str, quantity: int,
+                         order_id: Optional[int] = None, notes: Optional[str] = None) -> int:
+    """Registra uma movimentação no livro de estoque e atualiza o saldo atual da peça.
+    
+    Roda dentro da transação do chamador (não faz commit). A quantidade é
+    assinada: positiva para entradas e negativa para saídas.
+    
+    Returns:
+        ID da movimentação registrada
+    """
+    if movement_type not in MOVEMENT_TYPES:
+        raise ValueError(f"Tipo de movimentação inválido: {movement_type}")
+    
+    # Horário do banco (UTC), o mesmo de CURRENT_TIMESTAMP nos saldos iniciais
+    cursor.execute("SELECT strftime('%Y-%m-%d %H:%M:%S', 'now') as now")
+    moved_at = cursor.fetchone()['now']
+    cursor.execute('''
+    INSERT INTO stock_movements (part_id, movement_type, quantity, order_id, notes, moved_at)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ''', (part_id, movement_type, quantity, order_id, notes, moved_at))
+    movement_id = cursor.lastrowid
+    
+    # Saldo atual mantido de forma incremental
+    cursor.execute('''
+    UPDATE parts
+    SET stock_quantity = COALESCE(stock_quantity, 0) + ?
+    WHERE id = ?
+    ''', (quantity, part_id))
+    
+    _checkpoint_if_due(cursor, part_id, movement_id, moved_at)
+    return movement_id
+
+def _checkpoint_if_due(cursor, part_id: int, movement_id: int, moved_at: str):
+    """Grava um saldo de referência quando a peça acumula movimentações suficientes desde o último"""
+    cursor.execute('''
+    SELECT movement_id, balance FROM stock_checkpoints
+    WHERE part_id = ?
+    ORDER BY movement_id DESC
+    LIMIT 1
+    ''', (part_id,))
+    last = cursor.fetchone()
+    last_movement_id = last['movement_id'] if last else 0
+    last_balance = last['balance'] if last else 0
+    
+    cursor.execute('''
+    SELECT COUNT(*) as count, COALESCE(SUM(quantity), 0) as total
+    FROM stock_movements
+    WHERE part_id = ? AND id > ? AND id <= ?
+    ''', (part_id, last_movement_id, movement_id))
+    tail = cursor.fetchone()
+    
+    if tail['count'] >= config.STOCK_CHECKPOINT_INTERVAL:
+        cursor.execute('''
+        INSERT INTO stock_checkpoints (part_id, movement_id, balance, checkpoint_at)
+        VALUES (?, ?, ?, ?)
+        ''', (part_id, movement_id, last_balance + tail['total'], moved_at))
+
+def _as_of_timestamp(as_of) -> str:
+    """Normaliza a data de referência para o horário UTC do livro de estoque
+    
+    A data é informada no horário local; uma data sem horário vale até o fim do dia.
+    """
+    if not isinstance(as_of, datetime):
+        as_of = str(as_of)
+        if len(as_of) == 10:
+            as_of = f"{as_of} 23:59:59"
+        as_of = datetime.fromisoformat(as_of)
+    # Datas sem fuso são tratadas como horário local
+    return as_of.astimezone(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+
 class PartController:
     """Controlador para operações relacionadas a peças"""
     
+    # Colunas que podem ser alteradas por update_part (o estoque muda pelo livro de estoque)
+    UPDATABLE_COLUMNS = ['code', 'description', 'buy_price', 'sell_price']
+    
+    # Chave de ordenação e colunas de busca da listagem paginada (ver fetch_page)
+    PAGE_ORDER = [('code', 'code', ''), ('id', 'id', 0)]
+    SEARCH_COLUMNS = ('code', 'description')
+    
     def get_all_parts(self) -> List[Dict[str, Any]]:
         """Retorna todas as peças"""
         try:
@@ -28,6 +114,38 @@ class PartController:
             logger.error(f"Erro ao obter peças: {str(e)}")
             return []
     
+    def get_parts_page(self, limit: int, after: Optional[Dict[str, Any]] = None,
+                       search: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Retorna uma página de peças ordenadas por código, a partir da linha `after`"""
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+            
+            parts = fetch_page(
+                cursor, "SELECT * FROM parts", self.PAGE_ORDER, limit, after,
+                search=search, search_columns=self.SEARCH_COLUMNS
+            )
+            conn.close()
+            
+            return parts
+        except Exception as e:
+            logger.error(f"Erro ao obter página de peças: {str(e)}")
+            return []
+    
+    def get_parts_changed_since(self, since: str) -> Optional[RowChanges]:
+        """Retorna as peças alteradas e os IDs das excluídas desde `since` (ver fetch_changes)"""
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+            
+            changes = fetch_changes(cursor, "SELECT * FROM parts", 'parts', since)
+            conn.close()
+            
+            return changes
+        except Exception as e:
+            logger.error(f"Erro ao obter alterações de peças: {str(e)}")
+            return None
+    
     def get_part_by_id(self, part_id: int) -> Optional[Dict[str, Any]]:
         """Retorna uma peça pelo ID"""
         try:
@@ -48,64 +166,80 @@ class PartController:
             logger.error(f"Erro ao obter peça {part_id}: {str(e)}")
             return None
     
-    def add_part(self, part_data: Dict[str, Any]) -> Optional[int]:
-        """Adiciona uma nova peça"""
+    def add_part(self, part_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Adiciona uma nova peça e retorna o registro gravado (None em caso de falha)"""
         try:
             conn = get_connection()
             cursor = conn.cursor()
             
             query = '''
             INSERT INTO parts (code, description, stock_quantity, buy_price, sell_price, created_at)
-            VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+            VALUES (?, ?, 0, ?, ?, CURRENT_TIMESTAMP)
             '''
             
             cursor.execute(query, (
                 part_data['code'],
                 part_data['description'],
-                part_data['stock_quantity'],
                 part_data['buy_price'],
                 part_data['sell_price']
             ))
             
             part_id = cursor.lastrowid
+            
+            # O estoque inicial entra pelo livro de movimentações
+            if part_data.get('stock_quantity'):
+                apply_stock_movement(cursor, part_id, MOVEMENT_ADJUSTMENT,
+                                     part_data['stock_quantity'], notes="Estoque inicial")
+            
             conn.commit()
             conn.close()
             
             logger.info(f"Peça adicionada com ID {part_id}")
-            return part_id
+            part = self.get_part_by_id(part_id)
+            change_bus.publish('parts', part_id, INSERT, part)
+            return part
         except Exception as e:
             logger.error(f"Erro ao adicionar peça: {str(e)}")
             return None
     
-    def update_part(self, part_id: int, part_data: Dict[str, Any]) -> bool:
-        """Atualiza uma peça existente"""
+    def update_part(self, part_id: int, part_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Atualiza uma peça existente, gravando apenas os campos informados que mudaram
+        
+        Retorna o registro atualizado, ou None em caso de falha.
+        """
         try:
             conn = get_connection()
             cursor = conn.cursor()
             
-            query = '''
-            UPDATE parts
-            SET code = ?, description = ?, stock_quantity = ?, buy_price = ?, sell_price = ?
-            WHERE id = ?
-            '''
+            cursor.execute("SELECT * FROM parts WHERE id = ?", (part_id,))
+            current = cursor.fetchone()
             
-            cursor.execute(query, (
-                part_data['code'],
-                part_data['description'],
-                part_data['stock_quantity'],
-                part_data['buy_price'],
-                part_data['sell_price'],
-                part_id
-            ))
+            if not current:
+                logger.warning(f"Peça {part_id} não encontrada")
+                conn.close()
+                return None
+            
+            # Gravar apenas os campos que mudaram em relação ao registro atual
+            changes = changed_columns(current, part_data, self.UPDATABLE_COLUMNS)
+            update_columns(cursor, 'parts', part_id, changes)
+            
+            # Alterações manuais de quantidade viram ajustes no livro de estoque
+            if 'stock_quantity' in part_data:
+                difference = part_data['stock_quantity'] - (current['stock_quantity'] or 0)
+                if difference:
+                    apply_stock_movement(cursor, part_id, MOVEMENT_ADJUSTMENT, difference,
+                                         notes="Ajuste manual")
             
             conn.commit()
             conn.close()
             
             logger.info(f"Peça {part_id} atualizada")
-            return True
+            part = self.get_part_by_id(part_id)
+            change_bus.publish('parts', part_id, UPDATE, part)
+            return part
         except Exception as e:
             logger.error(f"Erro ao atualizar peça {part_id}: {str(e)}")
-            return False
+            return None
     
     def delete_part(self, part_id: int) -> bool:
         """Exclui uma peça"""
@@ -122,10 +256,13 @@ class PartController:
                 conn.close()
                 return False
             
-            # Excluir a peça
+            # Excluir a peça e o seu histórico de estoque
+            cursor.execute("DELETE FROM stock_checkpoints WHERE part_id = ?", (part_id,))
+            cursor.execute("DELETE FROM stock_movements WHERE part_id = ?", (part_id,))
             cursor.execute("DELETE FROM parts WHERE id = ?", (part_id,))
             conn.commit()
             conn.close()
+            change_bus.publish('parts', part_id, DELETE)
             
             logger.info(f"Peça {part_id} excluída")
             return True
@@ -133,8 +270,9 @@ class PartController:
             logger.error(f"Erro ao excluir peça {part_id}: {str(e)}")
             return False
     
-    def update_stock(self, part_id: int, quantity_change: int) -> bool:
-        """Atualiza o estoque de uma peça"""
+    def update_stock(self, part_id: int, quantity_change: int,
+                     movement_type: str = MOVEMENT_ADJUSTMENT, notes: Optional[str] = None) -> bool:
+        """Atualiza o estoque de uma peça registrando a movimentação no livro de estoque"""
         try:
             conn = get_connection()
             cursor = conn.cursor()
@@ -148,7 +286,7 @@ class PartController:
                 conn.close()
                 return False
             
-            current_quantity = result['stock_quantity']
+            current_quantity = result['stock_quantity'] or 0
             new_quantity = current_quantity + quantity_change
             
             if new_quantity < 0:
@@ -156,18 +294,101 @@ class PartController:
                 conn.close()
                 return False
             
-            # Atualizar estoque
-            cursor.execute('''
-            UPDATE parts
-            SET stock_quantity = ?
-            WHERE id = ?
-            ''', (new_quantity, part_id))
+            apply_stock_movement(cursor, part_id, movement_type, quantity_change, notes=notes)
             
             conn.commit()
             conn.close()
+            change_bus.publish('parts', part_id, UPDATE, self.get_part_by_id(part_id))
             
             logger.info(f"Estoque da peça {part_id} atualizado: {current_quantity} -> {new_quantity}")
             return True
         except Exception as e:
             logger.error(f"Erro ao atualizar estoque da peça {part_id}: {str(e)}")
-            return False
\ No newline at end of file
+            return False
+    
+    def get_stock_movements(self, part_id: int) -> List[Dict[str, Any]]:
+        """Retorna as movimentações de estoque de uma peça, da mais recente para a mais antiga"""
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+            SELECT * FROM stock_movements
+            WHERE part_id = ?
+            ORDER BY id DESC
+            ''', (part_id,))
+            movements = cursor.fetchall()
+            conn.close()
+            
+            return movements
+        except Exception as e:
+            logger.error(f"Erro ao obter movimentações da peça {part_id}: {str(e)}")
+            return []
+    
+    def get_stock_as_of(self, part_id: int, as_of) -> Optional[int]:
+        """Retorna o estoque de uma peça em uma data (ex.: fechamento de inventário)
+        
+        Lê o último saldo de referência anterior à data e soma apenas as
+        movimentações posteriores a ele, sem reprocessar todo o histórico.
+        
+        Args:
+            part_id: ID da peça
+            as_of: Data ("2024-12-31", vale até o fim do dia) ou data e hora
+        """
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+            as_of = _as_of_timestamp(as_of)
+            
+            cursor.execute('''
+            SELECT movement_id, balance FROM stock_checkpoints
+            WHERE part_id = ? AND checkpoint_at <= ?
+            ORDER BY movement_id DESC
+            LIMIT 1
+            ''', (part_id, as_of))
+            checkpoint = cursor.fetchone()
+            
+            cursor.execute('''
+            SELECT COALESCE(SUM(quantity), 0) as total
+            FROM stock_movements
+            WHERE part_id = ? AND id > ? AND moved_at <= ?
+            ''', (part_id, checkpoint['movement_id'] if checkpoint else 0, as_of))
+            tail = cursor.fetchone()
+            conn.close()
+            
+            return (checkpoint['balance'] if checkpoint else 0) + tail['total']
+        except Exception as e:
+            logger.error(f"Erro ao obter estoque da peça {part_id} em {as_of}: {str(e)}")
+            return None
+    
+    def get_stock_levels_as_of(self, as_of) -> Dict[int, int]:
+        """Retorna o estoque de todas as peças em uma data, indexado pelo ID da peça"""
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+            as_of = _as_of_timestamp(as_of)
+            
+            cursor.execute('''
+            WITH last_checkpoint AS (
+                SELECT c.part_id, c.movement_id, c.balance
+                FROM stock_checkpoints c
+                WHERE c.movement_id = (
+                    SELECT MAX(c2.movement_id) FROM stock_checkpoints c2
+                    WHERE c2.part_id = c.part_id AND c2.checkpoint_at <= ?
+                )
+            )
+            SELECT p.id as part_id,
+                   COALESCE(lc.balance, 0) + COALESCE((
+                       SELECT SUM(m.quantity) FROM stock_movements m
+                       WHERE m.part_id = p.id AND m.id > COALESCE(lc.movement_id, 0) AND m.moved_at <= ?
+                   ), 0) as quantity
+            FROM parts p
+            LEFT JOIN last_checkpoint lc ON lc.part_id = p.id
+            ''', (as_of, as_of))
+            levels = {row['part_id']: row['quantity'] for row in cursor.fetchall()}
+            conn.close()
+            
+            return levels
+        except Exception as e:
+            logger.error(f"Erro ao obter estoque em {as_of}: {str(e)}")
+            return {}
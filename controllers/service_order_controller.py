@@ -1,23 +1,175 @@
 import logging
-from typing import List, Dict, Any, Optional
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
-from database.db_manager import get_connection
+from database.db_manager import get_connection, fetch_page, fetch_changes, RowChanges, changed_columns, update_columns
+from controllers.part_controller import PartController, apply_stock_movement, MOVEMENT_CONSUMPTION, MOVEMENT_RETURN
+from services.change_bus import change_bus, INSERT, UPDATE, DELETE
 import config
 
 logger = logging.getLogger(config.APP_NAME)
 
+@dataclass
+class OrderPartsChanges:
+    """Diferença entre as peças gravadas de uma ordem e as peças enviadas para salvar
+    
+    `updated` guarda pares (peça gravada, peça nova) da mesma linha de order_parts.
+    """
+    inserted: List[Dict[str, Any]] = field(default_factory=list)
+    updated: List[Tuple[Dict[str, Any], Dict[str, Any]]] = field(default_factory=list)
+    deleted: List[Dict[str, Any]] = field(default_factory=list)
+    
+    def __bool__(self):
+        return bool(self.inserted or self.updated or self.deleted)
+    
+    def quantity_changes(self) -> Dict[int, int]:
+        """Variação líquida de quantidade por ID da peça (positiva quando a ordem passa a consumir mais)"""
+        changes = {}
+        for part in self.inserted:
+            changes[part['part_id']] = changes.get(part['part_id'], 0) + part['quantity']
+        for old, new in self.updated:
+            changes[new['part_id']] = changes.get(new['part_id'], 0) + new['quantity'] - old['quantity']
+        for part in self.deleted:
+            changes[part['part_id']] = changes.get(part['part_id'], 0) - part['quantity']
+        return {part_id: change for part_id, change in changes.items() if change}
+
+@dataclass
+class OrderUpdateResult:
+    """Resultado de uma atualização de ordem de serviço
+    
+    Avaliado como verdadeiro quando a ordem foi salva. `conflict` indica que a
+    ordem foi alterada por outra estação desde que foi carregada (a versão
+    informada não confere mais com a do banco). `parts_changes` traz o que foi
+    alterado nas peças, quando elas fizeram parte da atualização,
+    `changed_fields` as colunas da ordem efetivamente gravadas e `order` a
+    ordem como ficou no banco, no formato da listagem.
+    """
+    success: bool
+    conflict: bool = False
+    version: Optional[int] = None
+    parts_changes: Optional[OrderPartsChanges] = None
+    changed_fields: List[str] = field(default_factory=list)
+    order: Optional[Dict[str, Any]] = None
+    
+    def __bool__(self):
+        return self.success
+
+def diff_order_parts(stored: List[Dict[str, Any]], submitted: List[Dict[str, Any]]) -> OrderPartsChanges:
+    """Compara as peças gravadas de uma ordem com as enviadas pelo formulário
+    
+    As peças enviadas que trazem o `id` da linha de order_parts são casadas por
+    ele; as demais reaproveitam uma linha gravada da mesma peça ainda livre.
+    O que sobra dos dois lados vira inserção ou exclusão.
+    """
+    changes = OrderPartsChanges()
+    unmatched = {row['id']: row for row in stored}
+    unmatched_by_part = {}
+    for row in stored:
+        unmatched_by_part.setdefault(row['part_id'], []).append(row['id'])
+    
+    for part in submitted:
+        row_id = part.get('id')
+        if row_id not in unmatched or unmatched[row_id]['part_id'] != part['part_id']:
+            candidates = [i for i in unmatched_by_part.get(part['part_id'], []) if i in unmatched]
+            row_id = candidates[0] if candidates else None
+        
+        if row_id is None:
+            changes.inserted.append(part)
+            continue
+        
+        row = unmatched.pop(row_id)
+        if row['quantity'] != part['quantity'] or row['price'] != part['price']:
+            changes.updated.append((row, part))
+    
+    changes.deleted.extend(unmatched.values())
+    return changes
+
+def _apply_stock_changes(cursor, order_id: int, quantity_changes: Dict[int, int]):
+    """Lança no livro de estoque a variação de peças consumidas por uma ordem"""
+    for part_id, change in quantity_changes.items():
+        if change > 0:
+            apply_stock_movement(cursor, part_id, MOVEMENT_CONSUMPTION, -change, order_id=order_id)
+        elif change < 0:
+            apply_stock_movement(cursor, part_id, MOVEMENT_RETURN, -change, order_id=order_id)
+
+def _publish_order_change(order_id: int, operation: str, order: Optional[Dict[str, Any]] = None,
+                          quantity_changes: Optional[Dict[int, int]] = None):
+    """Publica a alteração da ordem e das peças cujo estoque mudou com ela (com o registro atualizado)"""
+    change_bus.publish('service_orders', order_id, operation, order)
+    part_controller = PartController()
+    for part_id in quantity_changes or {}:
+        change_bus.publish('parts', part_id, UPDATE, part_controller.get_part_by_id(part_id))
+
+def _order_number_scope(open_date: Optional[str] = None) -> str:
+    """Retorna o prefixo de numeração (escopo da sequência) conforme a configuração"""
+    parts = [config.ORDER_NUMBER_PREFIX]
+    if config.ORDER_NUMBER_BRANCH:
+        parts.append(config.ORDER_NUMBER_BRANCH)
+    if config.ORDER_NUMBER_PER_YEAR:
+        parts.append(open_date[:4] if open_date else str(datetime.now().year))
+    return "-".join(parts) + "-"
+
+def _next_order_number(cursor, open_date: Optional[str] = None) -> str:
+    """Reserva o próximo número de ordem de serviço dentro da transação do chamador
+    
+    O UPDATE na tabela de sequências obtém o bloqueio de escrita do banco, de
+    modo que estações concorrentes recebem números distintos; se a transação
+    for desfeita, o número volta a ficar disponível.
+    """
+    scope = _order_number_scope(open_date)
+    
+    cursor.execute('''
+    UPDATE order_number_sequences
+    SET last_value = last_value + 1
+    WHERE scope = ?
+    ''', (scope,))
+    
+    if cursor.rowcount == 0:
+        # Primeira ordem do escopo: continuar a partir dos números já existentes
+        cursor.execute('''
+        SELECT number FROM service_orders
+        WHERE number > ? AND number < ?
+        ''', (scope, scope + "\uffff"))
+        existing = [row['number'][len(scope):] for row in cursor.fetchall()]
+        last_value = max((int(suffix) for suffix in existing if suffix.isdigit()), default=0)
+        
+        cursor.execute('''
+        INSERT INTO order_number_sequences (scope, last_value)
+        VALUES (?, ?)
+        ''', (scope, last_value + 1))
+    
+    cursor.execute("SELECT last_value FROM order_number_sequences WHERE scope = ?", (scope,))
+    return f"{scope}{cursor.fetchone()['last_value']:03d}"
+
+def _advance_order_number_sequences(cursor, number: str):
+    """Avança a sequência do escopo de um número informado explicitamente
+    
+    Quando o número é o prefixo de um escopo seguido só de dígitos, a
+    sequência passa a ser no mínimo esse valor; sem isso, ela geraria mais
+    tarde o mesmo número e a gravação violaria o índice único. Escopos ainda
+    sem sequência já partem dos números existentes (ver _next_order_number).
+    """
+    cursor.execute('''
+    UPDATE order_number_sequences
+    SET last_value = MAX(last_value, CAST(substr(?, length(scope) + 1) AS INTEGER))
+    WHERE substr(?, 1, length(scope)) = scope
+      AND length(?) > length(scope)
+      AND substr(?, length(scope) + 1) NOT GLOB '*[^0-9]*'
+    ''', (number, number, number, number))
+
 class ServiceOrderController:
     """Controlador para operações relacionadas a ordens de serviço"""
     
-    def get_all_service_orders(self):
-        # Lógica para retornar todas as ordens de serviço
-        # Exemplo usando uma consulta a um banco de dados
-        orders = [
-            {"status": "em andamento", "total_value": 100.00},
-            {"status": "concluído", "total_value": 150.00},
-            {"status": "entregue", "total_value": 200.00},
-        ]
-        return orders
+    # Colunas que podem ser alteradas por update_order
+    UPDATABLE_COLUMNS = [
+        'number', 'vehicle_id', 'description', 'status', 'employee_id',
+        'completion_date', 'total_value', 'payment_method',
+        'client_signature', 'mechanic_signature'
+    ]
+
+    # Chave de ordenação e colunas de busca da listagem paginada (ver fetch_page)
+    PAGE_ORDER = [("COALESCE(so.open_date, '')", 'open_date', ''), ('so.id', 'id', 0)]
+    SEARCH_COLUMNS = ('so.number', 'so.open_date', 'v.plate', 'c.name')
     
     def get_all_orders(self) -> List[Dict[str, Any]]:
         """Retorna todas as ordens de serviço com informações relacionadas"""
@@ -43,6 +195,54 @@ class ServiceOrderController:
             logger.error(f"Erro ao obter ordens de serviço: {str(e)}")
             return []
     
+    def get_orders_page(self, limit: int, after: Optional[Dict[str, Any]] = None,
+                        search: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Retorna uma página de ordens de serviço, a partir da linha `after` (mais recentes primeiro)"""
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+            
+            query = '''
+            SELECT so.*, v.plate as vehicle_plate, c.name as client_name, e.name as employee_name
+            FROM service_orders so
+            LEFT JOIN vehicles v ON so.vehicle_id = v.id
+            LEFT JOIN clients c ON v.client_id = c.id
+            LEFT JOIN employees e ON so.employee_id = e.id
+            '''
+            
+            orders = fetch_page(
+                cursor, query, self.PAGE_ORDER, limit, after,
+                descending=True, search=search, search_columns=self.SEARCH_COLUMNS
+            )
+            conn.close()
+            
+            return orders
+        except Exception as e:
+            logger.error(f"Erro ao obter página de ordens de serviço: {str(e)}")
+            return []
+    
+    def get_orders_changed_since(self, since: str) -> Optional[RowChanges]:
+        """Retorna as ordens de serviço alteradas e os IDs das excluídas desde `since` (ver fetch_changes)"""
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+            
+            query = '''
+            SELECT so.*, v.plate as vehicle_plate, c.name as client_name, e.name as employee_name
+            FROM service_orders so
+            LEFT JOIN vehicles v ON so.vehicle_id = v.id
+            LEFT JOIN clients c ON v.client_id = c.id
+            LEFT JOIN employees e ON so.employee_id = e.id
+            '''
+            
+            changes = fetch_changes(cursor, query, 'service_orders', since, column='so.updated_at')
+            conn.close()
+            
+            return changes
+        except Exception as e:
+            logger.error(f"Erro ao obter alterações de ordens de serviço: {str(e)}")
+            return None
+    
     def get_order_by_id(self, order_id: int) -> Optional[Dict[str, Any]]:
         """Retorna uma ordem de serviço pelo ID"""
         try:
@@ -80,8 +280,50 @@ class ServiceOrderController:
             logger.error(f"Erro ao obter ordem de serviço {order_id}: {str(e)}")
             return None
     
-    def add_order(self, order_data: Dict[str, Any]) -> Optional[int]:
-        """Adiciona uma nova ordem de serviço"""
+    def get_order_row(self, order_id: int) -> Optional[Dict[str, Any]]:
+        """Retorna uma ordem de serviço no formato da listagem (sem as peças), para atualizar a linha exibida"""
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+            
+            query = '''
+            SELECT so.*, v.plate as vehicle_plate, c.name as client_name, e.name as employee_name
+            FROM service_orders so
+            LEFT JOIN vehicles v ON so.vehicle_id = v.id
+            LEFT JOIN clients c ON v.client_id = c.id
+            LEFT JOIN employees e ON so.employee_id = e.id
+            WHERE so.id = ?
+            '''
+            
+            cursor.execute(query, (order_id,))
+            order = cursor.fetchone()
+            conn.close()
+            
+            return order
+        except Exception as e:
+            logger.error(f"Erro ao obter ordem de serviço {order_id}: {str(e)}")
+            return None
+    
+    def get_order_by_number(self, number: str) -> Optional[Dict[str, Any]]:
+        """Retorna uma ordem de serviço pelo número (busca direta pelo índice único)"""
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+            
+            cursor.execute("SELECT id FROM service_orders WHERE number = ?", (number,))
+            result = cursor.fetchone()
+            conn.close()
+            
+            if not result:
+                return None
+            
+            return self.get_order_by_id(result['id'])
+        except Exception as e:
+            logger.error(f"Erro ao obter ordem de serviço {number}: {str(e)}")
+            return None
+    
+    def add_order(self, order_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Adiciona uma nova ordem de serviço e retorna a linha gravada, no formato da listagem (None em caso de falha)"""
         try:
             conn = get_connection()
             cursor = conn.cursor()
@@ -95,9 +337,18 @@ class ServiceOrderController:
             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
             '''
             
+            open_date = order_data.get('open_date', datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+            
+            # Número gerado pela sequência, salvo quando informado explicitamente
+            number = order_data.get('number')
+            if number:
+                _advance_order_number_sequences(cursor, number)
+            else:
+                number = _next_order_number(cursor, open_date)
+            
             cursor.execute(query, (
-                order_data['number'],
-                order_data.get('open_date', datetime.now().strftime('%Y-%m-%d %H:%M:%S')),
+                number,
+                open_date,
                 order_data['vehicle_id'],
                 order_data['description'],
                 order_data['status'],
@@ -108,95 +359,142 @@ class ServiceOrderController:
             ))
             
             order_id = cursor.lastrowid
+            quantity_changes = {}
             
             # Inserir peças usadas, se houver
             if 'parts' in order_data and order_data['parts']:
-                for part in order_data['parts']:
-                    cursor.execute('''
-                    INSERT INTO order_parts (order_id, part_id, quantity, price)
-                    VALUES (?, ?, ?, ?)
-                    ''', (
-                        order_id,
-                        part['part_id'],
-                        part['quantity'],
-                        part['price']
-                    ))
+                cursor.executemany('''
+                INSERT INTO order_parts (order_id, part_id, quantity, price)
+                VALUES (?, ?, ?, ?)
+                ''', [
+                    (order_id, part['part_id'], part['quantity'], part['price'])
+                    for part in order_data['parts']
+                ])
+                
+                # Baixa no estoque das peças consumidas
+                quantity_changes = OrderPartsChanges(inserted=list(order_data['parts'])).quantity_changes()
+                _apply_stock_changes(cursor, order_id, quantity_changes)
             
             conn.commit()
             conn.close()
             
-            logger.info(f"Ordem de serviço adicionada com ID {order_id}")
-            return order_id
+            logger.info(f"Ordem de serviço {number} adicionada com ID {order_id}")
+            order = self.get_order_row(order_id)
+            _publish_order_change(order_id, INSERT, order, quantity_changes)
+            return order
         except Exception as e:
             logger.error(f"Erro ao adicionar ordem de serviço: {str(e)}")
             return None
     
-    def update_order(self, order_id: int, order_data: Dict[str, Any]) -> bool:
-        """Atualiza uma ordem de serviço existente"""
+    def update_order(self, order_id: int, order_data: Dict[str, Any]) -> OrderUpdateResult:
+        """Atualiza uma ordem de serviço existente
+        
+        Aceita atualizações parciais: apenas os campos presentes em `order_data`
+        que diferem do registro atual são gravados, em um único UPDATE. Se
+        `order_data` trouxer a `version` carregada, a gravação só acontece
+        quando ela ainda for a versão atual no banco; caso contrário nada é
+        alterado e o resultado vem com `conflict=True`.
+        """
         try:
             conn = get_connection()
             cursor = conn.cursor()
             
-            # Atualizar a ordem
-            query = '''
-            UPDATE service_orders
-            SET number = ?, vehicle_id = ?, description = ?, status = ?, 
-                employee_id = ?, completion_date = ?, total_value = ?, payment_method = ?
+            cursor.execute(f'''
+            SELECT {', '.join(self.UPDATABLE_COLUMNS)}, version
+            FROM service_orders
             WHERE id = ?
-            '''
+            ''', (order_id,))
+            current = cursor.fetchone()
             
-            cursor.execute(query, (
-                order_data['number'],
-                order_data['vehicle_id'],
-                order_data['description'],
-                order_data['status'],
-                order_data['employee_id'],
-                order_data.get('completion_date'),
-                order_data['total_value'],
-                order_data['payment_method'],
-                order_id
-            ))
+            if not current:
+                logger.warning(f"Ordem de serviço {order_id} não encontrada")
+                conn.close()
+                return OrderUpdateResult(False)
+            
+            expected_version = order_data.get('version')
+            if expected_version is not None and expected_version != current['version']:
+                conn.close()
+                return self._conflict(order_id, expected_version, current['version'])
+            
+            # Campos alterados em relação ao registro atual (assinaturas iguais não são regravadas)
+            changes = changed_columns(current, order_data, self.UPDATABLE_COLUMNS)
             
-            # Atualizar assinaturas, se fornecidas
-            if 'client_signature' in order_data:
-                cursor.execute('''
-                UPDATE service_orders
-                SET client_signature = ?
-                WHERE id = ?
-                ''', (order_data['client_signature'], order_id))
-            
-            if 'mechanic_signature' in order_data:
-                cursor.execute('''
-                UPDATE service_orders
-                SET mechanic_signature = ?
-                WHERE id = ?
-                ''', (order_data['mechanic_signature'], order_id))
-            
-            # Atualizar peças usadas, se houver
+            # Diferença das peças usadas, se enviadas
+            parts_changes = None
             if 'parts' in order_data:
-                # Remover peças existentes
-                cursor.execute("DELETE FROM order_parts WHERE order_id = ?", (order_id,))
+                cursor.execute("SELECT id, part_id, quantity, price FROM order_parts WHERE order_id = ?", (order_id,))
+                parts_changes = diff_order_parts(cursor.fetchall(), order_data['parts'])
+            
+            if not changes and not parts_changes:
+                conn.close()
+                logger.info(f"Ordem de serviço {order_id} sem alterações")
+                return OrderUpdateResult(True, version=current['version'], parts_changes=parts_changes,
+                                         order=self.get_order_row(order_id))
+            
+            # Um único UPDATE com os campos alterados e a nova versão; a condição
+            # de versão protege contra gravações de outra estação desde a leitura
+            updated = update_columns(
+                cursor, 'service_orders', order_id, changes,
+                extra_assignments=("version = version + 1",),
+                condition="version = ?", condition_params=(current['version'],)
+            )
+            
+            if updated == 0:
+                cursor.execute("SELECT version FROM service_orders WHERE id = ?", (order_id,))
+                latest = cursor.fetchone()
+                conn.rollback()
+                conn.close()
+                return self._conflict(order_id, current['version'], latest['version'] if latest else None)
+            
+            if 'number' in changes:
+                _advance_order_number_sequences(cursor, changes['number'])
+            
+            if parts_changes:
+                if parts_changes.deleted:
+                    cursor.executemany(
+                        "DELETE FROM order_parts WHERE id = ?",
+                        [(row['id'],) for row in parts_changes.deleted]
+                    )
                 
-                # Adicionar novas peças
-                for part in order_data['parts']:
-                    cursor.execute('''
+                if parts_changes.updated:
+                    cursor.executemany(
+                        "UPDATE order_parts SET quantity = ?, price = ? WHERE id = ?",
+                        [(new['quantity'], new['price'], old['id']) for old, new in parts_changes.updated]
+                    )
+                
+                if parts_changes.inserted:
+                    cursor.executemany('''
                     INSERT INTO order_parts (order_id, part_id, quantity, price)
                     VALUES (?, ?, ?, ?)
-                    ''', (
-                        order_id,
-                        part['part_id'],
-                        part['quantity'],
-                        part['price']
-                    ))
+                    ''', [
+                        (order_id, part['part_id'], part['quantity'], part['price'])
+                        for part in parts_changes.inserted
+                    ])
+                
+                # Lançar no estoque apenas a variação de quantidades
+                _apply_stock_changes(cursor, order_id, parts_changes.quantity_changes())
             
             conn.commit()
             conn.close()
             
-            logger.info(f"Ordem de serviço {order_id} atualizada")
-            return True
+            version = current['version'] + 1
+            logger.info(f"Ordem de serviço {order_id} atualizada (versão {version})")
+            order = self.get_order_row(order_id)
+            _publish_order_change(order_id, UPDATE, order,
+                                  parts_changes.quantity_changes() if parts_changes else None)
+            return OrderUpdateResult(True, version=version, parts_changes=parts_changes,
+                                     changed_fields=list(changes), order=order)
         except Exception as e:
             logger.error(f"Erro ao atualizar ordem de serviço {order_id}: {str(e)}")
-            return False
+            return OrderUpdateResult(False)
+    
+    def _conflict(self, order_id: int, expected_version: int, current_version: Optional[int]) -> OrderUpdateResult:
+        """Registra e retorna o resultado de um conflito de versão"""
+        logger.warning(
+            f"Conflito ao atualizar ordem de serviço {order_id}: "
+            f"versão {expected_version} carregada, versão atual {current_version}"
+        )
+        return OrderUpdateResult(False, conflict=True, version=current_version)
     
     def delete_order(self, order_id: int) -> bool:
         """Exclui uma ordem de serviço"""
@@ -204,6 +502,11 @@ class ServiceOrderController:
             conn = get_connection()
             cursor = conn.cursor()
             
+            # Devolver ao estoque as peças da ordem
+            cursor.execute("SELECT part_id, quantity FROM order_parts WHERE order_id = ?", (order_id,))
+            quantity_changes = OrderPartsChanges(deleted=cursor.fetchall()).quantity_changes()
+            _apply_stock_changes(cursor, order_id, quantity_changes)
+            
             # Excluir peças relacionadas
             cursor.execute("DELETE FROM order_parts WHERE order_id = ?", (order_id,))
             
@@ -212,6 +515,7 @@ class ServiceOrderController:
             
             conn.commit()
             conn.close()
+            _publish_order_change(order_id, DELETE, quantity_changes=quantity_changes)
             
             logger.info(f"Ordem de serviço {order_id} excluída")
             return True
@@ -271,3 +575,41 @@ class ServiceOrderController:
                 'avg_value': 0,
                 'payment_methods': []
             }
+    
+    def get_margin_rows(self) -> Optional[List[tuple]]:
+        """
+        Retorna as peças de todas as ordens com preço de venda e custo, para o
+        cálculo de margens (ver services/margin_analytics.py).
+        
+        Uma linha (ordem, valor total, funcionário, mês 'YYYY-MM', peça,
+        quantidade, preço de venda, preço de compra) por peça, e uma linha com
+        peça -1 para cada ordem sem peças, em ordem de ordem. Funcionário
+        ausente é -1; preço de compra ausente é 0.
+        """
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+            # Tuplas em vez de dicionários: são muitas linhas, lidas por coluna
+            cursor.row_factory = None
+            
+            cursor.execute('''
+            SELECT so.id,
+                   COALESCE(so.total_value, 0),
+                   COALESCE(so.employee_id, -1),
+                   substr(COALESCE(date(so.open_date), date(so.created_at), ''), 1, 7),
+                   COALESCE(op.part_id, -1),
+                   COALESCE(op.quantity, 0),
+                   COALESCE(op.price, 0),
+                   COALESCE(p.buy_price, 0)
+            FROM service_orders so
+            LEFT JOIN order_parts op ON op.order_id = so.id
+            LEFT JOIN parts p ON p.id = op.part_id
+            ORDER BY so.id
+            ''')
+            rows = cursor.fetchall()
+            conn.close()
+            
+            return rows
+        except Exception as e:
+            logger.error(f"Erro ao obter custos das ordens: {str(e)}")
+            return None
@@ -1,6 +1,8 @@
 import logging
+import sqlite3
 from typing import List, Dict, Any, Optional
-from database.db_manager import get_connection
+from database.db_manager import get_connection, fetch_page, fetch_changes, RowChanges, changed_columns, update_columns
+from services.change_bus import change_bus, INSERT, UPDATE, DELETE
 import config
 
 logger = logging.getLogger(config.APP_NAME)
@@ -8,6 +10,13 @@ logger = logging.getLogger(config.APP_NAME)
 class VehicleController:
     """Controlador para operações relacionadas a veículos"""
     
+    # Colunas que podem ser alteradas por update_vehicle
+    UPDATABLE_COLUMNS = ['plate', 'brand', 'model', 'year', 'color', 'client_id', 'brand_code', 'model_code']
+
+    # Chave de ordenação e colunas de busca da listagem paginada (ver fetch_page)
+    PAGE_ORDER = [('v.plate', 'plate', ''), ('v.id', 'id', 0)]
+    SEARCH_COLUMNS = ('v.plate', 'v.brand', 'v.model', 'v.year', 'v.color', 'c.name')
+    
     def get_all_vehicles(self) -> List[Dict[str, Any]]:
         """Retorna todos os veículos com informações do cliente"""
         try:
@@ -30,6 +39,50 @@ class VehicleController:
             logger.error(f"Erro ao obter veículos: {str(e)}")
             return []
     
+    def get_vehicles_page(self, limit: int, after: Optional[Dict[str, Any]] = None,
+                          search: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Retorna uma página de veículos ordenados por placa, a partir da linha `after`"""
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+            
+            query = '''
+            SELECT v.*, c.name as client_name
+            FROM vehicles v
+            LEFT JOIN clients c ON v.client_id = c.id
+            '''
+            
+            vehicles = fetch_page(
+                cursor, query, self.PAGE_ORDER, limit, after,
+                search=search, search_columns=self.SEARCH_COLUMNS
+            )
+            conn.close()
+            
+            return vehicles
+        except Exception as e:
+            logger.error(f"Erro ao obter página de veículos: {str(e)}")
+            return []
+    
+    def get_vehicles_changed_since(self, since: str) -> Optional[RowChanges]:
+        """Retorna os veículos alterados e os IDs dos excluídos desde `since` (ver fetch_changes)"""
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+            
+            query = '''
+            SELECT v.*, c.name as client_name
+            FROM vehicles v
+            LEFT JOIN clients c ON v.client_id = c.id
+            '''
+            
+            changes = fetch_changes(cursor, query, 'vehicles', since, column='v.updated_at')
+            conn.close()
+            
+            return changes
+        except Exception as e:
+            logger.error(f"Erro ao obter alterações de veículos: {str(e)}")
+            return None
+    
     def get_vehicle_by_id(self, vehicle_id: int) -> Optional[Dict[str, Any]]:
         """Retorna um veículo pelo ID"""
         try:
@@ -73,15 +126,19 @@ class VehicleController:
             logger.error(f"Erro ao obter veículos do cliente {client_id}: {str(e)}")
             return []
     
-    def add_vehicle(self, vehicle_data: Dict[str, Any]) -> Optional[int]:
-        """Adiciona um novo veículo"""
+    def add_vehicle(self, vehicle_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Adiciona um novo veículo e retorna o registro gravado (None em caso de falha)
+
+        Violações de restrição do banco (sqlite3.IntegrityError) são propagadas
+        para que o diálogo mostre o motivo.
+        """
         try:
             conn = get_connection()
             cursor = conn.cursor()
             
             query = '''
-            INSERT INTO vehicles (plate, brand, model, year, color, client_id)
-            VALUES (?, ?, ?, ?, ?, ?)
+            INSERT INTO vehicles (plate, brand, model, year, color, client_id, brand_code, model_code)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
             '''
             
             cursor.execute(query, (
@@ -90,7 +147,9 @@ class VehicleController:
                 vehicle_data['model'],
                 vehicle_data['year'],
                 vehicle_data['color'],
-                vehicle_data['client_id']
+                vehicle_data['client_id'],
+                vehicle_data.get('brand_code'),
+                vehicle_data.get('model_code')
             ))
             
             vehicle_id = cursor.lastrowid
@@ -98,41 +157,56 @@ class VehicleController:
             conn.close()
             
             logger.info(f"Veículo adicionado com ID {vehicle_id}")
-            return vehicle_id
+            vehicle = self.get_vehicle_by_id(vehicle_id)
+            change_bus.publish('vehicles', vehicle_id, INSERT, vehicle)
+            return vehicle
+        except sqlite3.IntegrityError as e:
+            # Fechar a conexão antes de propagar, liberando a transação aberta
+            conn.close()
+            logger.error(f"Erro ao adicionar veículo: {str(e)}")
+            raise
         except Exception as e:
             logger.error(f"Erro ao adicionar veículo: {str(e)}")
             return None
     
-    def update_vehicle(self, vehicle_id: int, vehicle_data: Dict[str, Any]) -> bool:
-        """Atualiza um veículo existente"""
+    def update_vehicle(self, vehicle_id: int, vehicle_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Atualiza um veículo existente, gravando apenas os campos informados que mudaram
+
+        Retorna o registro atualizado, ou None em caso de falha. Violações de
+        restrição do banco (sqlite3.IntegrityError) são propagadas, como em
+        add_vehicle.
+        """
         try:
             conn = get_connection()
             cursor = conn.cursor()
             
-            query = '''
-            UPDATE vehicles
-            SET plate = ?, brand = ?, model = ?, year = ?, color = ?, client_id = ?
-            WHERE id = ?
-            '''
+            cursor.execute("SELECT * FROM vehicles WHERE id = ?", (vehicle_id,))
+            current = cursor.fetchone()
             
-            cursor.execute(query, (
-                vehicle_data['plate'],
-                vehicle_data['brand'],
-                vehicle_data['model'],
-                vehicle_data['year'],
-                vehicle_data['color'],
-                vehicle_data['client_id'],
-                vehicle_id
-            ))
+            if not current:
+                logger.warning(f"Veículo {vehicle_id} não encontrado")
+                conn.close()
+                return None
+            
+            # Gravar apenas os campos que mudaram em relação ao registro atual
+            changes = changed_columns(current, vehicle_data, self.UPDATABLE_COLUMNS)
+            update_columns(cursor, 'vehicles', vehicle_id, changes)
             
             conn.commit()
             conn.close()
             
             logger.info(f"Veículo {vehicle_id} atualizado")
-            return True
+            vehicle = self.get_vehicle_by_id(vehicle_id)
+            if changes:
+                change_bus.publish('vehicles', vehicle_id, UPDATE, vehicle)
+            return vehicle
+        except sqlite3.IntegrityError as e:
+            conn.close()
+            logger.error(f"Erro ao atualizar veículo {vehicle_id}: {str(e)}")
+            raise
         except Exception as e:
             logger.error(f"Erro ao atualizar veículo {vehicle_id}: {str(e)}")
-            return False
+            return None
     
     def delete_vehicle(self, vehicle_id: int) -> bool:
         """Exclui um veículo"""
@@ -153,6 +227,7 @@ class VehicleController:
             cursor.execute("DELETE FROM vehicles WHERE id = ?", (vehicle_id,))
             conn.commit()
             conn.close()
+            change_bus.publish('vehicles', vehicle_id, DELETE)
             
             logger.info(f"Veículo {vehicle_id} excluído")
             return True
@@ -1,6 +1,8 @@
 import sqlite3
 import logging
 import os
+import unicodedata
+from dataclasses import dataclass
 from datetime import datetime
 from typing import List, Dict, Any, Optional, Tuple
 import config
@@ -25,12 +27,170 @@ def dict_factory(cursor, row):
         d[col[0]] = row[idx]
     return d
 
+def normalize_search_text(text) -> str:
+    """Normaliza um texto para busca: sem acentos e sem diferença de maiúsculas"""
+    if text is None:
+        return ""
+    decomposed = unicodedata.normalize('NFKD', str(text))
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
 def get_connection():
     """Retorna uma conexão com o banco de dados"""
     conn = sqlite3.connect(config.DB_PATH)
     conn.row_factory = dict_factory
+    # Busca das consultas paginadas com a mesma normalização da busca em memória
+    conn.create_function("normalize_search", 1, normalize_search_text, deterministic=True)
     return conn
 
+def changed_columns(current: Dict[str, Any], data: Dict[str, Any], columns: List[str]) -> Dict[str, Any]:
+    """Retorna as colunas presentes em `data` cujo valor difere do registro atual
+    
+    Permite atualizações parciais: colunas ausentes em `data` ficam como estão.
+    """
+    return {
+        column: data[column]
+        for column in columns
+        if column in data and data[column] != current.get(column)
+    }
+
+def update_columns(cursor, table: str, row_id: int, changes: Dict[str, Any],
+                   extra_assignments: Tuple[str, ...] = (), condition: str = "",
+                   condition_params: Tuple[Any, ...] = ()) -> int:
+    """Grava as colunas alteradas de um registro em uma única instrução UPDATE
+    
+    Args:
+        cursor: Cursor da transação em andamento
+        table: Nome da tabela
+        row_id: ID do registro
+        changes: Colunas e novos valores (ver `changed_columns`)
+        extra_assignments: Atribuições SQL adicionais (ex.: "version = version + 1")
+        condition: Condição extra do WHERE (ex.: "version = ?")
+        condition_params: Parâmetros da condição extra
+    
+    Returns:
+        Número de linhas atualizadas (0 quando não há nada a gravar)
+    """
+    assignments = [f"{column} = ?" for column in changes] + list(extra_assignments)
+    if not assignments:
+        return 0
+    
+    query = f"UPDATE {table} SET {', '.join(assignments)} WHERE id = ?"
+    if condition:
+        query += f" AND {condition}"
+    
+    cursor.execute(query, (*changes.values(), row_id, *condition_params))
+    return cursor.rowcount
+
+def fetch_page(cursor, query: str, order_by: List[Tuple[str, str, Any]], limit: int,
+               after: Optional[Dict[str, Any]] = None, descending: bool = False,
+               search: Optional[str] = None, search_columns: Tuple[str, ...] = ()) -> List[Dict[str, Any]]:
+    """Consulta paginada por chave (keyset): retorna as linhas seguintes a `after`
+    
+    Em vez de OFFSET, a página seguinte começa após a chave de ordenação da
+    última linha recebida, de modo que cada página custa o mesmo que a
+    primeira quando há um índice sobre a chave.
+    
+    Args:
+        cursor: Cursor da conexão
+        query: SELECT ... FROM ... sem WHERE nem ORDER BY
+        order_by: Chave de ordenação como [(expressão SQL, campo no resultado,
+                  valor usado quando o campo é nulo)]; o último item deve ser único (id)
+        limit: Tamanho da página
+        after: Última linha da página anterior (None para a primeira página)
+        descending: Ordem decrescente
+        search: Texto de busca aplicado às colunas de `search_columns`, sem
+                diferença de acentos e maiúsculas (normalize_search_text)
+        search_columns: Expressões SQL pesquisadas pelo texto de busca
+    """
+    conditions = []
+    params: List[Any] = []
+    
+    needle = normalize_search_text(search)
+    if needle and search_columns:
+        conditions.append(" OR ".join(f"instr(normalize_search({column}), ?) > 0" for column in search_columns))
+        params.extend([needle] * len(search_columns))
+    
+    if after is not None:
+        values = [
+            after[field] if after[field] is not None else null_value
+            for _, field, null_value in order_by
+        ]
+        keys = ", ".join(expression for expression, _, _ in order_by)
+        placeholders = ", ".join("?" for _ in order_by)
+        # O limite explícito na primeira coluna permite ao SQLite fazer uma
+        # busca no índice também quando a chave é uma expressão (COALESCE)
+        conditions.append(f"{order_by[0][0]} {'<=' if descending else '>='} ?")
+        conditions.append(f"({keys}) {'<' if descending else '>'} ({placeholders})")
+        params.extend([values[0], *values])
+    
+    if conditions:
+        query += " WHERE " + " AND ".join(f"({condition})" for condition in conditions)
+    
+    direction = "DESC" if descending else "ASC"
+    query += " ORDER BY " + ", ".join(f"{expression} {direction}" for expression, _, _ in order_by)
+    query += " LIMIT ?"
+    params.append(limit)
+    
+    cursor.execute(query, params)
+    return cursor.fetchall()
+
+@dataclass
+class RowChanges:
+    """Registros alterados e excluídos de uma tabela desde um instante (ver fetch_changes)"""
+    rows: List[Dict[str, Any]]
+    deleted_ids: List[int]
+    until: str  # Instante da consulta; usar como `since` na próxima
+
+def fetch_changes(cursor, query: str, table: str, since: str, column: str = "updated_at") -> RowChanges:
+    """Consulta os registros alterados (updated_at) e excluídos (deleted_rows) desde `since`
+    
+    O intervalo começa CHANGE_DELTA_OVERLAP_SECONDS antes de `since`, para
+    cobrir diferenças de relógio entre estações; registros repetidos entre
+    consultas seguidas devem ser tratados como atualização.
+    
+    Args:
+        cursor: Cursor da conexão
+        query: SELECT ... FROM ... sem WHERE, no formato da listagem
+        table: Tabela consultada em deleted_rows
+        since: Valor de `until` da consulta anterior
+        column: Coluna updated_at na consulta (ex.: "so.updated_at")
+    """
+    cursor.execute("SELECT strftime('%Y-%m-%d %H:%M:%f', 'now') AS now")
+    until = cursor.fetchone()['now']
+    
+    cursor.execute("SELECT strftime('%Y-%m-%d %H:%M:%f', ?, ?) AS start",
+                   (since, f"-{config.CHANGE_DELTA_OVERLAP_SECONDS} seconds"))
+    start = cursor.fetchone()['start']
+    
+    cursor.execute(f"{query} WHERE {column} >= ?", (start,))
+    rows = cursor.fetchall()
+    
+    cursor.execute(
+        "SELECT row_id FROM deleted_rows WHERE table_name = ? AND deleted_at >= ?",
+        (table, start)
+    )
+    deleted_ids = [row['row_id'] for row in cursor.fetchall()]
+    
+    return RowChanges(rows, deleted_ids, until)
+
+def current_timestamp() -> str:
+    """Instante atual do banco no formato de updated_at"""
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute("SELECT strftime('%Y-%m-%d %H:%M:%f', 'now') AS now")
+    now = cursor.fetchone()['now']
+    conn.close()
+    return now
+
+def count_rows(table: str) -> int:
+    """Número de linhas de uma tabela (usado para o progresso dos relatórios)"""
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT COUNT(*) AS count FROM {table}")
+    count = cursor.fetchone()['count']
+    conn.close()
+    return count
+
 def initialize_database():
     """Cria as tabelas se não existirem e insere dados de exemplo"""
     logger.info("Inicializando banco de dados...")
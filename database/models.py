@@ -10,6 +10,13 @@ import config
 logger = logging.getLogger(config.APP_NAME)
 
 
+# Tabelas cujas alterações são contadas em change_counters e que têm
+# updated_at e registro de exclusões (deleted_rows)
+WATCHED_TABLES = ('clients', 'vehicles', 'employees', 'parts', 'expenses', 'service_orders')
+
+# Instante atual com milissegundos, usado em updated_at e deleted_rows
+TIMESTAMP_NOW = "strftime('%Y-%m-%d %H:%M:%f', 'now')"
+
 def setup_database(db_path):
     """Configura o banco de dados e cria as tabelas necessárias"""
     conn = sqlite3.connect(db_path)
@@ -22,6 +29,20 @@ def setup_database(db_path):
     
     return conn
 
+def add_column_if_missing(cursor: sqlite3.Cursor, table: str, column: str, definition: str):
+    """
+    Adiciona uma coluna a uma tabela existente, caso ela ainda não exista.
+    
+    Args:
+        cursor: Cursor da conexão com o banco de dados
+        table: Nome da tabela
+        column: Nome da coluna
+        definition: Tipo e restrições da coluna (ex.: "INTEGER NOT NULL DEFAULT 1")
+    """
+    cursor.execute(f"PRAGMA table_info({table})")
+    if column not in [row[1] for row in cursor.fetchall()]:
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
 def create_tables(conn: sqlite3.Connection):
     """
     Cria todas as tabelas necessárias no banco de dados.
@@ -135,8 +156,231 @@ def create_tables(conn: sqlite3.Connection):
     )
     ''')
 
+    # Livro de movimentações de estoque (quantidade assinada: entradas
+    # positivas, saídas negativas)
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS stock_movements (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        part_id INTEGER NOT NULL,
+        movement_type TEXT NOT NULL,
+        quantity INTEGER NOT NULL,
+        order_id INTEGER,
+        notes TEXT,
+        moved_at TIMESTAMP NOT NULL,
+        FOREIGN KEY (part_id) REFERENCES parts (id),
+        FOREIGN KEY (order_id) REFERENCES service_orders (id)
+    )
+    ''')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_stock_movements_part ON stock_movements (part_id)")
+
+    # Saldos periódicos por peça, usados nas consultas de estoque em uma data
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS stock_checkpoints (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        part_id INTEGER NOT NULL,
+        movement_id INTEGER NOT NULL,
+        balance INTEGER NOT NULL,
+        checkpoint_at TIMESTAMP NOT NULL,
+        FOREIGN KEY (part_id) REFERENCES parts (id),
+        FOREIGN KEY (movement_id) REFERENCES stock_movements (id)
+    )
+    ''')
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_stock_checkpoints_part ON stock_checkpoints (part_id, movement_id)"
+    )
+
+    # Versão da linha para controle de concorrência otimista nas ordens
+    add_column_if_missing(cursor, 'service_orders', 'version', "INTEGER NOT NULL DEFAULT 1")
+
+    # Sequências de numeração das ordens de serviço, por escopo (prefixo,
+    # filial e ano configurados)
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS order_number_sequences (
+        scope TEXT PRIMARY KEY,
+        last_value INTEGER NOT NULL
+    )
+    ''')
+
+    # Número da ordem único, também usado para buscas diretas pelo número
+    try:
+        cursor.execute(
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_service_orders_number ON service_orders (number)"
+        )
+    except sqlite3.IntegrityError:
+        logger.error("Existem ordens de serviço com números duplicados; índice único não criado")
+
+    # Índices das chaves de ordenação das listagens paginadas (ver fetch_page)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_clients_name ON clients (name, id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_vehicles_plate ON vehicles (plate, id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_employees_name ON employees (name, id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_parts_code ON parts (code, id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_expenses_date ON expenses (COALESCE(date, ''), id)")
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_service_orders_open_date ON service_orders (COALESCE(open_date, ''), id)"
+    )
+
+    # Contadores de alterações por tabela, incrementados por triggers em
+    # qualquer gravação (inclusive de outras estações); permitem descobrir
+    # quais tabelas mudaram sem consultá-las (ver services/change_watcher.py)
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS change_counters (
+        table_name TEXT PRIMARY KEY,
+        counter INTEGER NOT NULL DEFAULT 0
+    )
+    ''')
+    for table in WATCHED_TABLES:
+        cursor.execute("INSERT OR IGNORE INTO change_counters (table_name) VALUES (?)", (table,))
+        for event in ('INSERT', 'UPDATE', 'DELETE'):
+            cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_{event.lower()}_counter
+            AFTER {event} ON {table}
+            BEGIN
+                UPDATE change_counters SET counter = counter + 1 WHERE table_name = '{table}';
+            END
+            ''')
+
+    # Exclusões registradas (tombstones), para que as consultas de alterações
+    # desde um instante (ver fetch_changes) também informem os registros excluídos
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS deleted_rows (
+        table_name TEXT NOT NULL,
+        row_id INTEGER NOT NULL,
+        deleted_at TEXT NOT NULL
+    )
+    ''')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_deleted_rows ON deleted_rows (table_name, deleted_at)")
+    cursor.execute(
+        "DELETE FROM deleted_rows WHERE deleted_at < strftime('%Y-%m-%d %H:%M:%f', 'now', ?)",
+        (f"-{config.TOMBSTONE_RETENTION_DAYS} days",)
+    )
+
+    # Instante da última alteração de cada registro, mantido por triggers
+    for table in WATCHED_TABLES:
+        cursor.execute(f"PRAGMA table_info({table})")
+        has_created_at = 'created_at' in [row[1] for row in cursor.fetchall()]
+        add_column_if_missing(cursor, table, 'updated_at', "TEXT")
+        cursor.execute(
+            f"UPDATE {table} SET updated_at = "
+            f"{'COALESCE(created_at, ' + TIMESTAMP_NOW + ')' if has_created_at else TIMESTAMP_NOW} "
+            f"WHERE updated_at IS NULL"
+        )
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_updated_at ON {table} (updated_at)")
+
+        cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_{table}_insert_updated_at
+        AFTER INSERT ON {table}
+        BEGIN
+            UPDATE {table} SET updated_at = {TIMESTAMP_NOW} WHERE id = NEW.id;
+        END
+        ''')
+        cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_{table}_update_updated_at
+        AFTER UPDATE ON {table}
+        WHEN NEW.updated_at IS OLD.updated_at
+        BEGIN
+            UPDATE {table} SET updated_at = {TIMESTAMP_NOW} WHERE id = NEW.id;
+        END
+        ''')
+        cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_{table}_delete_tombstone
+        AFTER DELETE ON {table}
+        BEGIN
+            INSERT INTO deleted_rows (table_name, row_id, deleted_at) VALUES ('{table}', OLD.id, {TIMESTAMP_NOW});
+        END
+        ''')
+
+    # Totais por dia usados nos filtros de período do dashboard
+    create_daily_totals(cursor)
+
+    # Peças cadastradas antes do livro de estoque recebem o saldo atual
+    # como movimentação de abertura
+    cursor.execute('''
+    INSERT INTO stock_movements (part_id, movement_type, quantity, notes, moved_at)
+    SELECT p.id, 'ajuste', p.stock_quantity, 'Saldo inicial', COALESCE(p.created_at, CURRENT_TIMESTAMP)
+    FROM parts p
+    WHERE COALESCE(p.stock_quantity, 0) != 0
+      AND NOT EXISTS (SELECT 1 FROM stock_movements m WHERE m.part_id = p.id)
+    ''')
+
     conn.commit()
 
+# Origem dos totais diários:
+# (tabela, coluna de data, coluna de valor, coluna de daily_totals, conta ordens)
+DAILY_TOTAL_SOURCES = (
+    ('service_orders', 'open_date', 'total_value', 'revenue', True),
+    ('expenses', 'date', 'value', 'expenses', False),
+)
+
+def create_daily_totals(cursor: sqlite3.Cursor):
+    """
+    Cria a tabela daily_totals (faturamento, despesas e ordens por dia),
+    mantida por triggers em service_orders e expenses. Na criação, a tabela
+    é preenchida com os registros já existentes.
+    
+    Args:
+        cursor: Cursor da conexão com o banco de dados
+    """
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'daily_totals'")
+    exists = cursor.fetchone() is not None
+
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS daily_totals (
+        day TEXT PRIMARY KEY,
+        revenue REAL NOT NULL DEFAULT 0,
+        expenses REAL NOT NULL DEFAULT 0,
+        orders INTEGER NOT NULL DEFAULT 0
+    )
+    ''')
+
+    for table, date_column, value_column, total_column, counts_orders in DAILY_TOTAL_SOURCES:
+        columns = [total_column] + (['orders'] if counts_orders else [])
+        names = ', '.join(columns)
+        updates = ', '.join(f"{name} = {name} + excluded.{name}" for name in columns)
+
+        def day(row):
+            # Registros sem data entram no dia em que foram cadastrados
+            return f"COALESCE(date({row}.{date_column}), date({row}.created_at))"
+
+        def upsert(row, sign):
+            """Soma (sign '+') ou subtrai (sign '-') os valores do registro no seu dia"""
+            values = [f"{sign}COALESCE({row}.{value_column}, 0)"] + ([f"{sign}1"] if counts_orders else [])
+            return (f"INSERT INTO daily_totals (day, {names}) "
+                    f"SELECT {day(row)}, {', '.join(values)} WHERE {day(row)} IS NOT NULL "
+                    f"ON CONFLICT(day) DO UPDATE SET {updates};")
+
+        cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_{table}_insert_daily_totals
+        AFTER INSERT ON {table}
+        BEGIN
+            {upsert('NEW', '+')}
+        END
+        ''')
+        cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_{table}_update_daily_totals
+        AFTER UPDATE OF {date_column}, {value_column}, created_at ON {table}
+        BEGIN
+            {upsert('OLD', '-')}
+            {upsert('NEW', '+')}
+        END
+        ''')
+        cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_{table}_delete_daily_totals
+        AFTER DELETE ON {table}
+        BEGIN
+            {upsert('OLD', '-')}
+        END
+        ''')
+
+        # Preencher com os registros existentes quando a tabela acaba de ser criada
+        if not exists:
+            sums = [f"SUM(COALESCE({table}.{value_column}, 0))"] + (["COUNT(*)"] if counts_orders else [])
+            cursor.execute(
+                f"INSERT INTO daily_totals (day, {names}) "
+                f"SELECT {day(table)}, {', '.join(sums)} FROM {table} "
+                f"WHERE {day(table)} IS NOT NULL GROUP BY 1 "
+                f"ON CONFLICT(day) DO UPDATE SET {updates}"
+            )
+
 def insert_sample_data(conn: sqlite3.Connection):
     """Insere dados de exemplo no banco de dados"""
     cursor = conn.cursor()
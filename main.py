@@ -2,123 +2,88 @@
 
 import sys
 import os
+import time
 import logging
+
+# Importado primeiro para que o rastreamento cubra as demais importações
+from startup_trace import tracer
+
 from PyQt5.QtWidgets import QApplication, QSplashScreen
-from PyQt5.QtGui import QPixmap
-from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtGui import QPixmap, QPainter, QColor, QFont
+from PyQt5.QtCore import Qt
 import config
-from database.db_manager import DatabaseManager
-from database.models import setup_database  # Garantir que a importação esteja correta
-
-# Configurar logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(config.LOG_DIR / "app.log"),
-        logging.StreamHandler()
-    ]
-)
+from startup import StartupPipeline, STARTUP_STAGES
 
+# O logging é configurado em config.py
 logger = logging.getLogger(config.APP_NAME)
 
+tracer.record("imports", tracer.origin, time.perf_counter())
+
+def create_splash_pixmap(width=500, height=300):
+    """Desenha o splash padrão, usado quando a imagem não existe"""
+    pixmap = QPixmap(width, height)
+    pixmap.fill(QColor("#2c3e50"))
+    
+    painter = QPainter(pixmap)
+    painter.fillRect(0, height - 40, width, 40, QColor("#3498db"))
+    painter.setPen(Qt.white)
+    
+    title_font = QFont("Arial", 20, QFont.Bold)
+    painter.setFont(title_font)
+    painter.drawText(0, 40, width, 50, Qt.AlignCenter, "Destak AutoCenter")
+    
+    painter.setFont(QFont("Arial", 11))
+    painter.drawText(0, 95, width, 30, Qt.AlignCenter, "Sistema de Gerenciamento de Oficina")
+    painter.end()
+    
+    return pixmap
+
 def main():
     # Iniciar aplicação
-    app = QApplication(sys.argv)
+    with tracer.span("qapplication"):
+        app = QApplication(sys.argv)
     
     # Aplicar folha de estilo
-    try:
-        with open(config.CSS_FILE, "r") as f:
-            app.setStyleSheet(f.read())
-    except Exception as e:
-        logger.error(f"Erro ao carregar CSS: {str(e)}")
-    
-    # Verificar se o arquivo splash.jpeg existe
-    splash_path = os.path.join("resources", "images", "splash.jpeg")
-    if not os.path.exists(splash_path):
-        logger.warning(f"Arquivo {splash_path} não encontrado!")
-        # Criar pasta resources/images se não existir
-        os.makedirs(os.path.dirname(splash_path), exist_ok=True)
-        
-        # Criar um splash screen básico (caso o arquivo não exista)
-        from PIL import Image, ImageDraw, ImageFont
-        
-        # Configurações da imagem
-        width, height = 500, 300
-        background_color = (44, 62, 80)  # #2c3e50 (azul escuro)
-        accent_color = (52, 152, 219)    # #3498db (azul claro)
-        text_color = (255, 255, 255)     # branco
-        
-        # Criar imagem com fundo azul escuro
-        img = Image.new('RGB', (width, height), background_color)
-        draw = ImageDraw.Draw(img)
-        
-        # Desenhar retângulo decorativo
-        draw.rectangle([(0, height-40), (width, height)], fill=accent_color)
-        
-        # Adicionar título
+    with tracer.span("stylesheet"):
         try:
-            title_font = ImageFont.load_default()
-            title_text = "Destak AutoCenter"
-            title_size = draw.textbbox((0, 0), title_text, font=title_font)
-            title_width = title_size[2] - title_size[0]
-            title_height = title_size[3] - title_size[1]
-            title_position = ((width - title_width) // 2, 50)
-            draw.text(title_position, title_text, font=title_font, fill=text_color)
-            
-            # Adicionar subtítulo
-            subtitle_font = ImageFont.load_default()
-            subtitle_text = "Sistema de Gerenciamento de Oficina"
-            subtitle_size = draw.textbbox((0, 0), subtitle_text, font=subtitle_font)
-            subtitle_width = subtitle_size[2] - subtitle_size[0]
-            subtitle_position = ((width - subtitle_width) // 2, 100)
-            draw.text(subtitle_position, subtitle_text, font=subtitle_font, fill=text_color)
-            
-            # Adicionar texto de carregando
-            loading_text = "Carregando..."
-            loading_position = (20, height - 30)
-            draw.text(loading_position, loading_text, font=subtitle_font, fill=text_color)
-            
-            # Salvar a imagem
-            img.save(splash_path)
-            logger.info("Imagem splash.jpeg criada com sucesso!")
+            with open(config.CSS_FILE, "r") as f:
+                app.setStyleSheet(f.read())
         except Exception as e:
-            logger.error(f"Erro ao criar splash screen: {str(e)}")
+            logger.error(f"Erro ao carregar CSS: {str(e)}")
     
     # Criar e mostrar o splash screen
-    splash_pix = QPixmap(splash_path)
-    splash = QSplashScreen(splash_pix, Qt.WindowStaysOnTopHint)
-    splash.setWindowFlags(Qt.WindowStaysOnTopHint | Qt.FramelessWindowHint)
-    splash.setEnabled(False)
-    splash.show()
-    
-    # Garantir que o splash seja exibido
-    app.processEvents()
-    
-    # Inicializar banco de dados
-    splash.showMessage("Inicializando banco de dados...", Qt.AlignBottom | Qt.AlignLeft, Qt.white)
-    app.processEvents()
-    
-    db_manager = DatabaseManager()
-    setup_database(config.DB_PATH)  # Chamando a função para configurar o banco
-    
-    # Importar a janela principal aqui para que o splash seja exibido enquanto ela carrega
-    splash.showMessage("Carregando interface...", Qt.AlignBottom | Qt.AlignLeft, Qt.white)
-    app.processEvents()
+    with tracer.span("splash"):
+        splash_path = os.path.join("resources", "images", "splash.jpeg")
+        splash_pix = QPixmap(splash_path)
+        if splash_pix.isNull():
+            logger.warning(f"Arquivo {splash_path} não encontrado!")
+            splash_pix = create_splash_pixmap()
+        
+        splash = QSplashScreen(splash_pix, Qt.WindowStaysOnTopHint)
+        splash.setWindowFlags(Qt.WindowStaysOnTopHint | Qt.FramelessWindowHint)
+        splash.setEnabled(False)
+        splash.show()
+        
+        # Garantir que o splash seja exibido
+        app.processEvents()
     
-    from ui.main_window import MainWindow
+    def show_progress(message, completed, total):
+        splash.showMessage(f"{message} ({completed + 1}/{total})", Qt.AlignBottom | Qt.AlignLeft, Qt.white)
+        app.processEvents()
     
-    # Criar e configurar a janela principal
-    window = MainWindow()
+    # Executar as etapas de inicialização (banco de dados, dados de
+    # referência e janela principal)
+    pipeline = StartupPipeline(progress=show_progress, pump=app.processEvents)
+    with tracer.span("pipeline"):
+        results = pipeline.run(STARTUP_STAGES)
     
-    # Fechar o splash e mostrar a janela principal após 2 segundos
-    QTimer.singleShot(2000, lambda: show_main_window(window, splash))
+    # Mostrar a janela principal assim que estiver pronta
+    with tracer.span("show_window"):
+        window = results['window']
+        window.show()
+        splash.finish(window)
     
     sys.exit(app.exec_())
 
-def show_main_window(window, splash):
-    window.show()
-    splash.finish(window)
-
 if __name__ == "__main__":
     main()
@@ -0,0 +1,76 @@
+"""
+Barramento de notificações de alterações.
+
+Os controladores publicam uma alteração `(entidade, id, operação)` depois de
+cada commit; quem mantém dados em memória (abas, dashboard, caches) se
+inscreve para atualizar apenas o que mudou. As entidades são os nomes das
+tabelas ('clients', 'vehicles', 'employees', 'parts', 'expenses',
+'service_orders').
+
+O barramento não depende do Qt: os assinantes são chamados na thread que
+publicou. As views usam o ChangeDispatcher (ui/change_dispatcher.py), que
+leva as alterações para a thread principal e as agrupa por quadro.
+"""
+
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import config
+
+logger = logging.getLogger(config.APP_NAME)
+
+# Operações publicadas
+INSERT = 'insert'
+UPDATE = 'update'
+DELETE = 'delete'
+EXTERNAL = 'external'  # Tabela alterada por outra estação; sem ID (ver services/change_watcher.py)
+
+
+@dataclass(frozen=True)
+class Change:
+    """Alteração de um registro
+
+    `record` traz o registro como ficou no banco, no formato da listagem,
+    quando o controlador já o tem em mãos (None nas exclusões).
+    """
+    entity: str
+    id: Optional[int]
+    operation: str
+    record: Optional[Dict[str, Any]] = None
+
+
+class ChangeBus:
+    """Publica alterações para os assinantes interessados na entidade"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.subscribers: List[Tuple[Callable[[Change], None], Optional[frozenset]]] = []
+
+    def subscribe(self, callback: Callable[[Change], None], entities: Optional[Iterable[str]] = None):
+        """Inscreve `callback` para as alterações das entidades informadas (ou de todas)"""
+        with self.lock:
+            self.subscribers.append((callback, frozenset(entities) if entities else None))
+
+    def unsubscribe(self, callback: Callable[[Change], None]):
+        with self.lock:
+            self.subscribers = [(cb, entities) for cb, entities in self.subscribers if cb != callback]
+
+    def publish(self, entity: str, record_id: Optional[int], operation: str,
+                record: Optional[Dict[str, Any]] = None):
+        """Notifica os assinantes de uma alteração já gravada no banco"""
+        change = Change(entity, record_id, operation, record)
+        with self.lock:
+            subscribers = list(self.subscribers)
+
+        for callback, entities in subscribers:
+            if entities is not None and entity not in entities:
+                continue
+            try:
+                callback(change)
+            except Exception as e:
+                logger.error(f"Erro ao notificar alteração em {entity}: {str(e)}")
+
+
+# Instância global do barramento
+change_bus = ChangeBus()
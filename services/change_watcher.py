@@ -0,0 +1,209 @@
+"""
+Detecção de alterações gravadas por outras estações no mesmo banco.
+
+Cada verificação lê `PRAGMA data_version` em uma conexão própria. O valor só
+muda quando outra conexão grava no arquivo, então uma verificação sem
+alterações custa alguns microssegundos. Quando muda, a tabela
+change_counters (mantida por triggers, ver database/models.py) indica quais
+tabelas foram alteradas. De cada uma são buscados apenas os registros
+alterados ou excluídos desde a última consulta (`get_*_changed_since`), que
+são publicados no barramento de alterações como UPDATE/DELETE; se forem
+muitos, ou se a consulta falhar, a tabela é publicada como uma alteração
+EXTERNAL, sem ID, para ser recarregada.
+
+A verificação (poll) e a publicação (publish) rodam na thread da interface,
+onde vivem os assinantes do barramento; as consultas de alterações
+(fetch_changes) rodam em segundo plano, entre as duas (ver
+MainWindow.poll_external_changes).
+
+As gravações desta estação também mudam os contadores, mas já são
+publicadas pelos controladores. O verificador guarda os registros publicados
+localmente (ID e updated_at) e descarta das consultas de alterações os que
+continuam como foram publicados, enquanto estiverem na margem
+CHANGE_DELTA_OVERLAP_SECONDS; o que outra estação gravou na mesma tabela no
+intervalo continua sendo publicado.
+"""
+
+import logging
+import sqlite3
+import importlib
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+from database.db_manager import RowChanges
+from services.change_bus import change_bus, UPDATE, DELETE, EXTERNAL
+import config
+
+logger = logging.getLogger(config.APP_NAME)
+
+# Consulta de alterações de cada tabela: (módulo, classe do controlador, método)
+DELTA_SOURCES = {
+    'clients': ('controllers.client_controller', 'ClientController', 'get_clients_changed_since'),
+    'vehicles': ('controllers.vehicle_controller', 'VehicleController', 'get_vehicles_changed_since'),
+    'employees': ('controllers.employee_controller', 'EmployeeController', 'get_employees_changed_since'),
+    'parts': ('controllers.part_controller', 'PartController', 'get_parts_changed_since'),
+    'expenses': ('controllers.expense_controller', 'ExpenseController', 'get_expenses_changed_since'),
+    'service_orders': ('controllers.service_order_controller', 'ServiceOrderController',
+                       'get_orders_changed_since'),
+}
+
+
+class ExternalChangeWatcher:
+    """Verifica periodicamente se outra estação alterou o banco"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.conn = None
+        self.data_version = None
+        self.counters: Dict[str, int] = {}
+        self.synced_at: Dict[str, str] = {}  # Tabela -> `until` da última consulta de alterações
+        # Gravações desta estação: tabela -> {ID: (updated_at publicado, instante da gravação)};
+        # nas exclusões, updated_at é DELETE
+        self.local_changes: Dict[str, Dict[int, Tuple[Optional[str], str]]] = {}
+        self.publishing = False
+        change_bus.subscribe(self._on_local_change)
+
+    def start(self):
+        """Abre a conexão de verificação e registra o estado atual como referência"""
+        with self.lock:
+            if self.conn is not None:
+                return
+            self.conn = sqlite3.connect(config.DB_PATH, check_same_thread=False)
+            self._snapshot()
+            now = self.conn.execute("SELECT strftime('%Y-%m-%d %H:%M:%f', 'now')").fetchone()[0]
+            self.synced_at = {table: now for table in DELTA_SOURCES}
+
+    def stop(self):
+        with self.lock:
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
+
+    def poll(self) -> List[str]:
+        """Retorna as tabelas cujos contadores mudaram desde a última verificação
+
+        Lê apenas data_version e change_counters; as alterações de cada tabela
+        são consultadas depois por fetch_changes.
+        """
+        try:
+            with self.lock:
+                if self.conn is None:
+                    return []
+                version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+                if version == self.data_version:
+                    return []
+
+                self.data_version = version
+                counters = self._read_counters()
+                changed = [table for table, counter in counters.items() if counter != self.counters.get(table)]
+                self.counters = counters
+        except Exception as e:
+            logger.error(f"Erro ao verificar alterações externas: {str(e)}")
+            return []
+        return changed
+
+    def fetch_changes(self, tables: List[str]) -> Dict[str, Optional[RowChanges]]:
+        """Consulta as alterações de cada tabela desde a última publicação (fora da thread da interface)"""
+        return {table: self._changes_since(table) for table in tables}
+
+    def publish(self, deltas: Dict[str, Optional[RowChanges]]) -> List[str]:
+        """Publica as alterações consultadas por fetch_changes e retorna as tabelas alteradas externamente
+
+        None no lugar das alterações de uma tabela (consulta falhou) publica a
+        tabela inteira como EXTERNAL.
+        """
+        self.publishing = True
+        try:
+            external = [table for table, changes in deltas.items() if self._publish_delta(table, changes)]
+        finally:
+            self.publishing = False
+
+        if external:
+            logger.info(f"Alterações de outra estação em: {', '.join(external)}")
+        return external
+
+    def _changes_since(self, table: str) -> Optional[RowChanges]:
+        source = DELTA_SOURCES.get(table)
+        if source is None or table not in self.synced_at:
+            return None
+        # Importação local: os controladores só são carregados quando há alterações
+        module_name, class_name, method = source
+        controller = getattr(importlib.import_module(module_name), class_name)()
+        return getattr(controller, method)(self.synced_at[table])
+
+    def _publish_delta(self, table: str, changes: Optional[RowChanges]) -> bool:
+        """Publica os registros alterados e excluídos da tabela desde a última consulta
+
+        Retorna False quando todas as alterações eram desta estação.
+        """
+        with self.lock:
+            local = dict(self.local_changes.get(table, {}))
+            if changes is not None:
+                self.synced_at[table] = changes.until
+                self._forget_local_changes(table, changes.until)
+
+        if changes is None:
+            change_bus.publish(table, None, EXTERNAL)
+            return True
+
+        # Descartar o que esta estação gravou e já publicou
+        deleted_ids = [row_id for row_id in changes.deleted_ids if local.get(row_id, (None,))[0] != DELETE]
+        rows = [
+            row for row in changes.rows
+            if row.get('updated_at') is None or local.get(row['id'], (None,))[0] != row['updated_at']
+        ]
+
+        if len(rows) + len(deleted_ids) > config.CHANGE_RELOAD_THRESHOLD:
+            change_bus.publish(table, None, EXTERNAL)
+            return True
+
+        for row_id in deleted_ids:
+            change_bus.publish(table, row_id, DELETE)
+        for row in rows:
+            change_bus.publish(table, row['id'], UPDATE, row)
+        return bool(rows or deleted_ids)
+
+    def _forget_local_changes(self, table: str, until: str):
+        """Descarta as gravações locais que já não entram nas próximas consultas de alterações"""
+        local = self.local_changes.get(table)
+        if not local:
+            return
+        start = datetime.strptime(until, '%Y-%m-%d %H:%M:%S.%f')
+        start -= timedelta(seconds=config.CHANGE_DELTA_OVERLAP_SECONDS)
+        start = start.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
+        for row_id in [row_id for row_id, (_, recorded_at) in local.items() if recorded_at < start]:
+            del local[row_id]
+
+    def _read_counters(self) -> Dict[str, int]:
+        return dict(self.conn.execute("SELECT table_name, counter FROM change_counters").fetchall())
+
+    def _snapshot(self):
+        self.data_version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+        self.counters = self._read_counters()
+
+    def _on_local_change(self, change):
+        """Registra uma gravação desta estação, para não publicá-la de novo como externa
+
+        A referência (data_version e contadores) não é atualizada aqui: isso
+        esconderia gravações de outras estações feitas desde a última
+        verificação.
+        """
+        if self.publishing or change.operation == EXTERNAL or change.id is None:
+            return
+        if change.entity not in DELTA_SOURCES:
+            return
+        if change.operation == DELETE:
+            updated_at = DELETE
+        else:
+            # Sem o registro publicado não há como comparar: a alteração volta como UPDATE
+            updated_at = change.record.get('updated_at') if change.record else None
+        # Mesmo formato e relógio (UTC) de updated_at e deleted_rows
+        recorded_at = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
+
+        with self.lock:
+            if self.conn is not None:
+                self.local_changes.setdefault(change.entity, {})[change.id] = (updated_at, recorded_at)
+
+
+# Instância global do verificador, iniciada durante a inicialização
+change_watcher = ExternalChangeWatcher()
@@ -0,0 +1,114 @@
+"""
+Totais por período do dashboard, calculados sobre os totais diários.
+
+Os totais de cada dia são mantidos pelo banco (tabela daily_totals, ver
+database/models.py). Aqui eles são carregados em arrays NumPy com uma
+posição por dia, sem lacunas, e as respectivas somas acumuladas: o total de
+qualquer período é a diferença entre duas posições das somas acumuladas, sem
+percorrer os dias do período. Assim os filtros de período do dashboard são
+respondidos de imediato, sem consultar o banco.
+"""
+
+from dataclasses import dataclass
+from datetime import date
+from typing import List, Optional, Tuple
+import numpy as np
+
+# Colunas de daily_totals, na ordem das linhas de DashboardController.get_daily_totals
+METRICS = ('revenue', 'expenses', 'orders')
+
+# Até quantos dias o gráfico de faturamento mostra um valor por dia (acima, um por mês)
+DAILY_SERIES_MAX_DAYS = 62
+
+
+@dataclass
+class PeriodTotals:
+    """Totais de um período, com os mesmos nomes de DashboardSummary"""
+    order_count: int = 0
+    total_revenue: float = 0.0
+    total_expenses: float = 0.0
+
+    @property
+    def profit(self) -> float:
+        return self.total_revenue - self.total_expenses
+
+
+class DailyTotals:
+    """Faturamento, despesas e ordens por dia, com somas acumuladas"""
+
+    def __init__(self, rows: List[Tuple[str, float, float, int]]):
+        """
+        Args:
+            rows: Linhas (dia 'YYYY-MM-DD', faturamento, despesas, ordens)
+        """
+        days = np.array([row[0] for row in rows], dtype='datetime64[D]')
+        if len(days):
+            self.first_day = days.min()
+            self.day_count = int((days.max() - self.first_day).astype(int)) + 1
+        else:
+            self.first_day = np.datetime64(date.today(), 'D')
+            self.day_count = 0
+
+        offsets = (days - self.first_day).astype(int)
+        self.daily = {}
+        self.cumulative = {}
+        for column, metric in enumerate(METRICS, start=1):
+            values = np.zeros(self.day_count)
+            values[offsets] = [row[column] for row in rows]
+            self.daily[metric] = values
+            self.cumulative[metric] = np.concatenate(([0.0], np.cumsum(values)))
+
+    def _positions(self, start: Optional[date], end: Optional[date]) -> Tuple[int, int]:
+        """Posições [início, fim) dos dias do período nos arrays (None = sem limite)"""
+        first = 0 if start is None else int((np.datetime64(start, 'D') - self.first_day).astype(int))
+        last = self.day_count if end is None else int((np.datetime64(end, 'D') - self.first_day).astype(int)) + 1
+        first = min(max(first, 0), self.day_count)
+        last = min(max(last, first), self.day_count)
+        return first, last
+
+    def totals(self, start: Optional[date] = None, end: Optional[date] = None) -> PeriodTotals:
+        """Totais de start a end, inclusive"""
+        first, last = self._positions(start, end)
+
+        def total(metric):
+            return float(self.cumulative[metric][last] - self.cumulative[metric][first])
+
+        return PeriodTotals(
+            order_count=int(round(total('orders'))),
+            total_revenue=total('revenue'),
+            total_expenses=total('expenses'),
+        )
+
+    def series(self, metric: str, start: Optional[date] = None,
+               end: Optional[date] = None) -> Tuple[List[str], List[float], str]:
+        """
+        Valores de uma métrica no período para o gráfico: um por dia em
+        períodos curtos, ou um por mês.
+
+        Returns:
+            (rótulos, valores, unidade 'Dia' ou 'Mês')
+        """
+        first, last = self._positions(start, end)
+        if first == last:
+            return [], [], 'Dia'
+
+        days = self.first_day + np.arange(first, last)
+        values = self.daily[metric][first:last]
+        if last - first <= DAILY_SERIES_MAX_DAYS:
+            labels = [day.strftime('%d/%m') for day in days.astype(date)]
+            return labels, values.tolist(), 'Dia'
+
+        # Somar os dias de cada mês: reduceat nas posições em que o mês muda
+        months = days.astype('datetime64[M]')
+        boundaries = np.flatnonzero(np.concatenate(([True], months[1:] != months[:-1])))
+        sums = np.add.reduceat(values, boundaries)
+        labels = [month.strftime('%m/%Y') for month in months[boundaries].astype(date)]
+        return labels, sums.tolist(), 'Mês'
+
+
+def load_daily_totals(controller) -> DailyTotals:
+    """Consulta os totais diários pelo DashboardController e monta os arrays"""
+    rows = controller.get_daily_totals()
+    if rows is None:
+        raise RuntimeError("não foi possível obter os totais diários")
+    return DailyTotals(rows)
@@ -0,0 +1,108 @@
+"""
+Último resumo do dashboard gravado em disco.
+
+O resumo calculado a cada atualização do dashboard e a série do gráfico de
+faturamento (período completo) são gravados em DASHBOARD_SNAPSHOT_PATH. Na
+abertura do aplicativo eles são exibidos de imediato, enquanto os números
+atuais são recalculados em segundo plano.
+
+O resumo e a série vêm de consultas diferentes, executadas em paralelo; cada
+gravação atualiza a sua parte e mantém a outra como está no arquivo.
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import List, Optional, Tuple
+from controllers.dashboard_controller import DashboardSummary
+import config
+
+logger = logging.getLogger(config.APP_NAME)
+
+SNAPSHOT_FORMAT_VERSION = 2
+
+# (rótulos, valores, unidade), como DailyTotals.series
+RevenueSeries = Tuple[List[str], List[float], str]
+
+_lock = threading.Lock()
+
+
+@dataclass
+class DashboardSnapshot:
+    summary: DashboardSummary
+    saved_at: datetime
+    revenue_series: Optional[RevenueSeries] = None
+
+
+def _read(path: str) -> Optional[dict]:
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        content = json.load(f)
+    if content.get('version') != SNAPSHOT_FORMAT_VERSION:
+        return None
+    return content
+
+
+def _write(path: str, content: dict):
+    fd, temp_path = tempfile.mkstemp(prefix=".dashboard_", suffix=".tmp", dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(content, f, ensure_ascii=False)
+        os.replace(temp_path, path)
+    except Exception:
+        os.unlink(temp_path)
+        raise
+
+
+def save_snapshot(summary: Optional[DashboardSummary] = None, saved_at: Optional[datetime] = None,
+                  path=None, revenue_series: Optional[RevenueSeries] = None) -> bool:
+    """Grava o resumo e/ou a série de faturamento de forma atômica (arquivo temporário + os.replace)"""
+    path = str(path or config.DASHBOARD_SNAPSHOT_PATH)
+
+    try:
+        with _lock:
+            try:
+                content = _read(path) or {}
+            except Exception:
+                content = {}
+            content['version'] = SNAPSHOT_FORMAT_VERSION
+            if summary is not None:
+                content['saved_at'] = (saved_at or datetime.now()).isoformat(timespec='seconds')
+                content['summary'] = asdict(summary)
+            if revenue_series is not None:
+                labels, values, unit = revenue_series
+                content['revenue_series'] = {'labels': list(labels), 'values': list(values), 'unit': unit}
+            _write(path, content)
+        return True
+    except Exception as e:
+        logger.error(f"Erro ao gravar resumo do dashboard: {str(e)}")
+        return False
+
+
+def load_snapshot(path=None) -> Optional[DashboardSnapshot]:
+    """Lê o último resumo gravado, com o instante em que foi calculado (None se não houver)"""
+    path = str(path or config.DASHBOARD_SNAPSHOT_PATH)
+
+    try:
+        with _lock:
+            content = _read(path)
+        if content is None or 'summary' not in content:
+            return None
+
+        revenue_series = None
+        if 'revenue_series' in content:
+            series = content['revenue_series']
+            revenue_series = (series['labels'], series['values'], series['unit'])
+        return DashboardSnapshot(
+            DashboardSummary(**content['summary']),
+            datetime.fromisoformat(content['saved_at']),
+            revenue_series,
+        )
+    except Exception as e:
+        logger.error(f"Erro ao ler resumo do dashboard: {str(e)}")
+        return None
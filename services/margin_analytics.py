@@ -0,0 +1,128 @@
+"""
+Margem bruta por ordem de serviço, peça, funcionário e mês.
+
+As peças de todas as ordens, com preço de venda (order_parts.price) e custo
+(parts.buy_price), são lidas em uma única consulta
+(ServiceOrderController.get_margin_rows) e convertidas em arrays NumPy, uma
+coluna por campo. Os agrupamentos são feitos com somas vetorizadas
+(np.add.reduceat e np.bincount), sem laços por linha, então anos de ordens
+são recalculados em milissegundos. As margens são exibidas na tabela de
+margens do dashboard (ui/tabs/dashboard_tab.py), por mês, peça ou funcionário.
+
+Definições:
+    faturamento    valor total da ordem (service_orders.total_value)
+    peças          soma de quantidade x preço de venda das peças da ordem
+    mão de obra    faturamento - peças (como no PDF da ordem)
+    custo          soma de quantidade x preço de compra das peças
+    margem         faturamento - custo
+
+O custo usa o preço de compra atual da peça, pois o preço de compra na data
+da ordem não é registrado; peças sem preço de compra entram com custo zero.
+"""
+
+from dataclasses import dataclass
+from typing import Iterator, List, Tuple
+import numpy as np
+
+# Chave usada para ordens sem funcionário e linhas de ordens sem peças
+NO_ID = -1
+
+
+@dataclass
+class MarginTable:
+    """Faturamento, peças e custo agrupados por uma chave (arrays alinhados)"""
+    keys: np.ndarray
+    revenue: np.ndarray
+    parts_revenue: np.ndarray
+    cost: np.ndarray
+
+    @property
+    def labor(self) -> np.ndarray:
+        return self.revenue - self.parts_revenue
+
+    @property
+    def margin(self) -> np.ndarray:
+        return self.revenue - self.cost
+
+    @property
+    def margin_percent(self) -> np.ndarray:
+        """Margem sobre o faturamento, em %; 0 quando não há faturamento"""
+        percent = np.zeros(len(self.revenue))
+        np.divide(self.margin, self.revenue, out=percent, where=self.revenue != 0)
+        return percent * 100
+
+    def __len__(self):
+        return len(self.keys)
+
+    def rows(self) -> Iterator[Tuple]:
+        """(chave, faturamento, mão de obra, custo, margem, margem %) de cada grupo"""
+        return zip(self.keys.tolist(), self.revenue.tolist(), self.labor.tolist(), self.cost.tolist(),
+                   self.margin.tolist(), self.margin_percent.tolist())
+
+    def sorted_by_margin(self, descending: bool = True) -> 'MarginTable':
+        order = np.argsort(self.margin, kind='stable')
+        if descending:
+            order = order[::-1]
+        return MarginTable(self.keys[order], self.revenue[order], self.parts_revenue[order], self.cost[order])
+
+
+def group_by(keys: np.ndarray, revenue: np.ndarray, parts_revenue: np.ndarray, cost: np.ndarray) -> MarginTable:
+    """Soma os valores de cada chave"""
+    unique, inverse = np.unique(keys, return_inverse=True)
+
+    def total(values):
+        return np.bincount(inverse, weights=values, minlength=len(unique))
+
+    return MarginTable(unique, total(revenue), total(parts_revenue), total(cost))
+
+
+class MarginAnalytics:
+    """Margens calculadas a partir das linhas de get_margin_rows"""
+
+    def __init__(self, rows: List[tuple]):
+        columns = list(zip(*rows)) if rows else [()] * 8
+        order_ids = np.array(columns[0], dtype=np.int64)
+        total_values = np.array(columns[1], dtype=float)
+        employee_ids = np.array(columns[2], dtype=np.int64)
+        months = np.array(columns[3], dtype='U7')
+        self.part_ids = np.array(columns[4], dtype=np.int64)
+        quantities = np.array(columns[5], dtype=float)
+        self.part_revenue = quantities * np.array(columns[6], dtype=float)
+        self.part_cost = quantities * np.array(columns[7], dtype=float)
+
+        # As linhas vêm em ordem de ordem: cada ordem começa onde o ID muda
+        if len(order_ids):
+            starts = np.flatnonzero(np.concatenate(([True], order_ids[1:] != order_ids[:-1])))
+            parts_revenue = np.add.reduceat(self.part_revenue, starts)
+            cost = np.add.reduceat(self.part_cost, starts)
+        else:
+            starts = np.zeros(0, dtype=np.int64)
+            parts_revenue = cost = np.zeros(0)
+        self.orders = MarginTable(order_ids[starts], total_values[starts], parts_revenue, cost)
+        self.order_employees = employee_ids[starts]
+        self.order_months = months[starts]
+
+    def by_order(self) -> MarginTable:
+        """Margem de cada ordem (chave: ID da ordem)"""
+        return self.orders
+
+    def by_part(self) -> MarginTable:
+        """Margem de cada peça vendida (chave: ID da peça)"""
+        sold = self.part_ids != NO_ID
+        return group_by(self.part_ids[sold], self.part_revenue[sold], self.part_revenue[sold], self.part_cost[sold])
+
+    def by_employee(self) -> MarginTable:
+        """Margem das ordens de cada funcionário (chave: ID do funcionário, NO_ID sem funcionário)"""
+        return group_by(self.order_employees, self.orders.revenue, self.orders.parts_revenue, self.orders.cost)
+
+    def by_month(self) -> MarginTable:
+        """Margem das ordens de cada mês (chave: 'YYYY-MM', pela data de abertura)"""
+        return group_by(self.order_months, self.orders.revenue, self.orders.parts_revenue, self.orders.cost)
+
+
+def load_margin_analytics(controller) -> MarginAnalytics:
+    """Consulta as peças das ordens pelo ServiceOrderController e monta os arrays"""
+    rows = controller.get_margin_rows()
+    if rows is None:
+        raise RuntimeError("não foi possível obter os custos das ordens")
+    return MarginAnalytics(rows)
@@ -9,22 +9,30 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
-from PIL import Image as PILImage
 import config
 
 logger = logging.getLogger(config.APP_NAME)
 
-# Registrar fontes
-try:
-    # Tentar registrar fontes padrão
-    pdfmetrics.registerFont(TTFont('Roboto', os.path.join(config.RESOURCES_DIR, 'fonts', 'Roboto-Regular.ttf')))
-    pdfmetrics.registerFont(TTFont('Roboto-Bold', os.path.join(config.RESOURCES_DIR, 'fonts', 'Roboto-Bold.ttf')))
-except Exception as e:
-    logger.warning(f"Não foi possível registrar fontes personalizadas: {str(e)}")
-    logger.warning("Usando fontes padrão do ReportLab")
+_fonts_registered = False
+
+def register_fonts():
+    """Registra as fontes personalizadas (uma única vez, na primeira geração de PDF)"""
+    global _fonts_registered
+    if _fonts_registered:
+        return
+    _fonts_registered = True
+    
+    try:
+        # Tentar registrar fontes padrão
+        pdfmetrics.registerFont(TTFont('Roboto', os.path.join(config.RESOURCES_DIR, 'fonts', 'Roboto-Regular.ttf')))
+        pdfmetrics.registerFont(TTFont('Roboto-Bold', os.path.join(config.RESOURCES_DIR, 'fonts', 'Roboto-Bold.ttf')))
+    except Exception as e:
+        logger.warning(f"Não foi possível registrar fontes personalizadas: {str(e)}")
+        logger.warning("Usando fontes padrão do ReportLab")
 
 def generate_service_order_pdf(order, output_path):
     """Gera um PDF para uma ordem de serviço"""
+    register_fonts()
     try:
         # Configurar documento
         doc = SimpleDocTemplate(
@@ -220,6 +228,7 @@ def generate_service_order_pdf(order, output_path):
                 img_temp.close()
                 
                 # Redimensionar imagem
+                from PIL import Image as PILImage
                 img = PILImage.open(img_temp.name)
                 img = img.resize((200, 100), PILImage.LANCZOS)
                 img_resized = tempfile.NamedTemporaryFile(delete=False, suffix='.png')
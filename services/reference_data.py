@@ -0,0 +1,73 @@
+import logging
+import threading
+from typing import List, Dict, Any
+from services.change_bus import change_bus
+import config
+
+logger = logging.getLogger(config.APP_NAME)
+
+class ReferenceDataService:
+    """Cache das listas de referência usadas nos formulários (veículos, funcionários e peças)
+
+    As listas podem ser pré-carregadas durante a inicialização e são
+    invalidadas pelas notificações do barramento de alterações sempre que
+    os registros mudam.
+    """
+
+    KINDS = ('vehicles', 'employees', 'parts')
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.cache = {kind: None for kind in self.KINDS}
+        change_bus.subscribe(self._on_change, self.KINDS + ('clients',))
+
+    def _on_change(self, change):
+        # A lista de veículos traz o nome do cliente
+        self.invalidate('vehicles' if change.entity == 'clients' else change.entity)
+
+    def _load(self, kind: str) -> List[Dict[str, Any]]:
+        # Importação local: os controladores também importam este módulo
+        if kind == 'vehicles':
+            from controllers.vehicle_controller import VehicleController
+            return VehicleController().get_all_vehicles()
+        if kind == 'employees':
+            from controllers.employee_controller import EmployeeController
+            return EmployeeController().get_all_employees()
+        from controllers.part_controller import PartController
+        return PartController().get_all_parts()
+
+    def get(self, kind: str) -> List[Dict[str, Any]]:
+        """Retorna a lista do tipo informado, consultando o banco se não estiver em cache"""
+        with self.lock:
+            cached = self.cache[kind]
+        if cached is not None:
+            return cached
+
+        data = self._load(kind)
+        with self.lock:
+            self.cache[kind] = data
+        return data
+
+    def get_vehicles(self) -> List[Dict[str, Any]]:
+        return self.get('vehicles')
+
+    def get_employees(self) -> List[Dict[str, Any]]:
+        return self.get('employees')
+
+    def get_parts(self) -> List[Dict[str, Any]]:
+        return self.get('parts')
+
+    def prefetch(self):
+        """Carrega todas as listas de referência"""
+        for kind in self.KINDS:
+            self.get(kind)
+        logger.info("Dados de referência carregados")
+
+    def invalidate(self, kind: str = None):
+        """Descarta a lista do tipo informado (ou todas) para recarregar no próximo uso"""
+        with self.lock:
+            for name in ([kind] if kind else self.KINDS):
+                self.cache[name] = None
+
+# Instância global do serviço
+reference_data = ReferenceDataService()
@@ -0,0 +1,263 @@
+"""
+Relatórios em PDF de clientes, veículos e ordens de serviço (menu Relatórios).
+
+As linhas são lidas do banco em páginas de config.REPORT_PAGE_SIZE pelos
+métodos get_*_page dos controladores (paginação por chave, ver fetch_page) e
+cada página vira uma tabela do reportlab. O documento recebe as tabelas por
+um FlowableStream, que só lê a página seguinte depois que o reportlab
+desenhou a anterior: em memória ficam apenas uma página de linhas e a sua
+tabela, não o relatório inteiro. As páginas do PDF já desenhadas são mantidas
+comprimidas pelo reportlab até a gravação do arquivo.
+
+generate_report roda em segundo plano (ver run_in_background): informa o
+andamento por `progress(linhas, total)` e para quando `is_cancelled()` fica
+verdadeiro. O PDF é gravado em um arquivo temporário e só substitui o destino
+ao final, então um relatório cancelado ou com erro não deixa arquivo parcial.
+"""
+
+import logging
+import os
+import tempfile
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+from controllers.client_controller import ClientController
+from controllers.service_order_controller import ServiceOrderController
+from controllers.vehicle_controller import VehicleController
+from database.db_manager import count_rows
+import config
+
+logger = logging.getLogger(config.APP_NAME)
+
+# Fonte das tabelas; o texto das células é cortado para caber na coluna
+FONT_NAME = 'Helvetica'
+FONT_SIZE = 8
+CHAR_WIDTH = FONT_SIZE * 0.5
+MARGIN = 36
+
+
+def text(value: Any) -> str:
+    return '' if value is None else str(value)
+
+
+def money(value: Any) -> str:
+    return f"R$ {value or 0:.2f}"
+
+
+def date_br(value: Any) -> str:
+    """'AAAA-MM-DD[ HH:MM:SS]' -> 'DD/MM/AAAA'"""
+    if not value:
+        return ''
+    day = str(value).split()[0]
+    try:
+        return datetime.strptime(day, '%Y-%m-%d').strftime('%d/%m/%Y')
+    except ValueError:
+        return day
+
+
+@dataclass(frozen=True)
+class ReportColumn:
+    header: str
+    field: str
+    width: float                                # em pontos
+    format: Callable[[Any], str] = text
+    align: str = 'LEFT'
+
+
+@dataclass(frozen=True)
+class ReportDefinition:
+    title: str
+    file_name: str                              # nome sugerido do arquivo, sem data e extensão
+    table: str                                  # tabela contada para o progresso
+    controller: type
+    page_method: str                            # método get_*_page(limit, after) do controlador
+    columns: List[ReportColumn]
+
+
+REPORTS: Dict[str, ReportDefinition] = {
+    'clients': ReportDefinition(
+        "Relatório de Clientes", "Relatorio_Clientes", 'clients', ClientController, 'get_clients_page', [
+            ReportColumn("Nome", 'name', 180),
+            ReportColumn("Documento", 'document', 100),
+            ReportColumn("Telefone", 'phone', 90),
+            ReportColumn("E-mail", 'email', 160),
+            ReportColumn("Endereço", 'address', 240),
+        ]),
+    'vehicles': ReportDefinition(
+        "Relatório de Veículos", "Relatorio_Veiculos", 'vehicles', VehicleController, 'get_vehicles_page', [
+            ReportColumn("Placa", 'plate', 70),
+            ReportColumn("Marca", 'brand', 120),
+            ReportColumn("Modelo", 'model', 170),
+            ReportColumn("Ano", 'year', 50, align='CENTER'),
+            ReportColumn("Cor", 'color', 90),
+            ReportColumn("Cliente", 'client_name', 270),
+        ]),
+    'orders': ReportDefinition(
+        "Relatório de Ordens de Serviço", "Relatorio_Ordens_de_Servico", 'service_orders',
+        ServiceOrderController, 'get_orders_page', [
+            ReportColumn("Número", 'number', 90),
+            ReportColumn("Abertura", 'open_date', 65, date_br, 'CENTER'),
+            ReportColumn("Conclusão", 'completion_date', 65, date_br, 'CENTER'),
+            ReportColumn("Placa", 'vehicle_plate', 65),
+            ReportColumn("Cliente", 'client_name', 175),
+            ReportColumn("Funcionário", 'employee_name', 130),
+            ReportColumn("Status", 'status', 85),
+            ReportColumn("Valor", 'total_value', 95, money, 'RIGHT'),
+        ]),
+}
+
+
+class ReportCancelled(Exception):
+    """Interrompe a montagem do documento quando o relatório é cancelado"""
+
+
+class FlowableStream(list):
+    """Lista de flowables preenchida aos poucos a partir de um gerador de blocos
+
+    O reportlab consome a lista do documento pelo início (len, [0] e
+    del [0]); quando ela esvazia, o próximo bloco é lido do gerador. Assim só
+    o bloco em desenho existe em memória.
+    """
+
+    def __init__(self, chunks: Iterator[List[Any]]):
+        super().__init__()
+        self._chunks = chunks
+
+    def _fill(self):
+        while not list.__len__(self):
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return
+            self.extend(chunk)
+
+    def __len__(self):
+        self._fill()
+        return list.__len__(self)
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def __getitem__(self, index):
+        self._fill()
+        return list.__getitem__(self, index)
+
+
+def iter_pages(report: ReportDefinition, page_size: int) -> Iterator[List[Dict[str, Any]]]:
+    """Páginas de linhas do relatório, na ordem da listagem do controlador"""
+    fetch_page = getattr(report.controller(), report.page_method)
+    after = None
+    while True:
+        rows = fetch_page(page_size, after)
+        if not rows:
+            return
+        yield rows
+        if len(rows) < page_size:
+            return
+        after = rows[-1]
+
+
+def build_table(report: ReportDefinition, rows: List[Dict[str, Any]]) -> Table:
+    """Tabela de uma página de linhas, com o cabeçalho repetido a cada página do PDF"""
+    data = [[column.header for column in report.columns]]
+    limits = [int(column.width / CHAR_WIDTH) for column in report.columns]
+    for row in rows:
+        cells = []
+        for column, limit in zip(report.columns, limits):
+            value = column.format(row.get(column.field))
+            cells.append(value if len(value) <= limit else value[:limit - 1] + '…')
+        data.append(cells)
+
+    style = [
+        ('FONTNAME', (0, 0), (-1, -1), FONT_NAME),
+        ('FONTSIZE', (0, 0), (-1, -1), FONT_SIZE),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.whitesmoke]),
+        ('LINEBELOW', (0, 0), (-1, 0), 0.5, colors.grey),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('TOPPADDING', (0, 0), (-1, -1), 2),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 2),
+    ]
+    for index, column in enumerate(report.columns):
+        if column.align != 'LEFT':
+            style.append(('ALIGN', (index, 0), (index, -1), column.align))
+
+    table = Table(data, colWidths=[column.width for column in report.columns], repeatRows=1)
+    table.setStyle(TableStyle(style))
+    return table
+
+
+def generate_report(name: str, output_path: str, progress: Optional[Callable[[int, int], None]] = None,
+                    is_cancelled: Optional[Callable[[], bool]] = None) -> Optional[int]:
+    """Gera o relatório `name` (chave de REPORTS) em `output_path`
+
+    Retorna o número de linhas do relatório, ou None se foi cancelado. Erros
+    de gravação são propagados para o chamador.
+    """
+    report = REPORTS[name]
+    page_size = config.REPORT_PAGE_SIZE
+    total = count_rows(report.table)
+    generated_at = datetime.now().strftime('%d/%m/%Y %H:%M')
+    styles = getSampleStyleSheet()
+    written = 0
+
+    def chunks():
+        nonlocal written
+        yield [
+            Paragraph(report.title, styles['Title']),
+            Paragraph(f"Gerado em {generated_at} - {total} registro(s)", styles['Normal']),
+            Spacer(1, 12),
+        ]
+        if progress:
+            progress(written, total)
+        for rows in iter_pages(report, page_size):
+            if is_cancelled and is_cancelled():
+                raise ReportCancelled()
+            yield [build_table(report, rows)]
+
+            # O gerador só é retomado depois que a tabela anterior foi desenhada
+            written += len(rows)
+            if progress:
+                progress(written, max(total, written))
+        if written == 0:
+            yield [Paragraph("Nenhum registro encontrado.", styles['Normal'])]
+
+    def draw_footer(canvas, doc):
+        canvas.saveState()
+        canvas.setFont(FONT_NAME, FONT_SIZE)
+        canvas.drawString(MARGIN, MARGIN / 2, f"{report.title} - {generated_at}")
+        canvas.drawRightString(doc.pagesize[0] - MARGIN, MARGIN / 2, f"Página {doc.page}")
+        canvas.restoreState()
+
+    # Arquivo temporário na pasta de destino, para que os.replace não copie entre discos
+    directory = os.path.dirname(os.path.abspath(output_path))
+    fd, temp_path = tempfile.mkstemp(suffix='.pdf', dir=directory)
+    os.close(fd)
+
+    try:
+        doc = SimpleDocTemplate(
+            temp_path,
+            pagesize=landscape(A4),
+            rightMargin=MARGIN,
+            leftMargin=MARGIN,
+            topMargin=MARGIN,
+            bottomMargin=MARGIN,
+            title=report.title,
+        )
+        doc.build(FlowableStream(chunks()), onFirstPage=draw_footer, onLaterPages=draw_footer)
+        os.replace(temp_path, output_path)
+    except ReportCancelled:
+        os.unlink(temp_path)
+        logger.info(f"{report.title} cancelado")
+        return None
+    except Exception:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
+    logger.info(f"{report.title} gerado com sucesso: {output_path}")
+    return written
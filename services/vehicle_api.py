@@ -1,4 +1,3 @@
-import requests
 import json
 import logging
 from typing import List, Dict, Any, Optional
@@ -16,13 +15,18 @@ class VehicleAPIService:
             'models': {}
         }
     
+    def _get(self, url: str):
+        """Faz uma requisição GET (o requests só é importado no primeiro uso)"""
+        import requests
+        return requests.get(url)
+    
     def get_brands(self) -> List[Dict[str, Any]]:
         """Obtém a lista de marcas de veículos"""
         if self.cache['brands']:
             return self.cache['brands']
         
         try:
-            response = requests.get(f"{self.base_url}/carros/marcas")
+            response = self._get(f"{self.base_url}/carros/marcas")
             response.raise_for_status()
             brands = response.json()
             self.cache['brands'] = brands
@@ -37,7 +41,7 @@ class VehicleAPIService:
             return self.cache['models'][brand_code]
         
         try:
-            response = requests.get(f"{self.base_url}/carros/marcas/{brand_code}/modelos")
+            response = self._get(f"{self.base_url}/carros/marcas/{brand_code}/modelos")
             response.raise_for_status()
             data = response.json()
             models = data.get('modelos', [])
@@ -50,7 +54,7 @@ class VehicleAPIService:
     def get_years_by_model(self, brand_code: str, model_code: str) -> List[Dict[str, Any]]:
         """Obtém os anos disponíveis para um modelo específico"""
         try:
-            response = requests.get(f"{self.base_url}/carros/marcas/{brand_code}/modelos/{model_code}/anos")
+            response = self._get(f"{self.base_url}/carros/marcas/{brand_code}/modelos/{model_code}/anos")
             response.raise_for_status()
             return response.json()
         except Exception as e:
@@ -60,7 +64,7 @@ class VehicleAPIService:
     def get_vehicle_details(self, brand_code: str, model_code: str, year_code: str) -> Optional[Dict[str, Any]]:
         """Obtém detalhes de um veículo específico"""
         try:
-            response = requests.get(
+            response = self._get(
                 f"{self.base_url}/carros/marcas/{brand_code}/modelos/{model_code}/anos/{year_code}"
             )
             response.raise_for_status()
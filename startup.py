@@ -0,0 +1,139 @@
+"""
+Pipeline de inicialização do aplicativo.
+
+A inicialização é dividida em etapas agrupadas em fases. As etapas de uma
+mesma fase são independentes e rodam em paralelo; as fases rodam em ordem.
+Etapas que criam widgets rodam na thread principal. O progresso real é
+informado a cada etapa concluída, para ser exibido no splash.
+"""
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+import config
+from database.db_manager import get_connection
+from database.models import setup_database
+from services.reference_data import reference_data
+from services.change_watcher import change_watcher
+from startup_trace import tracer
+
+logger = logging.getLogger(config.APP_NAME)
+
+
+@dataclass
+class Stage:
+    """Etapa da inicialização"""
+    name: str
+    message: str
+    fn: Callable[[], Any]
+    main_thread: bool = False  # Etapas que criam widgets precisam da thread principal
+    required: bool = True      # Falha em etapa obrigatória interrompe a inicialização
+
+
+def check_schema():
+    """Cria ou atualiza as tabelas do banco de dados"""
+    conn = setup_database(config.DB_PATH)
+    conn.close()
+
+
+def warm_up_connection():
+    """Abre uma conexão e carrega o esquema, deixando o arquivo do banco em cache"""
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute("SELECT name FROM sqlite_master")
+    cursor.fetchall()
+    conn.close()
+
+
+def build_main_window():
+    """Cria a janela principal"""
+    from ui.main_window import MainWindow
+    return MainWindow()
+
+
+STARTUP_STAGES = [
+    [Stage('schema', "Verificando banco de dados...", check_schema)],
+    [
+        Stage('connection', "Preparando conexão com o banco...", warm_up_connection, required=False),
+        Stage('reference_data', "Carregando dados de referência...", reference_data.prefetch, required=False),
+        Stage('change_watcher', "Preparando sincronização entre estações...", change_watcher.start, required=False),
+    ],
+    [Stage('window', "Carregando interface...", build_main_window, main_thread=True)],
+]
+
+
+class StartupPipeline:
+    """Executa as fases de inicialização informando o progresso
+
+    Args:
+        progress: Função chamada com (mensagem, etapas concluídas, total de etapas)
+        pump: Função chamada periodicamente enquanto a thread principal espera
+              etapas em paralelo (ex.: QApplication.processEvents)
+    """
+
+    def __init__(self, progress: Optional[Callable[[str, int, int], None]] = None,
+                 pump: Optional[Callable[[], None]] = None):
+        self.progress = progress
+        self.pump = pump
+        self.completed = 0
+        self.total = 0
+
+    def run(self, phases: List[List[Stage]] = None) -> Dict[str, Any]:
+        """Executa as fases em ordem e retorna os resultados das etapas por nome"""
+        phases = phases if phases is not None else STARTUP_STAGES
+        self.completed = 0
+        self.total = sum(len(phase) for phase in phases)
+        results = {}
+        started = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=config.STARTUP_WORKERS) as executor:
+            for phase in phases:
+                futures = {
+                    executor.submit(self._timed, stage): stage
+                    for stage in phase if not stage.main_thread
+                }
+
+                for stage in phase:
+                    if stage.main_thread:
+                        self._report(stage.message)
+                        self._finish(stage, results, lambda: self._timed(stage))
+
+                pending = set(futures)
+                if pending:
+                    self._report(futures[next(iter(pending))].message)
+                while pending:
+                    finished, pending = wait(pending, timeout=0.05, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        self._finish(futures[future], results, future.result)
+                    if finished and pending:
+                        self._report(futures[next(iter(pending))].message)
+                    if self.pump:
+                        self.pump()
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        logger.info(f"Inicialização concluída em {elapsed_ms:.1f} ms")
+        return results
+
+    def _timed(self, stage: Stage):
+        started = time.perf_counter()
+        with tracer.span(stage.name, category="stage"):
+            result = stage.fn()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        logger.info(f"Etapa de inicialização '{stage.name}' concluída em {elapsed_ms:.1f} ms")
+        return result
+
+    def _finish(self, stage: Stage, results: Dict[str, Any], get_result: Callable[[], Any]):
+        try:
+            results[stage.name] = get_result()
+        except Exception as e:
+            logger.error(f"Erro na etapa de inicialização '{stage.name}': {str(e)}")
+            if stage.required:
+                raise
+            results[stage.name] = None
+        self.completed += 1
+
+    def _report(self, message: str):
+        if self.progress:
+            self.progress(message, self.completed, self.total)
@@ -0,0 +1,143 @@
+"""
+Rastreamento das fases de inicialização.
+
+Registra intervalos (spans), inclusive aninhados e em outras threads, desde
+a importação deste módulo até a janela principal ficar interativa. Ao final
+grava um trace no formato Chrome/Perfetto (LOG_DIR/startup_trace.json) e
+uma linha de resumo no log.
+
+Com a variável de ambiente DESTAK_PROFILE_STARTUP=1, cada fase de primeiro
+nível da thread principal é perfilada com cProfile e as estatísticas da
+fase mais lenta são gravadas em LOG_DIR/startup_profile.prof.
+"""
+
+import io
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+import config
+
+logger = logging.getLogger(config.APP_NAME)
+
+PROFILE_ENV_VAR = "DESTAK_PROFILE_STARTUP"
+
+
+class StartupTracer:
+    """Coleta os intervalos da inicialização"""
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.lock = threading.Lock()
+        self.events: List[Dict[str, Any]] = []
+        self.threads: Dict[int, str] = {}
+        self.depth = threading.local()
+        self.finished = False
+        self.profile_enabled = os.environ.get(PROFILE_ENV_VAR) == "1"
+        self.profiles = {}
+
+    def _us(self, instant: float) -> float:
+        return (instant - self.origin) * 1_000_000
+
+    def record(self, name: str, start: float, end: float, category: str = "startup",
+               depth: int = 0, **args):
+        """Registra um intervalo já medido (instantes de time.perf_counter)"""
+        thread = threading.current_thread()
+        with self.lock:
+            if self.finished:
+                return
+            self.threads.setdefault(thread.ident, thread.name)
+            self.events.append({
+                'name': name,
+                'cat': category,
+                'ph': 'X',
+                'ts': self._us(start),
+                'dur': (end - start) * 1_000_000,
+                'pid': os.getpid(),
+                'tid': thread.ident,
+                'args': dict(args, depth=depth),
+            })
+
+    @contextmanager
+    def span(self, name: str, category: str = "startup", **args):
+        """Mede o bloco como um intervalo; intervalos abertos dentro dele ficam aninhados"""
+        depth = getattr(self.depth, 'value', 0)
+        self.depth.value = depth + 1
+
+        profiler = None
+        if self.profile_enabled and depth == 0 and threading.current_thread() is threading.main_thread():
+            import cProfile
+            profiler = cProfile.Profile()
+            profiler.enable()
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            if profiler is not None:
+                profiler.disable()
+                self.profiles[name] = (end - start, profiler)
+            self.depth.value = depth
+            self.record(name, start, end, category, depth, **args)
+
+    def top_level_spans(self) -> List[Dict[str, Any]]:
+        main_ident = threading.main_thread().ident
+        return [e for e in self.events if e['tid'] == main_ident and e['args']['depth'] == 0]
+
+    def summary(self) -> str:
+        """Linha de resumo: tempo total e duração de cada fase de primeiro nível"""
+        total_ms = (time.perf_counter() - self.origin) * 1000
+        phases = " | ".join(
+            f"{e['name']} {e['dur'] / 1000:.0f} ms"
+            for e in sorted(self.top_level_spans(), key=lambda e: e['ts'])
+        )
+        return f"Inicialização em {total_ms:.0f} ms: {phases}"
+
+    def write_trace(self, path=None) -> Optional[str]:
+        """Grava os intervalos no formato de trace do Chrome/Perfetto"""
+        path = path or os.path.join(config.LOG_DIR, "startup_trace.json")
+        metadata = [
+            {'name': 'thread_name', 'ph': 'M', 'pid': os.getpid(), 'tid': tid, 'args': {'name': name}}
+            for tid, name in self.threads.items()
+        ]
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({'traceEvents': metadata + self.events, 'displayTimeUnit': 'ms'}, f)
+            return path
+        except Exception as e:
+            logger.error(f"Erro ao gravar o trace de inicialização: {str(e)}")
+            return None
+
+    def write_profile(self):
+        """Grava e resume o perfil de CPU da fase mais lenta"""
+        if not self.profiles:
+            return
+
+        import pstats
+        name, (_, profiler) = max(self.profiles.items(), key=lambda item: item[1][0])
+        path = os.path.join(config.LOG_DIR, "startup_profile.prof")
+        profiler.dump_stats(path)
+
+        output = io.StringIO()
+        pstats.Stats(profiler, stream=output).sort_stats('cumulative').print_stats(15)
+        logger.info(f"Perfil da fase mais lenta ({name}) gravado em {path}\n{output.getvalue()}")
+
+    def finish(self):
+        """Encerra o rastreamento, gravando o trace e o resumo (apenas uma vez)"""
+        with self.lock:
+            if self.finished:
+                return
+            self.finished = True
+
+        path = self.write_trace()
+        logger.info(f"{self.summary()} (trace: {path})")
+        if self.profile_enabled:
+            self.write_profile()
+
+
+# Instância global do rastreador, iniciada na importação do módulo
+tracer = StartupTracer()
@@ -0,0 +1,126 @@
+"""
+Compara os backends de gráficos do dashboard (ui/widgets/chart_backend.py).
+
+Cada backend é medido em um processo separado: tempo de importação, memória
+residente (RSS) acrescentada pelo backend com os três gráficos do dashboard
+criados, tempo até a primeira renderização e tempo médio de uma atualização
+com dados novos, incluindo a renderização.
+
+Uso:
+    python tools/bench_chart_backends.py [--updates 100] [painter qtchart matplotlib]
+"""
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+MONTHS = ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun', 'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez']
+STATUSES = ['em andamento', 'concluído', 'entregue']
+CATEGORIES = ['Aluguel', 'Peças', 'Salários', 'Energia', 'Impostos', 'Outros']
+
+
+def current_rss_mb():
+    """Memória residente do processo em MB (None se não for possível medir)"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 2**20
+    except ImportError:
+        pass
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2**20
+    except (OSError, AttributeError, ValueError):
+        return None
+
+
+def measure_backend(name, updates):
+    """Executado no processo filho: mede um backend e retorna os resultados"""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtWidgets import QApplication
+    app = QApplication(sys.argv)
+    from ui.widgets.chart_backend import CHART_BACKENDS
+    import importlib
+
+    rss_before = current_rss_mb()
+    started = time.perf_counter()
+    charts = importlib.import_module(CHART_BACKENDS[name])
+    import_ms = (time.perf_counter() - started) * 1000
+
+    random.seed(0)
+
+    def render(widgets):
+        app.processEvents()
+        for widget in widgets:
+            widget.grab()
+
+    def update(status, revenue, expense):
+        status.update_chart([random.randint(0, 50) for _ in STATUSES], STATUSES, "Status das Ordens")
+        revenue.update_chart([random.uniform(1000, 9000) for _ in MONTHS], MONTHS,
+                             "Faturamento por Mês", "Mês", "Valor (R$)")
+        expense.update_chart([random.uniform(100, 5000) for _ in CATEGORIES], CATEGORIES,
+                             "Despesas por Categoria")
+
+    started = time.perf_counter()
+    widgets = [charts.PieChartWidget(), charts.BarChartWidget(), charts.PieChartWidget()]
+    for widget in widgets:
+        widget.resize(400, 320)
+        widget.show()
+    update(*widgets)
+    render(widgets)
+    first_render_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    for _ in range(updates):
+        update(*widgets)
+        render(widgets)
+    update_ms = (time.perf_counter() - started) * 1000 / updates
+
+    rss_after = current_rss_mb()
+    return {
+        'backend': name,
+        'import_ms': import_ms,
+        'rss_mb': rss_after - rss_before if rss_before is not None and rss_after is not None else None,
+        'first_render_ms': first_render_ms,
+        'update_ms': update_ms,
+    }
+
+
+def main():
+    from ui.widgets.chart_backend import CHART_BACKENDS
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("backends", nargs="*", default=list(CHART_BACKENDS), help="Backends medidos")
+    parser.add_argument("--updates", type=int, default=100, help="Atualizações medidas por backend")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure_backend(args.child, args.updates)))
+        return
+
+    print(f"{'Backend':<11} {'importação':>11} {'RSS':>9} {'1ª renderização':>16} {'atualização':>12}")
+    for name in args.backends:
+        result = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--child', name, '--updates', str(args.updates)],
+            cwd=ROOT, capture_output=True, text=True
+        )
+        if result.returncode != 0:
+            error = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "falha"
+            print(f"{name:<11} indisponível: {error}")
+            continue
+
+        data = json.loads(result.stdout.strip().splitlines()[-1])
+        rss = f"{data['rss_mb']:6.1f} MB" if data['rss_mb'] is not None else f"{'-':>9}"
+        print(f"{name:<11} {data['import_ms']:8.1f} ms {rss} {data['first_render_ms']:13.1f} ms "
+              f"{data['update_ms']:9.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
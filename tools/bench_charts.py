@@ -0,0 +1,119 @@
+"""
+Mede a latência de atualização dos gráficos do dashboard.
+
+Para cada widget de ui/widgets/chart_widget.py, mede o tempo médio de
+`update_chart` com dados novos e com os mesmos dados (que não deve
+redesenhar nada), incluindo a renderização do gráfico. Como referência,
+mede também a atualização recriando série e eixos a cada vez, como era
+feito antes.
+
+Uso:
+    python tools/bench_charts.py [--updates 200]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtChart import QPieSeries, QBarSeries, QBarSet, QBarCategoryAxis, QValueAxis
+
+from ui.widgets.chart_widget import PieChartWidget, BarChartWidget, LineChartWidget
+
+MONTHS = ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun', 'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez']
+CATEGORIES = ['Aluguel', 'Peças', 'Salários', 'Energia', 'Impostos', 'Outros']
+
+
+def rebuild_pie(widget, data, labels, title):
+    """Atualização antiga: nova série a cada chamada"""
+    series = QPieSeries()
+    for label, value in zip(labels, data):
+        series.append(label, value)
+    widget.chart.setTitle(title)
+    widget.chart.removeAllSeries()
+    widget.chart.addSeries(series)
+
+
+def rebuild_bar(widget, data, categories, title, x_label, y_label):
+    """Atualização antiga: nova série e novos eixos a cada chamada"""
+    series = QBarSeries()
+    bar_set = QBarSet("Valor")
+    bar_set.append(data)
+    series.append(bar_set)
+    widget.chart.setTitle(title)
+    widget.chart.removeAllSeries()
+    widget.chart.addSeries(series)
+    for axis in widget.chart.axes():
+        widget.chart.removeAxis(axis)
+    axis_x = QBarCategoryAxis()
+    axis_x.append(categories)
+    widget.chart.setAxisX(axis_x, series)
+    axis_y = QValueAxis()
+    widget.chart.setAxisY(axis_y, series)
+
+
+def measure(app, widget, update, datasets):
+    """Tempo médio (ms) de uma atualização seguida da renderização do gráfico"""
+    started = time.perf_counter()
+    for data in datasets:
+        update(data)
+        app.processEvents()
+        widget.chart_view.grab()
+    return (time.perf_counter() - started) * 1000 / len(datasets)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--updates", type=int, default=200, help="Atualizações medidas por cenário")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    random.seed(0)
+
+    def series(size):
+        return [[random.uniform(100, 5000) for _ in range(size)] for _ in range(args.updates)]
+
+    scenarios = [
+        ("Pizza", PieChartWidget,
+         lambda w, d: w.update_chart(d, CATEGORIES, "Despesas por Categoria"),
+         lambda w, d: rebuild_pie(w, d, CATEGORIES, "Despesas por Categoria"),
+         len(CATEGORIES)),
+        ("Barras", BarChartWidget,
+         lambda w, d: w.update_chart(d, MONTHS, "Faturamento por Mês", "Mês", "Valor (R$)"),
+         lambda w, d: rebuild_bar(w, d, MONTHS, "Faturamento por Mês", "Mês", "Valor (R$)"),
+         len(MONTHS)),
+        ("Linha", LineChartWidget,
+         lambda w, d: w.update_chart(d, MONTHS, "Faturamento por Mês", "Mês", "Valor (R$)"),
+         None,
+         len(MONTHS)),
+    ]
+
+    print(f"{'Gráfico':<8} {'dados novos':>12} {'mesmos dados':>13} {'recriando':>10}  (ms por atualização)")
+    for name, widget_class, update, rebuild, size in scenarios:
+        widget = widget_class()
+        widget.resize(480, 360)
+        widget.show()
+
+        datasets = series(size)
+        changed_ms = measure(app, widget, lambda d: update(widget, d), datasets)
+        same_ms = measure(app, widget, lambda d: update(widget, datasets[0]), datasets)
+
+        rebuild_ms = None
+        if rebuild is not None:
+            reference = widget_class()
+            reference.resize(480, 360)
+            reference.show()
+            rebuild_ms = measure(app, reference, lambda d: rebuild(reference, d), datasets)
+
+        rebuild_text = f"{rebuild_ms:10.2f}" if rebuild_ms is not None else f"{'-':>10}"
+        print(f"{name:<8} {changed_ms:12.2f} {same_ms:13.2f} {rebuild_text}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Verifica o custo de importação do caminho de inicialização.
+
+Executa `python -X importtime` importando os módulos carregados antes da
+janela principal ficar interativa e falha se o tempo acumulado passar de
+config.IMPORT_TIME_BUDGET_MS ou se algum módulo pesado, que deve ser
+carregado apenas no primeiro uso, aparecer na lista.
+
+Uso:
+    python tools/check_import_budget.py
+"""
+
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import config
+
+# Módulos importados até a primeira aba estar pronta
+STARTUP_MODULES = ['startup', 'ui.main_window', 'ui.tabs.dashboard_tab']
+
+# Módulos que não podem fazer parte do caminho de inicialização
+DEFERRED_MODULES = ['reportlab', 'PIL', 'requests', 'matplotlib', 'numpy', 'PyQt5.QtChart']
+
+
+def measure_imports(modules):
+    """Retorna [(módulo, profundidade, tempo próprio em µs, tempo acumulado em µs)]"""
+    code = "; ".join(f"import {module}" for module in modules)
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Falha ao importar os módulos de inicialização:\n{result.stderr}")
+
+    timings = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        if not self_us.strip().isdigit():
+            continue  # Cabeçalho
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        timings.append((name.strip(), depth, int(self_us), int(cumulative_us)))
+    return timings
+
+
+def main():
+    timings = measure_imports(STARTUP_MODULES)
+    total_ms = sum(cumulative for _, depth, _, cumulative in timings if depth == 0) / 1000
+
+    print(f"Tempo de importação da inicialização: {total_ms:.1f} ms "
+          f"(orçamento: {config.IMPORT_TIME_BUDGET_MS} ms)")
+    print("Módulos mais lentos (tempo acumulado):")
+    for name, _, _, cumulative in sorted(timings, key=lambda t: t[3], reverse=True)[:10]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    failed = False
+    loaded = {name for name, _, _, _ in timings}
+    for heavy in DEFERRED_MODULES:
+        offenders = sorted(n for n in loaded if n == heavy or n.startswith(heavy + '.'))
+        if offenders:
+            print(f"ERRO: {heavy} é importado na inicialização ({offenders[0]})")
+            failed = True
+
+    if total_ms > config.IMPORT_TIME_BUDGET_MS:
+        print("ERRO: orçamento de tempo de importação excedido")
+        failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
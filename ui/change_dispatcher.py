@@ -0,0 +1,82 @@
+"""
+Entrega das notificações de alteração às views.
+
+O ChangeDispatcher assina o barramento de alterações (services/change_bus)
+e traz as notificações para a thread da interface. As alterações recebidas
+dentro de um mesmo quadro (CHANGE_COALESCE_MS) são agrupadas: cada assinante
+recebe uma única chamada com a última alteração de cada registro.
+"""
+
+import logging
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+from services.change_bus import change_bus, Change, INSERT, UPDATE
+import config
+
+logger = logging.getLogger(config.APP_NAME)
+
+
+class ChangeDispatcher(QObject):
+    """Agrupa as alterações publicadas e as entrega às views por quadro"""
+
+    # Emitido pelo barramento, possivelmente de outra thread; a conexão
+    # com _enqueue é enfileirada pelo Qt nesse caso
+    received = pyqtSignal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pending: Dict[Tuple[str, Any], Change] = {}
+        self.subscribers: List[Tuple[Callable[[List[Change]], None], Optional[frozenset]]] = []
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(config.CHANGE_COALESCE_MS)
+        self.timer.timeout.connect(self.flush)
+
+        self.received.connect(self._enqueue)
+        change_bus.subscribe(self.received.emit)
+
+    def subscribe(self, callback: Callable[[List[Change]], None], entities: Optional[Iterable[str]] = None):
+        """Inscreve `callback` para receber listas de alterações das entidades informadas"""
+        self.subscribers.append((callback, frozenset(entities) if entities else None))
+
+    def unsubscribe(self, callback: Callable[[List[Change]], None]):
+        self.subscribers = [(cb, entities) for cb, entities in self.subscribers if cb != callback]
+
+    def flush(self):
+        """Entrega as alterações pendentes aos assinantes"""
+        self.timer.stop()
+        changes = list(self.pending.values())
+        self.pending = {}
+
+        for callback, entities in list(self.subscribers):
+            selected = [change for change in changes if entities is None or change.entity in entities]
+            if not selected:
+                continue
+            try:
+                callback(selected)
+            except Exception as e:
+                logger.error(f"Erro ao aplicar alterações na interface: {str(e)}")
+
+    def _enqueue(self, change: Change):
+        key = (change.entity, change.id)
+        previous = self.pending.pop(key, None)
+
+        # Um registro incluído e alterado no mesmo quadro continua sendo uma inclusão
+        if previous is not None and previous.operation == INSERT and change.operation == UPDATE:
+            change = Change(change.entity, change.id, INSERT, change.record)
+
+        self.pending[key] = change
+        if not self.timer.isActive():
+            self.timer.start()
+
+
+_dispatcher: Optional[ChangeDispatcher] = None
+
+
+def get_change_dispatcher() -> ChangeDispatcher:
+    """Retorna o dispatcher da aplicação, criado no primeiro uso (na thread da interface)"""
+    global _dispatcher
+    if _dispatcher is None:
+        _dispatcher = ChangeDispatcher()
+    return _dispatcher
@@ -9,6 +9,7 @@ class ClientDialog(QDialog):
     def __init__(self, parent=None, client_id=None):
         super().__init__(parent)
         self.client_id = client_id
+        self.saved_client = None  # Registro gravado, usado pela aba para atualizar a linha
         self.client_controller = ClientController()
         self.init_ui()
         
@@ -105,14 +106,14 @@ class ClientDialog(QDialog):
         try:
             if self.client_id:
                 # Atualizar cliente existente
-                success = self.client_controller.update_client(self.client_id, client_data)
+                self.saved_client = self.client_controller.update_client(self.client_id, client_data)
                 message = "Cliente atualizado com sucesso!"
             else:
                 # Adicionar novo cliente
-                success = self.client_controller.add_client(client_data)
+                self.saved_client = self.client_controller.add_client(client_data)
                 message = "Cliente adicionado com sucesso!"
                 
-            if success:
+            if self.saved_client:
                 QMessageBox.information(self, "Sucesso", message)
                 self.accept()  # Fecha o diálogo com status de aceitação
             else:
@@ -14,6 +14,7 @@ class EmployeeDialog(QDialog):
     def __init__(self, parent=None, employee=None):
         super().__init__(parent)
         self.employee = employee
+        self.saved_employee = None  # Registro gravado, usado pela aba para atualizar a linha
         self.employee_controller = EmployeeController()
         
         self.setWindowTitle("Adicionar Funcionário" if not employee else "Editar Funcionário")
@@ -97,15 +98,14 @@ class EmployeeDialog(QDialog):
             
             if self.employee:
                 # Atualizar funcionário existente
-                success = self.employee_controller.update_employee(self.employee['id'], employee_data)
+                self.saved_employee = self.employee_controller.update_employee(self.employee['id'], employee_data)
                 message = "Funcionário atualizado com sucesso!"
             else:
                 # Inserir novo funcionário
-                employee_id = self.employee_controller.add_employee(employee_data)
-                success = employee_id is not None
+                self.saved_employee = self.employee_controller.add_employee(employee_data)
                 message = "Funcionário adicionado com sucesso!"
             
-            if success:
+            if self.saved_employee:
                 QMessageBox.information(self, "Sucesso", message)
                 self.accept()
             else:
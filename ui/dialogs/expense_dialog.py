@@ -14,6 +14,7 @@ class ExpenseDialog(QDialog):
     def __init__(self, parent=None, expense=None):
         super().__init__(parent)
         self.expense = expense
+        self.saved_expense = None  # Registro gravado, usado pela aba para atualizar a linha
         self.expense_controller = ExpenseController()
         
         self.setWindowTitle("Adicionar Gasto" if not expense else "Editar Gasto")
@@ -118,15 +119,14 @@ class ExpenseDialog(QDialog):
             
             if self.expense:
                 # Atualizar gasto existente
-                success = self.expense_controller.update_expense(self.expense['id'], expense_data)
+                self.saved_expense = self.expense_controller.update_expense(self.expense['id'], expense_data)
                 message = "Gasto atualizado com sucesso!"
             else:
                 # Inserir novo gasto
-                expense_id = self.expense_controller.add_expense(expense_data)
-                success = expense_id is not None
+                self.saved_expense = self.expense_controller.add_expense(expense_data)
                 message = "Gasto adicionado com sucesso!"
             
-            if success:
+            if self.saved_expense:
                 QMessageBox.information(self, "Sucesso", message)
                 self.accept()
             else:
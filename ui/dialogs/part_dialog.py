@@ -14,6 +14,7 @@ class PartDialog(QDialog):
     def __init__(self, parent=None, part=None):
         super().__init__(parent)
         self.part = part
+        self.saved_part = None  # Registro gravado, usado pela aba para atualizar a linha
         self.part_controller = PartController()
         
         self.setWindowTitle("Adicionar Peça" if not part else "Editar Peça")
@@ -106,15 +107,14 @@ class PartDialog(QDialog):
             
             if self.part:
                 # Atualizar peça existente
-                success = self.part_controller.update_part(self.part['id'], part_data)
+                self.saved_part = self.part_controller.update_part(self.part['id'], part_data)
                 message = "Peça atualizada com sucesso!"
             else:
                 # Inserir nova peça
-                part_id = self.part_controller.add_part(part_data)
-                success = part_id is not None
+                self.saved_part = self.part_controller.add_part(part_data)
                 message = "Peça adicionada com sucesso!"
             
-            if success:
+            if self.saved_part:
                 QMessageBox.information(self, "Sucesso", message)
                 self.accept()
             else:
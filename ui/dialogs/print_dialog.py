@@ -6,7 +6,6 @@ from PyQt5.QtPrintSupport import QPrinter, QPrintDialog, QPrintPreviewDialog
 import logging
 import os
 import tempfile
-from services.pdf_generator import generate_service_order_pdf
 from controllers.service_order_controller import ServiceOrderController
 from ui.widgets.signature_widget import SignatureWidget
 import config
@@ -177,21 +176,36 @@ class PrintDialog(QDialog):
         try:
             order_data = {}
             
-            if self.client_signature.has_signature():
+            # Enviar apenas as assinaturas alteradas; as demais não são regravadas
+            if self.client_signature.is_modified() and self.client_signature.has_signature():
                 order_data['client_signature'] = self.client_signature.get_signature_base64()
             
-            if self.mechanic_signature.has_signature():
+            if self.mechanic_signature.is_modified() and self.mechanic_signature.has_signature():
                 order_data['mechanic_signature'] = self.mechanic_signature.get_signature_base64()
             
             if order_data:
-                success = self.service_order_controller.update_order(self.order['id'], order_data)
+                order_data['version'] = self.order.get('version')
+                result = self.service_order_controller.update_order(self.order['id'], order_data)
                 
-                if success:
+                if result:
+                    self.order.update(order_data)
+                    self.order['version'] = result.version
+                    
+                    if 'client_signature' in order_data:
+                        self.client_signature.mark_saved(order_data['client_signature'])
+                    if 'mechanic_signature' in order_data:
+                        self.mechanic_signature.mark_saved(order_data['mechanic_signature'])
                     QMessageBox.information(self, "Sucesso", "Assinaturas salvas com sucesso!")
+                elif result.conflict:
+                    QMessageBox.warning(
+                        self, "Conflito de Edição",
+                        "Esta ordem de serviço foi alterada em outra estação depois que foi aberta.\n"
+                        "Feche esta janela e abra a ordem novamente antes de salvar as assinaturas."
+                    )
                 else:
                     QMessageBox.critical(self, "Erro", "Não foi possível salvar as assinaturas.")
             else:
-                QMessageBox.warning(self, "Aviso", "Nenhuma assinatura para salvar.")
+                QMessageBox.warning(self, "Aviso", "Nenhuma assinatura nova para salvar.")
                 
         except Exception as e:
             logger.error(f"Erro ao salvar assinaturas: {str(e)}")
@@ -210,6 +224,9 @@ class PrintDialog(QDialog):
             if self.mechanic_signature.has_signature():
                 self.order['mechanic_signature'] = self.mechanic_signature.get_signature_base64()
             
+            # O gerador (reportlab) só é carregado quando um PDF é gerado
+            from services.pdf_generator import generate_service_order_pdf
+            
             # Gerar PDF em arquivo temporário
             fd, path = tempfile.mkstemp(suffix='.pdf')
             os.close(fd)
@@ -6,9 +6,7 @@ from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QFormLayout,
 from PyQt5.QtCore import Qt, QDate
 import logging
 from controllers.service_order_controller import ServiceOrderController
-from controllers.vehicle_controller import VehicleController
-from controllers.employee_controller import EmployeeController
-from controllers.part_controller import PartController
+from services.reference_data import reference_data
 from ui.widgets.signature_widget import SignatureWidget
 import config
 
@@ -20,10 +18,8 @@ class ServiceOrderDialog(QDialog):
     def __init__(self, parent=None, order=None):
         super().__init__(parent)
         self.order = order
+        self.saved_order = None  # Linha gravada (formato da listagem), usada pela aba para atualizar a tabela
         self.service_order_controller = ServiceOrderController()
-        self.vehicle_controller = VehicleController()
-        self.employee_controller = EmployeeController()
-        self.part_controller = PartController()
         
         self.vehicles = []
         self.employees = []
@@ -54,9 +50,10 @@ class ServiceOrderDialog(QDialog):
         # Formulário básico
         form_layout = QFormLayout()
         
-        # Número da OS
+        # Número da OS (gerado pela sequência ao salvar)
         self.number_edit = QLineEdit()
-        self.number_edit.setPlaceholderText("OS-001")
+        self.number_edit.setPlaceholderText("Gerado automaticamente ao salvar")
+        self.number_edit.setReadOnly(True)
         form_layout.addRow("Número:", self.number_edit)
         
         # Data de abertura
@@ -187,19 +184,19 @@ class ServiceOrderDialog(QDialog):
     def load_data(self):
         """Carrega os dados necessários para o diálogo"""
         # Carregar veículos
-        self.vehicles = self.vehicle_controller.get_all_vehicles()
+        self.vehicles = reference_data.get_vehicles()
         self.vehicle_combo.clear()
         for vehicle in self.vehicles:
             self.vehicle_combo.addItem(f"{vehicle['plate']} - {vehicle['brand']} {vehicle['model']}", vehicle['id'])
         
         # Carregar funcionários
-        self.employees = self.employee_controller.get_all_employees()
+        self.employees = reference_data.get_employees()
         self.employee_combo.clear()
         for employee in self.employees:
             self.employee_combo.addItem(f"{employee['name']} ({employee['role']})", employee['id'])
         
         # Carregar peças
-        self.parts = self.part_controller.get_all_parts()
+        self.parts = reference_data.get_parts()
         self.part_combo.clear()
         for part in self.parts:
             self.part_combo.addItem(f"{part['code']} - {part['description']} (R$ {part['sell_price']:.2f})", part['id'])
@@ -329,7 +326,6 @@ class ServiceOrderDialog(QDialog):
         try:
             # Preparar dados da ordem
             order_data = {
-                'number': self.number_edit.text().strip(),
                 'open_date': self.open_date_edit.date().toString("yyyy-MM-dd"),
                 'vehicle_id': self.vehicle_combo.currentData(),
                 'description': self.description_edit.toPlainText().strip(),
@@ -342,28 +338,41 @@ class ServiceOrderDialog(QDialog):
             # Data de conclusão (apenas se não for "em andamento")
             if order_data['status'] != "em andamento":
                 order_data['completion_date'] = self.completion_date_edit.date().toString("yyyy-MM-dd")
+            else:
+                order_data['completion_date'] = None
             
             # Peças
             order_data['parts'] = self.selected_parts
             
-            # Assinaturas
-            if self.client_signature.has_signature():
+            # Assinaturas (somente as desenhadas nesta edição)
+            if self.client_signature.is_modified() and self.client_signature.has_signature():
                 order_data['client_signature'] = self.client_signature.get_signature_base64()
             
-            if self.mechanic_signature.has_signature():
+            if self.mechanic_signature.is_modified() and self.mechanic_signature.has_signature():
                 order_data['mechanic_signature'] = self.mechanic_signature.get_signature_base64()
             
             if self.order:
-                # Atualizar ordem existente
-                success = self.service_order_controller.update_order(self.order['id'], order_data)
+                # Atualizar ordem existente (somente se ninguém a alterou nesse meio tempo)
+                order_data['number'] = self.order['number']
+                order_data['version'] = self.order.get('version')
+                result = self.service_order_controller.update_order(self.order['id'], order_data)
+                
+                if result.conflict:
+                    QMessageBox.warning(
+                        self, "Conflito de Edição",
+                        "Esta ordem de serviço foi alterada em outra estação depois que foi aberta.\n"
+                        "Feche esta janela e abra a ordem novamente para editar a versão atual."
+                    )
+                    return
+                
+                self.saved_order = result.order if result else None
                 message = "Ordem de serviço atualizada com sucesso!"
             else:
                 # Inserir nova ordem
-                order_id = self.service_order_controller.add_order(order_data)
-                success = order_id is not None
+                self.saved_order = self.service_order_controller.add_order(order_data)
                 message = "Ordem de serviço adicionada com sucesso!"
             
-            if success:
+            if self.saved_order:
                 QMessageBox.information(self, "Sucesso", message)
                 self.accept()
             else:
@@ -375,10 +384,6 @@ class ServiceOrderDialog(QDialog):
     
     def validate_form(self):
         """Valida os campos do formulário"""
-        if not self.number_edit.text().strip():
-            QMessageBox.warning(self, "Validação", "Informe o número da ordem de serviço.")
-            return False
-        
         if self.vehicle_combo.currentIndex() < 0:
             QMessageBox.warning(self, "Validação", "Selecione um veículo.")
             return False
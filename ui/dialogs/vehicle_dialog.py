@@ -5,6 +5,8 @@ from PyQt5.QtCore import Qt, QThread, pyqtSignal, QDate
 import logging
 from services.vehicle_api import vehicle_api
 from database.db_manager import get_connection
+from controllers.vehicle_controller import VehicleController
+from ui.change_dispatcher import get_change_dispatcher
 import config
 
 logger = logging.getLogger(config.APP_NAME)
@@ -34,6 +36,8 @@ class VehicleDialog(QDialog):
     def __init__(self, parent=None, vehicle=None):
         super().__init__(parent)
         self.vehicle = vehicle
+        self.saved_vehicle = None  # Registro gravado, usado pela aba para atualizar a linha
+        self.vehicle_controller = VehicleController()
         self.clients = []
         self.brands = []
         self.models = []
@@ -46,6 +50,11 @@ class VehicleDialog(QDialog):
         self.setup_ui()
         self.load_clients()
         
+        # Clientes cadastrados com o diálogo aberto entram na lista
+        self.changes = get_change_dispatcher()
+        self.changes.subscribe(self.on_client_changes, ('clients',))
+        self.finished.connect(lambda: self.changes.unsubscribe(self.on_client_changes))
+        
         # Iniciar carregamento de marcas
         self.brand_loader = ApiLoaderThread(self)
         self.brand_loader.brands_loaded.connect(self.on_brands_loaded)
@@ -129,13 +138,17 @@ class VehicleDialog(QDialog):
             self.clients = cursor.fetchall()
             conn.close()
             
+            # Manter o cliente escolhido quando a lista é recarregada
+            selected_id = self.client_combo.currentData()
+            if selected_id is None and self.vehicle:
+                selected_id = self.vehicle['client_id']
+            
             self.client_combo.clear()
             for client in self.clients:
                 self.client_combo.addItem(client['name'], client['id'])
             
-            # Se estiver editando, selecionar o cliente correto
-            if self.vehicle:
-                index = self.client_combo.findData(self.vehicle['client_id'])
+            if selected_id is not None:
+                index = self.client_combo.findData(selected_id)
                 if index >= 0:
                     self.client_combo.setCurrentIndex(index)
         
@@ -143,6 +156,10 @@ class VehicleDialog(QDialog):
             logger.error(f"Erro ao carregar clientes: {str(e)}")
             QMessageBox.critical(self, "Erro", f"Não foi possível carregar a lista de clientes: {str(e)}")
     
+    def on_client_changes(self, changes):
+        """Recarrega a lista de clientes após alterações publicadas pelos controladores"""
+        self.load_clients()
+    
     def on_brands_loaded(self, brands):
         """Callback quando as marcas são carregadas"""
         self.brands = brands
@@ -214,41 +231,31 @@ class VehicleDialog(QDialog):
             return
         
         try:
-            conn = get_connection()
-            cursor = conn.cursor()
-            
-            client_id = self.client_combo.currentData()
-            plate = self.plate_edit.text().strip()
-            brand = self.brand_combo.currentText()
-            model = self.model_combo.currentText()
-            year = int(self.year_edit.text())
-            color = self.color_edit.text().strip()
-            brand_code = self.selected_brand_code
-            model_code = self.selected_model_code
+            vehicle_data = {
+                'client_id': self.client_combo.currentData(),
+                'plate': self.plate_edit.text().strip(),
+                'brand': self.brand_combo.currentText(),
+                'model': self.model_combo.currentText(),
+                'year': int(self.year_edit.text()),
+                'color': self.color_edit.text().strip(),
+                'brand_code': self.selected_brand_code,
+                'model_code': self.selected_model_code
+            }
             
             if self.vehicle:
                 # Atualizar veículo existente
-                cursor.execute('''
-                UPDATE vehicles 
-                SET plate = ?, brand = ?, model = ?, year = ?, color = ?, client_id = ?, brand_code = ?, model_code = ?
-                WHERE id = ?
-                ''', (plate, brand, model, year, color, client_id, brand_code, model_code, self.vehicle['id']))
-                
+                self.saved_vehicle = self.vehicle_controller.update_vehicle(self.vehicle['id'], vehicle_data)
                 message = "Veículo atualizado com sucesso!"
             else:
                 # Inserir novo veículo
-                cursor.execute('''
-                INSERT INTO vehicles (plate, brand, model, year, color, client_id, brand_code, model_code)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (plate, brand, model, year, color, client_id, brand_code, model_code))
-                
+                self.saved_vehicle = self.vehicle_controller.add_vehicle(vehicle_data)
                 message = "Veículo adicionado com sucesso!"
             
-            conn.commit()
-            conn.close()
-            
-            QMessageBox.information(self, "Sucesso", message)
-            self.accept()
+            if self.saved_vehicle:
+                QMessageBox.information(self, "Sucesso", message)
+                self.accept()
+            else:
+                QMessageBox.critical(self, "Erro", "Não foi possível salvar o veículo.")
             
         except Exception as e:
             logger.error(f"Erro ao salvar veículo: {str(e)}")
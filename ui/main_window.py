@@ -1,31 +1,59 @@
-from PyQt5.QtWidgets import QMainWindow, QTabWidget, QStatusBar, QLabel, QAction, QToolBar, QMenu
-from PyQt5.QtCore import Qt, QSize
+from PyQt5.QtWidgets import (QMainWindow, QTabWidget, QStatusBar, QLabel, QAction, QToolBar, QMenu,
+                            QWidget, QVBoxLayout)
+from PyQt5.QtCore import Qt, QSize, QTimer
 from PyQt5.QtGui import QIcon
+import importlib
 import logging
+import time
 import config
-from ui.tabs.dashboard_tab import DashboardTab
-from ui.tabs.clients_tab import ClientsTab
-from ui.tabs.vehicles_tab import VehiclesTab
-from ui.tabs.service_orders_tab import ServiceOrdersTab
-from ui.tabs.parts_tab import PartsTab
-from ui.tabs.employees_tab import EmployeesTab
-from ui.tabs.expenses_tab import ExpensesTab
+from startup_trace import tracer
+from services.change_watcher import change_watcher
+from ui.workers import run_in_background
 
 logger = logging.getLogger(config.APP_NAME)
 
+# Abas da janela principal: (atributo, classe, ícone, título). As abas são
+# construídas apenas quando ativadas pela primeira vez, e seus módulos (com
+# os diálogos e dependências) só são importados nesse momento.
+TABS = [
+    ('dashboard_tab', 'ui.tabs.dashboard_tab.DashboardTab', "resources/icons/dashboard.png", "Dashboard"),
+    ('clients_tab', 'ui.tabs.clients_tab.ClientsTab', "resources/icons/clients.png", "Clientes"),
+    ('vehicles_tab', 'ui.tabs.vehicles_tab.VehiclesTab', "resources/icons/vehicles.png", "Veículos"),
+    ('service_orders_tab', 'ui.tabs.service_orders_tab.ServiceOrdersTab', "resources/icons/orders.png", "Ordens de Serviço"),
+    ('parts_tab', 'ui.tabs.parts_tab.PartsTab', "resources/icons/parts.png", "Peças"),
+    ('employees_tab', 'ui.tabs.employees_tab.EmployeesTab', "resources/icons/employees.png", "Funcionários"),
+    ('expenses_tab', 'ui.tabs.expenses_tab.ExpensesTab', "resources/icons/expenses.png", "Gastos"),
+]
+
 class MainWindow(QMainWindow):
     """Janela principal do aplicativo"""
     
     def __init__(self):
         super().__init__()
+        self.started_at = time.perf_counter()
+        self.interactive = False
+        self.interactive_logged = False
+        self.report_worker = None
+        self.changed_tables = set()     # Tabelas alteradas por outra estação, aguardando consulta
+        self.change_worker = None
         
         self.setWindowTitle(f"{config.APP_NAME} v{config.APP_VERSION}")
         self.setMinimumSize(1200, 800)
         
-        self.setup_ui()
-        self.setup_menu()
-        self.setup_toolbar()
-        self.setup_statusbar()
+        with tracer.span("setup_ui"):
+            self.setup_ui()
+        with tracer.span("setup_menu"):
+            self.setup_menu()
+        with tracer.span("setup_toolbar"):
+            self.setup_toolbar()
+        with tracer.span("setup_statusbar"):
+            self.setup_statusbar()
+        
+        # Verificação periódica de alterações feitas por outras estações
+        self.change_timer = QTimer(self)
+        self.change_timer.setInterval(config.EXTERNAL_CHANGE_POLL_MS)
+        self.change_timer.timeout.connect(self.poll_external_changes)
+        self.change_timer.start()
         
         logger.info("Aplicativo iniciado")
     
@@ -37,25 +65,104 @@ class MainWindow(QMainWindow):
         self.tabs.setMovable(True)
         self.tabs.setDocumentMode(True)
         
-        # Adicionar as abas
-        self.dashboard_tab = DashboardTab()
-        self.clients_tab = ClientsTab()
-        self.vehicles_tab = VehiclesTab()
-        self.service_orders_tab = ServiceOrdersTab()
-        self.parts_tab = PartsTab()
-        self.employees_tab = EmployeesTab()
-        self.expenses_tab = ExpensesTab()
-        
-        self.tabs.addTab(self.dashboard_tab, QIcon("resources/icons/dashboard.png"), "Dashboard")
-        self.tabs.addTab(self.clients_tab, QIcon("resources/icons/clients.png"), "Clientes")
-        self.tabs.addTab(self.vehicles_tab, QIcon("resources/icons/vehicles.png"), "Veículos")
-        self.tabs.addTab(self.service_orders_tab, QIcon("resources/icons/orders.png"), "Ordens de Serviço")
-        self.tabs.addTab(self.parts_tab, QIcon("resources/icons/parts.png"), "Peças")
-        self.tabs.addTab(self.employees_tab, QIcon("resources/icons/employees.png"), "Funcionários")
-        self.tabs.addTab(self.expenses_tab, QIcon("resources/icons/expenses.png"), "Gastos")
+        # Adicionar as abas como contêineres vazios; o conteúdo é criado
+        # na primeira ativação
+        self.tab_containers = {}
+        self.tab_classes = {}
+        for name, class_path, icon, title in TABS:
+            container = QWidget()
+            container_layout = QVBoxLayout(container)
+            container_layout.setContentsMargins(0, 0, 0, 0)
+            self.tab_containers[name] = container
+            self.tab_classes[name] = class_path
+            setattr(self, name, None)
+            self.tabs.addTab(container, QIcon(icon), title)
+        
+        self.tabs.currentChanged.connect(self.on_tab_changed)
         
         # Definir o widget central
         self.setCentralWidget(self.tabs)
+        
+        self.on_tab_changed(self.tabs.currentIndex())
+    
+    def get_tab(self, name):
+        """Retorna a aba pelo nome do atributo, construindo-a se necessário"""
+        tab = getattr(self, name)
+        if tab is not None:
+            return tab
+        
+        started = time.perf_counter()
+        with tracer.span(f"tab:{name}", category="tab"):
+            module_name, class_name = self.tab_classes[name].rsplit('.', 1)
+            with tracer.span(f"import:{module_name}", category="import"):
+                tab_class = getattr(importlib.import_module(module_name), class_name)
+            tab = tab_class()
+            self.tab_containers[name].layout().addWidget(tab)
+            setattr(self, name, tab)
+        build_ms = (time.perf_counter() - started) * 1000
+        logger.info(f"Aba {name} construída em {build_ms:.1f} ms")
+        
+        # Registrar quando os dados da aba terminarem de carregar
+        loader = getattr(tab, 'loader', None)
+        if loader is not None and loader.is_loading():
+            def on_loading_changed(loading):
+                if not loading:
+                    loader.loading_changed.disconnect(on_loading_changed)
+                    finished = time.perf_counter()
+                    load_ms = (finished - started) * 1000
+                    logger.info(f"Dados da aba {name} carregados em {load_ms:.1f} ms")
+                    tracer.record(f"load:{name}", started, finished, category="data")
+                    self.finish_startup_trace()
+            loader.loading_changed.connect(on_loading_changed)
+        
+        return tab
+    
+    def show_tab(self, name):
+        """Ativa a aba pelo nome do atributo e a retorna"""
+        self.tabs.setCurrentWidget(self.tab_containers[name])
+        return self.get_tab(name)
+    
+    def on_tab_changed(self, index):
+        """Constrói a aba ativada e agenda a pré-carga da próxima aba provável"""
+        container = self.tabs.widget(index)
+        for name, tab_container in self.tab_containers.items():
+            if tab_container is container:
+                self.get_tab(name)
+                break
+        
+        QTimer.singleShot(config.TAB_PREFETCH_DELAY_MS, self.prefetch_next_tab)
+    
+    def prefetch_next_tab(self):
+        """Constrói em segundo plano (quando ocioso) a próxima aba provável ainda não criada"""
+        for name in config.TAB_PREFETCH_ORDER:
+            if getattr(self, name, None) is None and name in self.tab_containers:
+                self.get_tab(name)
+                return
+    
+    def showEvent(self, event):
+        """Registra o tempo até a janela ficar interativa na primeira exibição"""
+        super().showEvent(event)
+        if not self.interactive:
+            self.interactive = True
+            QTimer.singleShot(0, self.log_time_to_interactive)
+    
+    def log_time_to_interactive(self):
+        elapsed_ms = (time.perf_counter() - self.started_at) * 1000
+        logger.info(f"Janela principal interativa em {elapsed_ms:.1f} ms")
+        self.interactive_logged = True
+        self.finish_startup_trace()
+    
+    def finish_startup_trace(self):
+        """Encerra o rastreamento da inicialização quando a janela está interativa
+        e as abas já construídas terminaram de carregar seus dados"""
+        if not self.interactive_logged:
+            return
+        for name in self.tab_containers:
+            tab = getattr(self, name)
+            loader = getattr(tab, 'loader', None)
+            if loader is not None and loader.is_loading():
+                return
+        tracer.finish()
     
     def setup_menu(self):
         """Configura o menu principal"""
@@ -138,6 +245,28 @@ class MainWindow(QMainWindow):
         self.status_label = QLabel("Sistema pronto")
         self.statusbar.addWidget(self.status_label)
     
+    def poll_external_changes(self):
+        """Verifica alterações de outras estações; as consultas dos registros alterados rodam em segundo plano"""
+        self.changed_tables.update(change_watcher.poll())
+        if not self.changed_tables or self.change_worker is not None:
+            return
+        
+        tables = sorted(self.changed_tables)
+        self.changed_tables.clear()
+        
+        def on_result(deltas):
+            self.change_worker = None
+            change_watcher.publish(deltas)
+        
+        def on_error(message):
+            # Sem as alterações, recarregar as tabelas inteiras
+            self.change_worker = None
+            change_watcher.publish(dict.fromkeys(tables))
+        
+        self.change_worker = run_in_background(
+            change_watcher.fetch_changes, tables, on_result=on_result, on_error=on_error
+        )
+    
     def backup_database(self):
         """Cria um backup do banco de dados"""
         # Implementação do backup
@@ -153,32 +282,98 @@ class MainWindow(QMainWindow):
     def generate_clients_report(self):
         """Gera um relatório de clientes"""
         logger.info("Relatório de clientes solicitado")
-        self.statusbar.showMessage("Gerando relatório de clientes...", 3000)
+        self.generate_report('clients')
     
     def generate_vehicles_report(self):
         """Gera um relatório de veículos"""
         logger.info("Relatório de veículos solicitado")
-        self.statusbar.showMessage("Gerando relatório de veículos...", 3000)
+        self.generate_report('vehicles')
     
     def generate_orders_report(self):
         """Gera um relatório de ordens de serviço"""
         logger.info("Relatório de ordens de serviço solicitado")
-        self.statusbar.showMessage("Gerando relatório de ordens de serviço...", 3000)
+        self.generate_report('orders')
+    
+    def generate_report(self, name):
+        """Gera um relatório em PDF em segundo plano, com progresso e opção de cancelar
+        
+        As linhas são lidas e desenhadas por páginas (ver services.report_engine),
+        então relatórios grandes não travam a interface nem ocupam memória
+        proporcional ao número de registros.
+        """
+        from PyQt5.QtWidgets import QFileDialog, QProgressDialog, QMessageBox
+        from services.report_engine import REPORTS, generate_report
+        
+        if self.report_worker is not None:
+            self.statusbar.showMessage("Aguarde o término do relatório em andamento", 3000)
+            return
+        
+        report = REPORTS[name]
+        file_name = f"{report.file_name}_{time.strftime('%Y%m%d')}.pdf"
+        save_path, _ = QFileDialog.getSaveFileName(
+            self, "Salvar Relatório", file_name, "Arquivos PDF (*.pdf)"
+        )
+        if not save_path:
+            return
+        
+        progress_dialog = QProgressDialog(f"Gerando {report.title.lower()}...", "Cancelar", 0, 0, self)
+        progress_dialog.setWindowTitle(report.title)
+        progress_dialog.setWindowModality(Qt.WindowModal)
+        progress_dialog.setMinimumDuration(0)
+        progress_dialog.setAutoClose(False)
+        progress_dialog.setAutoReset(False)
+        
+        def on_progress(done, total):
+            progress_dialog.setMaximum(total)
+            progress_dialog.setValue(done)
+        
+        def on_result(rows):
+            self.report_worker = None
+            progress_dialog.close()
+            if rows is None:
+                return
+            
+            self.statusbar.showMessage(f"{report.title} salvo em {save_path}", 5000)
+            reply = QMessageBox.question(
+                self, "Relatório Gerado",
+                f"{report.title} gerado com {rows} registro(s). Deseja abrir o arquivo?",
+                QMessageBox.Yes | QMessageBox.No, QMessageBox.Yes
+            )
+            if reply == QMessageBox.Yes:
+                from PyQt5.QtCore import QUrl
+                from PyQt5.QtGui import QDesktopServices
+                QDesktopServices.openUrl(QUrl.fromLocalFile(save_path))
+        
+        def on_error(message):
+            self.report_worker = None
+            progress_dialog.close()
+            QMessageBox.critical(self, "Erro", f"Não foi possível gerar o relatório: {message}")
+        
+        def on_cancel():
+            # close() também emite canceled; ignorar quando o relatório já terminou
+            if self.report_worker is worker:
+                worker.cancel()
+                self.report_worker = None
+                self.statusbar.showMessage("Relatório cancelado", 3000)
+        
+        worker = run_in_background(
+            generate_report, name, save_path,
+            on_result=on_result, on_error=on_error, on_progress=on_progress
+        )
+        self.report_worker = worker
+        progress_dialog.canceled.connect(on_cancel)
     
     def create_new_order(self):
         """Cria uma nova ordem de serviço"""
-        self.tabs.setCurrentIndex(3)  # Índice da aba de ordens de serviço
-        self.service_orders_tab.show_add_dialog()
+        self.show_tab('service_orders_tab').show_add_dialog()
     
     def create_new_client(self):
         """Cria um novo cliente"""
-        self.tabs.setCurrentIndex(1)  # Índice da aba de clientes
-        self.clients_tab.show_add_dialog()
+        self.show_tab('clients_tab').show_add_dialog()
     
     def create_new_vehicle(self):
         """Cria um novo veículo"""
-        self.tabs.setCurrentIndex(2)  # Índice da aba de veículos
-        self.vehicles_tab.show_add_dialog()
+        self.show_tab('vehicles_tab').show_add_dialog()
     
     def show_search(self):
         """Exibe a caixa de busca global"""
@@ -210,6 +405,10 @@ class MainWindow(QMainWindow):
         
         if reply == QMessageBox.Yes:
             logger.info("Aplicativo encerrado pelo usuário")
+            self.change_timer.stop()
+            change_watcher.stop()
+            if self.report_worker is not None:
+                self.report_worker.cancel()
             event.accept()
         else:
             event.ignore()
\ No newline at end of file
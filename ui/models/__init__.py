@@ -0,0 +1 @@
+# Initialize the table models package.
@@ -0,0 +1,269 @@
+"""
+Modelo de tabela paginado para as listagens das abas.
+
+As linhas são obtidas em páginas pelos métodos `get_*_page` dos
+controladores, em segundo plano, à medida que a tabela é rolada
+(canFetchMore/fetchMore). As células não são objetos Qt: o texto, a cor e
+o alinhamento são calculados em `data()` apenas para as linhas visíveis.
+
+Depois de incluir, editar ou excluir um registro, as abas atualizam só a
+linha afetada (upsert_row/remove_row, ou apply_changes com as alterações
+publicadas pelos controladores), sem recarregar a listagem.
+"""
+
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from services.change_bus import DELETE, EXTERNAL
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PyQt5.QtGui import QColor
+from ui.models.search_filter import normalize_search_text
+from ui.workers import BackgroundLoader
+import config
+
+logger = logging.getLogger(config.APP_NAME)
+
+
+def format_money(value) -> str:
+    return f"R$ {value:.2f}" if value is not None else ""
+
+
+def format_date(value) -> str:
+    return value.split()[0] if value else ""
+
+
+class PagedTableModel(QAbstractTableModel):
+    """Base dos modelos de tabela das abas
+
+    Subclasses definem `columns` como [(título, campo, formatador ou None)],
+    os campos usados na busca em memória (`search_fields`), a ordem da
+    listagem (`order_fields` e `descending`, iguais ao PAGE_ORDER do
+    controlador) e podem sobrescrever `background` para colorir as linhas.
+    O ID de cada linha fica disponível em Qt.UserRole.
+    """
+    columns: List[Tuple[str, str, Optional[Callable[[Any], str]]]] = []
+    search_fields: Tuple[str, ...] = ()
+    numeric_fields = ()
+    order_fields: List[Tuple[str, Any]] = [('id', 0)]  # [(campo, valor usado para nulos)]
+    descending = False
+
+    def __init__(self, fetch_page: Callable[..., List[Dict[str, Any]]], parent=None):
+        """
+        Args:
+            fetch_page: Método `get_*_page(limit, after, search)` do controlador
+        """
+        super().__init__(parent)
+        self.fetch_page = fetch_page
+        self.rows: List[Dict[str, Any]] = []
+        self.search_keys: List[str] = []
+        self.search: Optional[str] = None
+        self.exhausted = False
+        self.positions: Optional[Dict[Any, int]] = None  # ID -> linha, montado na primeira busca por ID
+        self.loader = BackgroundLoader(self)
+
+    # Interface do QAbstractTableModel
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.columns[section][0]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        row = self.rows[index.row()]
+        _, field, formatter = self.columns[index.column()]
+
+        if role == Qt.DisplayRole:
+            value = row.get(field)
+            if formatter:
+                return formatter(value)
+            return "" if value is None else str(value)
+        if role == Qt.BackgroundRole:
+            return self.background(row)
+        if role == Qt.TextAlignmentRole and field in self.numeric_fields:
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        if role == Qt.UserRole:
+            return row['id']
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self.exhausted and not self.loader.is_loading()
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        after = self.rows[-1] if self.rows else None
+        self.loader.load(self.fetch_page, self._append_page, config.TABLE_PAGE_SIZE, after, self.search)
+
+    # Operações usadas pelas abas
+
+    def background(self, row: Dict[str, Any]) -> Optional[QColor]:
+        """Cor de fundo da linha (None para a cor padrão)"""
+        return None
+
+    def reload(self, search: Optional[str] = None):
+        """Descarta as linhas carregadas e busca novamente a partir da primeira página"""
+        self.loader.cancel()
+        self.beginResetModel()
+        self.rows = []
+        self.search_keys = []
+        self.search = search or None
+        self.exhausted = False
+        self.positions = None
+        self.endResetModel()
+        self.fetchMore()
+
+    def row_at(self, row: int) -> Dict[str, Any]:
+        return self.rows[row]
+    
+    def upsert_row(self, row: Optional[Dict[str, Any]]):
+        """Inclui ou atualiza uma linha na posição que ela ocupa na ordem da listagem
+        
+        Apenas a linha afetada é notificada à tabela, que mantém a rolagem e a
+        seleção. Uma linha que ficaria depois da última página carregada é
+        deixada para a próxima página; uma que não atende mais à busca feita
+        no banco é removida.
+        """
+        if not row:
+            return
+        
+        search_key = self.search_key(row)
+        if self.search and normalize_search_text(self.search) not in search_key:
+            self.remove_row(row['id'])
+            return
+        
+        current = self._find_row(row['id'])
+        if current is None:
+            position = self._insert_position(row)
+            if position == len(self.rows) and not self.exhausted:
+                return
+            self.beginInsertRows(QModelIndex(), position, position)
+            self.rows.insert(position, row)
+            self.search_keys.insert(position, search_key)
+            self._reindex(position, len(self.rows))
+            self.endInsertRows()
+            return
+        
+        if self.rows[current] == row:
+            return
+        
+        # Posição entre as demais linhas, como se a linha atual não estivesse na lista
+        old_row = self.rows.pop(current)
+        position = self._insert_position(row)
+        self.rows.insert(current, old_row)
+        
+        # Se passou para depois da última linha carregada, a próxima página
+        # (buscada a partir da última linha) a traz de volta no lugar certo
+        moved = self.sort_key(row) != self.sort_key(old_row)
+        if moved and position == len(self.rows) - 1 and not self.exhausted:
+            self.remove_row(row['id'])
+            return
+        
+        if position == current:
+            self.rows[current] = row
+            self.search_keys[current] = search_key
+            self.dataChanged.emit(self.index(current, 0), self.index(current, len(self.columns) - 1))
+            return
+        
+        # beginMoveRows recebe o destino em posições de antes da movimentação
+        destination = position if position < current else position + 1
+        self.beginMoveRows(QModelIndex(), current, current, QModelIndex(), destination)
+        del self.rows[current]
+        del self.search_keys[current]
+        self.rows.insert(position, row)
+        self.search_keys.insert(position, search_key)
+        self._reindex(min(position, current), max(position, current) + 1)
+        self.endMoveRows()
+        self.dataChanged.emit(self.index(position, 0), self.index(position, len(self.columns) - 1))
+    
+    def remove_row(self, row_id):
+        """Remove a linha do registro informado, se estiver carregada"""
+        position = self._find_row(row_id)
+        if position is None:
+            return
+        
+        self.beginRemoveRows(QModelIndex(), position, position)
+        del self.rows[position]
+        del self.search_keys[position]
+        if self.positions is not None:
+            del self.positions[row_id]
+        self._reindex(position, len(self.rows))
+        self.endRemoveRows()
+    
+    def apply_changes(self, changes, get_by_id: Callable[[int], Optional[Dict[str, Any]]]):
+        """Aplica alterações do barramento (services/change_bus) às linhas carregadas
+        
+        Args:
+            changes: Alterações da entidade exibida pelo modelo
+            get_by_id: Método `get_*_by_id` do controlador, usado quando a
+                       alteração não traz o registro
+        """
+        if len(changes) > config.CHANGE_RELOAD_THRESHOLD or any(c.operation == EXTERNAL for c in changes):
+            # Muitas alterações de uma vez, ou alterações de outra estação
+            # (sem ID): buscar a listagem de novo
+            self.reload(self.search)
+            return
+        
+        for change in changes:
+            if change.operation == DELETE:
+                self.remove_row(change.id)
+                continue
+            row = change.record or get_by_id(change.id)
+            if row:
+                self.upsert_row(row)
+            else:
+                self.remove_row(change.id)
+    
+    def sort_key(self, row: Dict[str, Any]) -> tuple:
+        """Chave da linha na ordem da listagem"""
+        return tuple(null if row.get(field) is None else row.get(field) for field, null in self.order_fields)
+    
+    def search_key(self, row: Dict[str, Any]) -> str:
+        """Texto normalizado em que a busca em memória procura"""
+        return "\n".join(normalize_search_text(row.get(field)) for field in self.search_fields)
+
+    def _find_row(self, row_id) -> Optional[int]:
+        if self.positions is None:
+            self.positions = {row['id']: i for i, row in enumerate(self.rows)}
+        return self.positions.get(row_id)
+    
+    def _reindex(self, start: int, stop: int):
+        """Atualiza no mapa ID -> linha apenas as linhas [start, stop), deslocadas pela alteração"""
+        if self.positions is None:
+            return
+        for i in range(start, stop):
+            self.positions[self.rows[i]['id']] = i
+    
+    def _insert_position(self, row: Dict[str, Any]) -> int:
+        """Busca binária da posição da linha entre as linhas carregadas"""
+        key = self.sort_key(row)
+        low, high = 0, len(self.rows)
+        while low < high:
+            middle = (low + high) // 2
+            middle_key = self.sort_key(self.rows[middle])
+            if (middle_key > key) if self.descending else (middle_key < key):
+                low = middle + 1
+            else:
+                high = middle
+        return low
+    
+    def _append_page(self, page: List[Dict[str, Any]]):
+        if len(page) < config.TABLE_PAGE_SIZE:
+            self.exhausted = True
+        if not page:
+            return
+
+        first = len(self.rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(page) - 1)
+        self.rows.extend(page)
+        self.search_keys.extend(self.search_key(row) for row in page)
+        if self.positions is not None:
+            self.positions.update((row['id'], first + i) for i, row in enumerate(page))
+        self.endInsertRows()
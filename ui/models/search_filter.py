@@ -0,0 +1,80 @@
+"""
+Busca nas tabelas das abas.
+
+O texto digitado é aplicado com atraso (debounce). Quando todas as linhas
+da listagem já estão carregadas e são poucas, o filtro é feito em memória
+por um QSortFilterProxyModel sobre chaves de busca pré-normalizadas; caso
+contrário a busca é enviada ao banco de dados pela consulta paginada. Os dois
+caminhos usam a mesma normalização (normalize_search_text, registrada no
+SQLite como normalize_search), então o resultado não depende do número de
+linhas.
+"""
+
+from PyQt5.QtCore import QObject, QSortFilterProxyModel, QTimer
+from database.db_manager import normalize_search_text
+import config
+
+
+class SearchFilterProxyModel(QSortFilterProxyModel):
+    """Filtra as linhas de um PagedTableModel pelas chaves de busca pré-calculadas"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.needle = ""
+
+    def set_search_text(self, text: str):
+        needle = normalize_search_text(text.strip())
+        if needle != self.needle:
+            self.needle = needle
+            self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if not self.needle:
+            return True
+        return self.needle in self.sourceModel().search_keys[source_row]
+
+
+class TableSearch(QObject):
+    """Liga o campo de busca de uma aba ao seu modelo paginado
+
+    Args:
+        search_input: Campo de busca (QLineEdit)
+        model: Modelo paginado da aba
+        proxy: Proxy de filtro exibido pela tabela
+    """
+
+    def __init__(self, search_input, model, proxy, parent=None):
+        super().__init__(parent)
+        self.search_input = search_input
+        self.model = model
+        self.proxy = proxy
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(config.SEARCH_DEBOUNCE_MS)
+        self.timer.timeout.connect(self.apply)
+        search_input.textChanged.connect(self.timer.start)
+
+    def can_filter_locally(self, text: str) -> bool:
+        """Indica se o filtro pode ser feito só em memória sobre as linhas carregadas"""
+        if not self.model.exhausted or len(self.model.rows) > config.SEARCH_LOCAL_MAX_ROWS:
+            return False
+        # As linhas carregadas por uma busca no banco só contêm o resultado
+        # daquela busca; servem apenas para refinar o mesmo texto
+        loaded_search = normalize_search_text(self.model.search)
+        return loaded_search in normalize_search_text(text)
+
+    def apply(self):
+        """Aplica o texto atual do campo de busca"""
+        self.timer.stop()
+        text = self.search_input.text().strip()
+
+        if self.can_filter_locally(text):
+            self.proxy.set_search_text(text)
+        else:
+            self.proxy.set_search_text("")
+            self.model.reload(text)
+
+    def reload(self):
+        """Recarrega a listagem mantendo a busca atual"""
+        self.model.reload(self.model.search)
@@ -0,0 +1,109 @@
+"""
+Modelos de tabela de cada aba.
+"""
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QColor
+from ui.models.paged_table_model import PagedTableModel, format_money, format_date
+
+# Cores de destaque das linhas
+LOW_STOCK_COLOR = QColor(Qt.red)
+STATUS_COLORS = {
+    'em andamento': QColor(Qt.yellow),
+    'concluído': QColor(Qt.cyan),
+    'entregue': QColor(Qt.green),
+}
+
+
+class ClientsTableModel(PagedTableModel):
+    columns = [
+        ("ID", 'id', None),
+        ("Nome", 'name', None),
+        ("CPF/CNPJ", 'document', None),
+        ("Endereço", 'address', None),
+        ("Telefone", 'phone', None),
+        ("Email", 'email', None),
+    ]
+    search_fields = ('name', 'document', 'address', 'phone', 'email')
+    order_fields = [('name', ''), ('id', 0)]
+
+
+class VehiclesTableModel(PagedTableModel):
+    columns = [
+        ("ID", 'id', None),
+        ("Placa", 'plate', None),
+        ("Marca", 'brand', None),
+        ("Modelo", 'model', None),
+        ("Ano", 'year', None),
+        ("Cor", 'color', None),
+        ("Cliente", 'client_name', lambda value: value or 'N/A'),
+    ]
+    search_fields = ('plate', 'brand', 'model', 'year', 'color', 'client_name')
+    order_fields = [('plate', ''), ('id', 0)]
+
+
+class EmployeesTableModel(PagedTableModel):
+    columns = [
+        ("ID", 'id', None),
+        ("Nome", 'name', None),
+        ("CPF", 'document', None),
+        ("Cargo", 'role', None),
+        ("Data de Contratação", 'hire_date', None),
+    ]
+    search_fields = ('name', 'document', 'role')
+    order_fields = [('name', ''), ('id', 0)]
+
+
+class PartsTableModel(PagedTableModel):
+    columns = [
+        ("ID", 'id', None),
+        ("Código", 'code', None),
+        ("Descrição", 'description', None),
+        ("Estoque", 'stock_quantity', None),
+        ("Preço de Compra", 'buy_price', format_money),
+        ("Preço de Venda", 'sell_price', format_money),
+    ]
+    search_fields = ('code', 'description')
+    numeric_fields = ('stock_quantity', 'buy_price', 'sell_price')
+    order_fields = [('code', ''), ('id', 0)]
+
+    def background(self, row):
+        # Destacar peças com estoque baixo
+        if (row['stock_quantity'] or 0) <= 5:
+            return LOW_STOCK_COLOR
+        return None
+
+
+class ExpensesTableModel(PagedTableModel):
+    columns = [
+        ("ID", 'id', None),
+        ("Data", 'date', None),
+        ("Descrição", 'description', None),
+        ("Valor", 'value', format_money),
+        ("Categoria", 'category', None),
+        ("Forma de Pagamento", 'payment_method', None),
+    ]
+    search_fields = ('date', 'description', 'category')
+    numeric_fields = ('value',)
+    order_fields = [('date', ''), ('id', 0)]
+    descending = True
+
+
+class ServiceOrdersTableModel(PagedTableModel):
+    columns = [
+        ("ID", 'id', None),
+        ("Número", 'number', None),
+        ("Data", 'open_date', format_date),
+        ("Veículo", 'vehicle_plate', lambda value: value or 'N/A'),
+        ("Cliente", 'client_name', lambda value: value or 'N/A'),
+        ("Status", 'status', None),
+        ("Valor Total", 'total_value', format_money),
+    ]
+    search_fields = ('number', 'open_date', 'vehicle_plate', 'client_name')
+    numeric_fields = ('total_value',)
+    order_fields = [('open_date', ''), ('id', 0)]
+    descending = True
+
+    def background(self, row):
+        # Colorir a linha de acordo com o status
+        return STATUS_COLORS.get(row['status'])
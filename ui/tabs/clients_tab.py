@@ -1,11 +1,14 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
-                            QTableWidget, QTableWidgetItem, QHeaderView, 
+                            QTableView, QAbstractItemView, QHeaderView, 
                             QLineEdit, QLabel, QMessageBox, QMenu)
 from PyQt5.QtCore import Qt, pyqtSlot
 from PyQt5.QtGui import QIcon
 import logging
 from controllers.client_controller import ClientController
 from ui.dialogs.client_dialog import ClientDialog
+from ui.models.table_models import ClientsTableModel
+from ui.models.search_filter import SearchFilterProxyModel, TableSearch
+from ui.change_dispatcher import get_change_dispatcher
 import config
 
 logger = logging.getLogger(config.APP_NAME)
@@ -16,6 +19,11 @@ class ClientsTab(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.client_controller = ClientController()
+        self.model = ClientsTableModel(self.client_controller.get_clients_page, self)
+        self.proxy = SearchFilterProxyModel(self)
+        self.proxy.setSourceModel(self.model)
+        self.loader = self.model.loader
+        get_change_dispatcher().subscribe(self.on_changes, ('clients',))
         self.setup_ui()
         self.load_clients()
     
@@ -28,6 +36,13 @@ class ClientsTab(QWidget):
         title.setStyleSheet("font-size: 24px; font-weight: bold;")
         header_layout.addWidget(title)
         
+        # Indicador de carregamento
+        self.loading_label = QLabel("Carregando...")
+        self.loading_label.setStyleSheet("color: gray;")
+        self.loading_label.hide()
+        self.loader.loading_changed.connect(self.loading_label.setVisible)
+        header_layout.addWidget(self.loading_label)
+        
         # Botão de adicionar
         self.add_button = QPushButton("Novo Cliente")
         self.add_button.setIcon(QIcon("resources/icons/add.png"))
@@ -41,56 +56,35 @@ class ClientsTab(QWidget):
         search_layout.addWidget(QLabel("Buscar:"))
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Digite para filtrar por nome, documento ou email...")
-        self.search_input.textChanged.connect(self.filter_clients)
         search_layout.addWidget(self.search_input)
+        self.table_search = TableSearch(self.search_input, self.model, self.proxy, self)
         layout.addLayout(search_layout)
         
         # Tabela de clientes
-        self.table = QTableWidget()
-        self.table.setColumnCount(6)
-        self.table.setHorizontalHeaderLabels(["ID", "Nome", "CPF/CNPJ", "Endereço", "Telefone", "Email"])
+        self.table = QTableView()
+        self.table.setModel(self.proxy)
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         self.table.setContextMenuPolicy(Qt.CustomContextMenu)
         self.table.customContextMenuRequested.connect(self.show_context_menu)
-        self.table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         layout.addWidget(self.table)
         
         self.setLayout(layout)
     
     def load_clients(self):
         """Carrega os clientes do banco de dados para a tabela"""
-        clients = self.client_controller.get_all_clients()
-        self.table.setRowCount(len(clients))
-        
-        for row, client in enumerate(clients):
-            self.table.setItem(row, 0, QTableWidgetItem(str(client['id'])))
-            self.table.setItem(row, 1, QTableWidgetItem(client['name']))
-            self.table.setItem(row, 2, QTableWidgetItem(client['document']))
-            self.table.setItem(row, 3, QTableWidgetItem(client['address']))
-            self.table.setItem(row, 4, QTableWidgetItem(client['phone']))
-            self.table.setItem(row, 5, QTableWidgetItem(client['email']))
-            
-            # Armazenar o ID do cliente como dado do item
-            self.table.item(row, 0).setData(Qt.UserRole, client['id'])
+        self.table_search.reload()
     
-    def filter_clients(self):
-        """Filtra os clientes com base no texto digitado"""
-        search_text = self.search_input.text().lower()
-        for row in range(self.table.rowCount()):
-            visible = False
-            for col in range(1, 6):  # Colunas de nome, documento, endereço, telefone e email
-                item = self.table.item(row, col)
-                if item and search_text in item.text().lower():
-                    visible = True
-                    break
-            self.table.setRowHidden(row, not visible)
+    def on_changes(self, changes):
+        """Aplica à tabela as alterações publicadas pelos controladores"""
+        self.model.apply_changes(changes, self.client_controller.get_client_by_id)
     
     def show_add_dialog(self):
         """Exibe o diálogo para adicionar um novo cliente"""
         dialog = ClientDialog(self)
         if dialog.exec_():
-            self.load_clients()
+            self.model.upsert_row(dialog.saved_client)
     
     def show_edit_dialog(self, client_id):
         """Exibe o diálogo para editar um cliente existente"""
@@ -98,7 +92,7 @@ class ClientsTab(QWidget):
         if client:
             dialog = ClientDialog(self, client)
             if dialog.exec_():
-                self.load_clients()
+                self.model.upsert_row(dialog.saved_client)
         else:
             QMessageBox.warning(self, "Erro", "Cliente não encontrado.")
     
@@ -114,7 +108,7 @@ class ClientsTab(QWidget):
             success = self.client_controller.delete_client(client_id)
             if success:
                 QMessageBox.information(self, "Sucesso", "Cliente excluído com sucesso!")
-                self.load_clients()
+                self.model.remove_row(client_id)
             else:
                 QMessageBox.critical(
                     self, "Erro", 
@@ -123,13 +117,12 @@ class ClientsTab(QWidget):
     
     def show_context_menu(self, position):
         """Exibe o menu de contexto ao clicar com o botão direito na tabela"""
-        indexes = self.table.selectedIndexes()
+        indexes = self.table.selectionModel().selectedRows()
         if not indexes:
             return
         
         # Obter o ID do cliente selecionado
-        row = indexes[0].row()
-        client_id = self.table.item(row, 0).data(Qt.UserRole)
+        client_id = indexes[0].data(Qt.UserRole)
         
         # Criar menu
         menu = QMenu()
@@ -1,39 +1,127 @@
 import sys
+import logging
+from datetime import datetime, date, timedelta
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-                            QFrame, QGridLayout, QSizePolicy)
-from PyQt5.QtCore import Qt
+                            QFrame, QGridLayout, QSizePolicy, QComboBox, QDateEdit,
+                            QTableWidget, QTableWidgetItem, QHeaderView)
+from PyQt5.QtCore import Qt, QTimer, QDate
 from PyQt5.QtGui import QFont, QIcon
 
-from controllers.client_controller import ClientController
-from controllers.vehicle_controller import VehicleController
-from controllers.service_order_controller import ServiceOrderController
-from controllers.expense_controller import ExpenseController
-from controllers.part_controller import PartController
+from controllers.dashboard_controller import DashboardController
 from controllers.employee_controller import EmployeeController
+from controllers.part_controller import PartController
+from controllers.service_order_controller import ServiceOrderController
+from services.dashboard_snapshot import load_snapshot, save_snapshot
+import config
 
-from ui.widgets.chart_widget import PieChartWidget, BarChartWidget, LineChartWidget
+from ui.workers import BackgroundLoader
+from ui.change_dispatcher import get_change_dispatcher
+
+logger = logging.getLogger(config.APP_NAME)
+
+# Períodos do filtro do dashboard: (rótulo, chave)
+PERIODS = [
+    ("Todo o período", 'all'),
+    ("Esta semana", 'week'),
+    ("Este mês", 'month'),
+    ("Este ano", 'year'),
+    ("Personalizado", 'custom'),
+]
+
+# Agrupamentos da tabela de margens: (rótulo, chave)
+MARGIN_GROUPS = [
+    ("Por mês", 'month'),
+    ("Por peça", 'part'),
+    ("Por funcionário", 'employee'),
+]
 
 class DashboardTab(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.client_controller = ClientController()
-        self.vehicle_controller = VehicleController()
-        self.service_order_controller = ServiceOrderController()
-        self.expense_controller = ExpenseController()
-        self.part_controller = PartController()
-        self.employee_controller = EmployeeController()
+        self.dashboard_controller = DashboardController()
+        self.loader = BackgroundLoader(self)
+        self.data = None
+        self.daily_totals = None  # DailyTotals, para os filtros de período
+        self.snapshot_revenue = None  # Série de faturamento gravada, até os totais diários carregarem
+        self.daily_loader = BackgroundLoader(self)
+        self.margins = None  # (MarginAnalytics, nomes das peças, nomes dos funcionários)
+        self.margin_loader = BackgroundLoader(self)
+        self.margins_stale = False
+        self.updated_at = None
+        # Com a aba oculta, os recálculos e o redesenho dos gráficos ficam
+        # pendentes até ela ser exibida
+        self.data_stale = False
+        self.charts_dirty = False
+        self.status_chart = None
+        self.revenue_chart = None
+        self.expense_chart = None
         
         self.init_ui()
+        
+        # Recalcular quando os números ficarem mais antigos que o TTL
+        self.ttl_timer = QTimer(self)
+        self.ttl_timer.setSingleShot(True)
+        self.ttl_timer.setInterval(config.DASHBOARD_TTL_SECONDS * 1000)
+        self.ttl_timer.timeout.connect(self.refresh)
+        
+        # Exibir o último resumo gravado enquanto os números atuais são calculados
+        snapshot = load_snapshot()
+        if snapshot is not None:
+            self.snapshot_revenue = snapshot.revenue_series
+            self.apply_data(snapshot.summary, snapshot.saved_at)
         self.load_data()
+        
+        # Recarregar quando mudarem os registros contados ou somados no dashboard
+        get_change_dispatcher().subscribe(
+            self.on_changes, ('clients', 'vehicles', 'service_orders', 'expenses')
+        )
+        # Custos e nomes das peças e funcionários só afetam a tabela de margens
+        get_change_dispatcher().subscribe(self.on_margin_changes, ('parts', 'employees'))
+        
+        # Os gráficos são criados depois que a aba já foi exibida
+        QTimer.singleShot(0, self.build_charts)
     
     def init_ui(self):
         # Layout principal
         main_layout = QVBoxLayout()
         
         # Título
+        header_layout = QHBoxLayout()
         title_label = QLabel("Dashboard")
         title_label.setFont(QFont("Arial", 18, QFont.Bold))
-        main_layout.addWidget(title_label)
+        header_layout.addWidget(title_label)
+        
+        # Indicador de carregamento
+        self.loading_label = QLabel("Carregando...")
+        self.loading_label.setStyleSheet("color: gray;")
+        self.loading_label.hide()
+        self.loader.loading_changed.connect(self.loading_label.setVisible)
+        header_layout.addWidget(self.loading_label)
+        
+        # Instante do cálculo dos números exibidos
+        self.updated_label = QLabel()
+        self.updated_label.setStyleSheet("color: gray;")
+        header_layout.addWidget(self.updated_label)
+        header_layout.addStretch()
+        
+        # Filtro de período (ordens, faturamento, despesas e lucro)
+        header_layout.addWidget(QLabel("Período:"))
+        self.period_combo = QComboBox()
+        for label, key in PERIODS:
+            self.period_combo.addItem(label, key)
+        self.period_combo.currentIndexChanged.connect(self.on_period_changed)
+        header_layout.addWidget(self.period_combo)
+        
+        today = QDate.currentDate()
+        self.start_date_edit = QDateEdit(QDate(today.year(), today.month(), 1))
+        self.end_date_edit = QDateEdit(today)
+        for date_edit in (self.start_date_edit, self.end_date_edit):
+            date_edit.setCalendarPopup(True)
+            date_edit.setDisplayFormat("dd/MM/yyyy")
+            date_edit.setEnabled(False)
+            date_edit.dateChanged.connect(self.apply_period)
+            header_layout.addWidget(date_edit)
+        main_layout.addLayout(header_layout)
         
         # Cards de estatísticas
         stats_layout = QGridLayout()
@@ -62,35 +150,26 @@ class DashboardTab(QWidget):
         # Gráfico de pizza - Status das ordens
         status_chart_container = QFrame()
         status_chart_container.setFrameShape(QFrame.StyledPanel)
-        status_chart_layout = QVBoxLayout(status_chart_container)
+        self.status_chart_layout = QVBoxLayout(status_chart_container)
         status_chart_title = QLabel("Status das Ordens")
         status_chart_title.setFont(QFont("Arial", 12, QFont.Bold))
-        status_chart_layout.addWidget(status_chart_title)
-        
-        self.status_chart = PieChartWidget()
-        status_chart_layout.addWidget(self.status_chart)
+        self.status_chart_layout.addWidget(status_chart_title)
         
         # Gráfico de barras - Faturamento por mês
         revenue_chart_container = QFrame()
         revenue_chart_container.setFrameShape(QFrame.StyledPanel)
-        revenue_chart_layout = QVBoxLayout(revenue_chart_container)
-        revenue_chart_title = QLabel("Faturamento por Mês")
+        self.revenue_chart_layout = QVBoxLayout(revenue_chart_container)
+        revenue_chart_title = QLabel("Faturamento")
         revenue_chart_title.setFont(QFont("Arial", 12, QFont.Bold))
-        revenue_chart_layout.addWidget(revenue_chart_title)
-        
-        self.revenue_chart = BarChartWidget()
-        revenue_chart_layout.addWidget(self.revenue_chart)
+        self.revenue_chart_layout.addWidget(revenue_chart_title)
         
         # Gráfico de pizza - Despesas por categoria
         expense_chart_container = QFrame()
         expense_chart_container.setFrameShape(QFrame.StyledPanel)
-        expense_chart_layout = QVBoxLayout(expense_chart_container)
+        self.expense_chart_layout = QVBoxLayout(expense_chart_container)
         expense_chart_title = QLabel("Despesas por Categoria")
         expense_chart_title.setFont(QFont("Arial", 12, QFont.Bold))
-        expense_chart_layout.addWidget(expense_chart_title)
-        
-        self.expense_chart = PieChartWidget()
-        expense_chart_layout.addWidget(self.expense_chart)
+        self.expense_chart_layout.addWidget(expense_chart_title)
         
         # Adicionar gráficos ao layout
         charts_layout.addWidget(status_chart_container)
@@ -99,8 +178,53 @@ class DashboardTab(QWidget):
         
         main_layout.addLayout(charts_layout)
         
+        # Tabela de margens (todo o período)
+        margin_container = QFrame()
+        margin_container.setFrameShape(QFrame.StyledPanel)
+        margin_layout = QVBoxLayout(margin_container)
+        
+        margin_header = QHBoxLayout()
+        margin_title = QLabel("Margens")
+        margin_title.setFont(QFont("Arial", 12, QFont.Bold))
+        margin_header.addWidget(margin_title)
+        margin_header.addStretch()
+        self.margin_group_combo = QComboBox()
+        for label, key in MARGIN_GROUPS:
+            self.margin_group_combo.addItem(label, key)
+        self.margin_group_combo.currentIndexChanged.connect(self.update_margin_table)
+        margin_header.addWidget(self.margin_group_combo)
+        margin_layout.addLayout(margin_header)
+        
+        self.margin_table = QTableWidget(0, 6)
+        self.margin_table.setHorizontalHeaderLabels(
+            ["Mês", "Faturamento", "Mão de obra", "Custo das peças", "Margem", "Margem %"]
+        )
+        self.margin_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.margin_table.verticalHeader().setVisible(False)
+        self.margin_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.margin_table.setSelectionBehavior(QTableWidget.SelectRows)
+        margin_layout.addWidget(self.margin_table)
+        
+        main_layout.addWidget(margin_container)
+        
         self.setLayout(main_layout)
     
+    def build_charts(self):
+        """Cria os widgets de gráfico e aplica os dados já carregados"""
+        from ui.widgets.chart_backend import load_chart_backend
+        charts = load_chart_backend()
+        
+        self.status_chart = charts.PieChartWidget()
+        self.status_chart_layout.addWidget(self.status_chart)
+        
+        self.revenue_chart = charts.BarChartWidget()
+        self.revenue_chart_layout.addWidget(self.revenue_chart)
+        
+        self.expense_chart = charts.PieChartWidget()
+        self.expense_chart_layout.addWidget(self.expense_chart)
+        
+        self.render_charts()
+    
     def create_stat_card(self, title, value, icon_name):
         card = QFrame()
         card.setFrameShape(QFrame.StyledPanel)
@@ -124,59 +248,224 @@ class DashboardTab(QWidget):
         return card
     
     def load_data(self):
-        try:
-            # Carregar estatísticas
-            clients = self.client_controller.get_all_clients()
-            vehicles = self.vehicle_controller.get_all_vehicles()
-            orders = self.service_order_controller.get_all_service_orders()
-            expenses = self.expense_controller.get_all_expenses()
-            
-            # Calcular valores
-            client_count = len(clients)
-            vehicle_count = len(vehicles)
-            order_count = len(orders)
-            
-            total_revenue = sum(order['total_value'] for order in orders)
-            total_expenses = sum(expense['value'] for expense in expenses)
-            profit = total_revenue - total_expenses
+        """Carrega os dados do dashboard em segundo plano"""
+        self.loader.load(self.fetch_data, self.apply_data, on_error=self.show_load_error)
+        self.daily_loader.load(self.fetch_daily_totals, self.apply_daily_totals, on_error=self.show_load_error)
+        self.load_margins()
+    
+    def load_margins(self):
+        """Recalcula as margens em segundo plano"""
+        self.margins_stale = False
+        self.margin_loader.load(self.fetch_margins, self.apply_margins, on_error=self.show_load_error)
+    
+    def refresh(self):
+        """Recarrega os dados agora, se a aba estiver visível, ou quando ela for exibida"""
+        if not self.isVisible():
+            self.data_stale = True
+            return
+        self.data_stale = False
+        self.load_data()
+    
+    def on_changes(self, changes):
+        """Recarrega os dados após alterações publicadas pelos controladores"""
+        self.refresh()
+    
+    def on_margin_changes(self, changes):
+        """Recalcula as margens após alterações de peças ou funcionários"""
+        if not self.isVisible():
+            self.margins_stale = True
+            return
+        self.load_margins()
+    
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.charts_dirty:
+            self.render_charts()
+        if self.data_stale:
+            self.refresh()
+        elif self.margins_stale:
+            self.load_margins()
+    
+    def fetch_data(self):
+        """Consulta os totais do dashboard e grava o resumo (executado fora da thread da interface)"""
+        summary = self.dashboard_controller.get_summary()
+        if summary is None:
+            raise RuntimeError("não foi possível calcular o resumo")
+        save_snapshot(summary)
+        return summary
+    
+    def fetch_daily_totals(self):
+        """Carrega os totais diários em arrays (executado fora da thread da interface)"""
+        # Importação local: o NumPy só é carregado depois que a janela já foi exibida
+        from services.daily_totals import load_daily_totals
+        daily_totals = load_daily_totals(self.dashboard_controller)
+        save_snapshot(revenue_series=daily_totals.series('revenue'))
+        return daily_totals
+    
+    def fetch_margins(self):
+        """Calcula as margens e lê os nomes das peças e funcionários (executado fora da thread da interface)"""
+        # Importação local: o NumPy só é carregado depois que a janela já foi exibida
+        from services.margin_analytics import load_margin_analytics
+        analytics = load_margin_analytics(ServiceOrderController())
+        part_names = {part['id']: f"{part['code']} - {part['description']}" for part in PartController().get_all_parts()}
+        employee_names = {employee['id']: employee['name'] for employee in EmployeeController().get_all_employees()}
+        return analytics, part_names, employee_names
+    
+    def apply_margins(self, margins):
+        self.margins = margins
+        self.update_margin_table()
+    
+    def update_margin_table(self):
+        """Preenche a tabela de margens com o agrupamento selecionado"""
+        if self.margins is None:
+            return
+        
+        from services.margin_analytics import NO_ID
+        analytics, part_names, employee_names = self.margins
+        group = self.margin_group_combo.currentData()
+        if group == 'part':
+            header = "Peça"
+            table = analytics.by_part().sorted_by_margin()
+            names = part_names
+        elif group == 'employee':
+            header = "Funcionário"
+            table = analytics.by_employee().sorted_by_margin()
+            names = employee_names
+        else:
+            header = "Mês"
+            table = analytics.by_month()
+            names = None
+        
+        self.margin_table.setHorizontalHeaderItem(0, QTableWidgetItem(header))
+        rows = list(table.rows())
+        if names is None:
+            # Meses mais recentes primeiro
+            rows.reverse()
+        
+        self.margin_table.setRowCount(len(rows))
+        for row, (key, revenue, labor, cost, margin, margin_percent) in enumerate(rows):
+            if names is None:
+                label = f"{key[5:]}/{key[:4]}" if key else "Sem data"
+            elif key == NO_ID:
+                label = "Sem funcionário"
+            else:
+                label = names.get(key, f"#{key}")
             
+            # Por peça não há mão de obra: o faturamento é só o da venda das peças
+            labor_text = "-" if group == 'part' else f"R$ {labor:.2f}"
+            values = [f"R$ {revenue:.2f}", labor_text, f"R$ {cost:.2f}", f"R$ {margin:.2f}", f"{margin_percent:.1f}%"]
+            self.margin_table.setItem(row, 0, QTableWidgetItem(label))
+            for column, value in enumerate(values, start=1):
+                item = QTableWidgetItem(value)
+                item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.margin_table.setItem(row, column, item)
+    
+    def apply_daily_totals(self, daily_totals):
+        self.daily_totals = daily_totals
+        self.apply_period()
+    
+    def period_range(self):
+        """Datas (início, fim) do período selecionado; None quando não há limite"""
+        key = self.period_combo.currentData()
+        today = date.today()
+        if key == 'week':
+            return today - timedelta(days=today.weekday()), today
+        if key == 'month':
+            return today.replace(day=1), today
+        if key == 'year':
+            return today.replace(month=1, day=1), today
+        if key == 'custom':
+            return self.start_date_edit.date().toPyDate(), self.end_date_edit.date().toPyDate()
+        return None, None
+    
+    def on_period_changed(self):
+        custom = self.period_combo.currentData() == 'custom'
+        self.start_date_edit.setEnabled(custom)
+        self.end_date_edit.setEnabled(custom)
+        self.apply_period()
+    
+    def apply_period(self):
+        """Atualiza cards e gráfico de faturamento com os totais do período selecionado
+        
+        Os totais vêm das somas acumuladas dos totais diários, sem consultar o
+        banco; enquanto eles não foram carregados, só o período completo
+        (o resumo do dashboard) é exibido.
+        """
+        start, end = self.period_range()
+        totals = None
+        if self.daily_totals is not None:
+            totals = self.daily_totals.totals(start, end)
+        elif start is None:
+            totals = self.data
+        
+        if totals is not None:
+            self.orders_card.value_label.setText(str(totals.order_count))
+            self.revenue_card.value_label.setText(f"R$ {totals.total_revenue:.2f}")
+            self.expenses_card.value_label.setText(f"R$ {totals.total_expenses:.2f}")
+            self.profit_card.value_label.setText(f"R$ {totals.profit:.2f}")
+        self.render_charts()
+    
+    def apply_data(self, data, updated_at=None):
+        """Atualiza cards e gráficos com os dados carregados (DashboardSummary)
+        
+        `updated_at` é o instante em que os dados foram calculados; quando
+        omitido, os dados acabaram de ser consultados.
+        """
+        self.updated_at = updated_at or datetime.now()
+        self.updated_label.setText(f"Atualizado em {self.updated_at.strftime('%d/%m/%Y %H:%M')}")
+        self.ttl_timer.start()
+        
+        try:
             # Atualizar cards
-            self.clients_card.value_label.setText(str(client_count))
-            self.vehicles_card.value_label.setText(str(vehicle_count))
-            self.orders_card.value_label.setText(str(order_count))
-            self.revenue_card.value_label.setText(f"R$ {total_revenue:.2f}")
-            self.expenses_card.value_label.setText(f"R$ {total_expenses:.2f}")
-            self.profit_card.value_label.setText(f"R$ {profit:.2f}")
-            
-            # Dados para gráfico de status das ordens
-            status_counts = {'em andamento': 0, 'concluído': 0, 'entregue': 0}
-            for order in orders:
-                status = order['status']
-                if status in status_counts:
-                    status_counts[status] += 1
+            self.clients_card.value_label.setText(str(data.client_count))
+            self.vehicles_card.value_label.setText(str(data.vehicle_count))
             
+            self.data = data
+            self.apply_period()
+        
+        except Exception as e:
+            logger.error(f"Erro ao exibir dados do dashboard: {str(e)}")
+    
+    def render_charts(self):
+        """Redesenha os gráficos agora, se a aba estiver visível, ou quando ela for exibida"""
+        if self.status_chart is None or self.data is None:
+            return
+        if not self.isVisible():
+            self.charts_dirty = True
+            return
+        self.charts_dirty = False
+        self.update_charts(self.data)
+    
+    def update_charts(self, data):
+        """Atualiza os gráficos com os dados carregados"""
+        try:
             # Atualizar gráfico de status
+            status_counts = data.status_counts
             status_data = list(status_counts.values())
             status_labels = list(status_counts.keys())
             self.status_chart.update_chart(status_data, status_labels, "Status das Ordens")
             
-            # Dados para gráfico de faturamento por mês
-            months = ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun']
-            revenue_data = [1200, 1800, 2200, 1900, 2500, 3000]  # Dados de exemplo
-            self.revenue_chart.update_chart(revenue_data, months, "Faturamento por Mês", "Mês", "Valor (R$)")
-            
-            # Dados para gráfico de despesas por categoria
-            expense_categories = {}
-            for expense in expenses:
-                category = expense['category']
-                if category not in expense_categories:
-                    expense_categories[category] = 0
-                expense_categories[category] += expense['value']
+            # Faturamento do período selecionado, por dia ou por mês
+            # (antes de os totais diários carregarem, a série gravada do período completo)
+            revenue_series = None
+            if self.daily_totals is not None:
+                revenue_series = self.daily_totals.series('revenue', *self.period_range())
+            elif self.snapshot_revenue is not None and self.period_range() == (None, None):
+                revenue_series = self.snapshot_revenue
+            if revenue_series is not None:
+                labels, revenue_data, unit = revenue_series
+                self.revenue_chart.update_chart(revenue_data, labels, f"Faturamento por {unit}", unit, "Valor (R$)")
             
             # Atualizar gráfico de despesas
+            expense_categories = data.expense_categories
             expense_data = list(expense_categories.values())
             expense_labels = list(expense_categories.keys())
             self.expense_chart.update_chart(expense_data, expense_labels, "Despesas por Categoria")
-            
+        
         except Exception as e:
-            print(f"Erro ao carregar dados do dashboard: {str(e)}")
+            logger.error(f"Erro ao atualizar gráficos do dashboard: {str(e)}")
+    
+    def show_load_error(self, message):
+        logger.error(f"Erro ao carregar dados do dashboard: {message}")
+        # Tentar de novo no próximo ciclo do TTL
+        self.ttl_timer.start()
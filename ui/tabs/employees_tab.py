@@ -1,11 +1,14 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
-                            QTableWidget, QTableWidgetItem, QHeaderView, 
+                            QTableView, QAbstractItemView, QHeaderView, 
                             QLineEdit, QLabel, QMessageBox, QMenu)
 from PyQt5.QtCore import Qt, pyqtSlot
 from PyQt5.QtGui import QIcon
 import logging
 from controllers.employee_controller import EmployeeController
 from ui.dialogs.employee_dialog import EmployeeDialog
+from ui.models.table_models import EmployeesTableModel
+from ui.models.search_filter import SearchFilterProxyModel, TableSearch
+from ui.change_dispatcher import get_change_dispatcher
 import config
 
 logger = logging.getLogger(config.APP_NAME)
@@ -16,6 +19,11 @@ class EmployeesTab(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.employee_controller = EmployeeController()
+        self.model = EmployeesTableModel(self.employee_controller.get_employees_page, self)
+        self.proxy = SearchFilterProxyModel(self)
+        self.proxy.setSourceModel(self.model)
+        self.loader = self.model.loader
+        get_change_dispatcher().subscribe(self.on_changes, ('employees',))
         self.setup_ui()
         self.load_employees()
     
@@ -28,6 +36,13 @@ class EmployeesTab(QWidget):
         title.setStyleSheet("font-size: 24px; font-weight: bold;")
         header_layout.addWidget(title)
         
+        # Indicador de carregamento
+        self.loading_label = QLabel("Carregando...")
+        self.loading_label.setStyleSheet("color: gray;")
+        self.loading_label.hide()
+        self.loader.loading_changed.connect(self.loading_label.setVisible)
+        header_layout.addWidget(self.loading_label)
+        
         # Botão de adicionar
         self.add_button = QPushButton("Novo Funcionário")
         self.add_button.setIcon(QIcon("resources/icons/add.png"))
@@ -41,55 +56,35 @@ class EmployeesTab(QWidget):
         search_layout.addWidget(QLabel("Buscar:"))
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Digite para filtrar por nome ou cargo...")
-        self.search_input.textChanged.connect(self.filter_employees)
         search_layout.addWidget(self.search_input)
+        self.table_search = TableSearch(self.search_input, self.model, self.proxy, self)
         layout.addLayout(search_layout)
         
         # Tabela de funcionários
-        self.table = QTableWidget()
-        self.table.setColumnCount(5)
-        self.table.setHorizontalHeaderLabels(["ID", "Nome", "CPF", "Cargo", "Data de Contratação"])
+        self.table = QTableView()
+        self.table.setModel(self.proxy)
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         self.table.setContextMenuPolicy(Qt.CustomContextMenu)
         self.table.customContextMenuRequested.connect(self.show_context_menu)
-        self.table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         layout.addWidget(self.table)
         
         self.setLayout(layout)
     
     def load_employees(self):
         """Carrega os funcionários do banco de dados para a tabela"""
-        employees = self.employee_controller.get_all_employees()
-        self.table.setRowCount(len(employees))
-        
-        for row, employee in enumerate(employees):
-            self.table.setItem(row, 0, QTableWidgetItem(str(employee['id'])))
-            self.table.setItem(row, 1, QTableWidgetItem(employee['name']))
-            self.table.setItem(row, 2, QTableWidgetItem(employee['document']))
-            self.table.setItem(row, 3, QTableWidgetItem(employee['role']))
-            self.table.setItem(row, 4, QTableWidgetItem(employee['hire_date']))
-            
-            # Armazenar o ID do funcionário como dado do item
-            self.table.item(row, 0).setData(Qt.UserRole, employee['id'])
+        self.table_search.reload()
     
-    def filter_employees(self):
-        """Filtra os funcionários com base no texto digitado"""
-        search_text = self.search_input.text().lower()
-        for row in range(self.table.rowCount()):
-            visible = False
-            for col in range(1, 4):  # Colunas de nome, CPF e cargo
-                item = self.table.item(row, col)
-                if item and search_text in item.text().lower():
-                    visible = True
-                    break
-            self.table.setRowHidden(row, not visible)
+    def on_changes(self, changes):
+        """Aplica à tabela as alterações publicadas pelos controladores"""
+        self.model.apply_changes(changes, self.employee_controller.get_employee_by_id)
     
     def show_add_dialog(self):
         """Exibe o diálogo para adicionar um novo funcionário"""
         dialog = EmployeeDialog(self)
         if dialog.exec_():
-            self.load_employees()
+            self.model.upsert_row(dialog.saved_employee)
     
     def show_edit_dialog(self, employee_id):
         """Exibe o diálogo para editar um funcionário existente"""
@@ -97,7 +92,7 @@ class EmployeesTab(QWidget):
         if employee:
             dialog = EmployeeDialog(self, employee)
             if dialog.exec_():
-                self.load_employees()
+                self.model.upsert_row(dialog.saved_employee)
         else:
             QMessageBox.warning(self, "Erro", "Funcionário não encontrado.")
     
@@ -113,7 +108,7 @@ class EmployeesTab(QWidget):
             success = self.employee_controller.delete_employee(employee_id)
             if success:
                 QMessageBox.information(self, "Sucesso", "Funcionário excluído com sucesso!")
-                self.load_employees()
+                self.model.remove_row(employee_id)
             else:
                 QMessageBox.critical(
                     self, "Erro", 
@@ -122,13 +117,12 @@ class EmployeesTab(QWidget):
     
     def show_context_menu(self, position):
         """Exibe o menu de contexto ao clicar com o botão direito na tabela"""
-        indexes = self.table.selectedIndexes()
+        indexes = self.table.selectionModel().selectedRows()
         if not indexes:
             return
         
         # Obter o ID do funcionário selecionado
-        row = indexes[0].row()
-        employee_id = self.table.item(row, 0).data(Qt.UserRole)
+        employee_id = indexes[0].data(Qt.UserRole)
         
         # Criar menu
         menu = QMenu()
@@ -1,11 +1,14 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
-                            QTableWidget, QTableWidgetItem, QHeaderView, 
+                            QTableView, QAbstractItemView, QHeaderView, 
                             QLineEdit, QLabel, QMessageBox, QMenu)
 from PyQt5.QtCore import Qt, pyqtSlot
 from PyQt5.QtGui import QIcon
 import logging
 from controllers.expense_controller import ExpenseController
 from ui.dialogs.expense_dialog import ExpenseDialog
+from ui.models.table_models import ExpensesTableModel
+from ui.models.search_filter import SearchFilterProxyModel, TableSearch
+from ui.change_dispatcher import get_change_dispatcher
 import config
 
 logger = logging.getLogger(config.APP_NAME)
@@ -16,6 +19,11 @@ class ExpensesTab(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.expense_controller = ExpenseController()
+        self.model = ExpensesTableModel(self.expense_controller.get_expenses_page, self)
+        self.proxy = SearchFilterProxyModel(self)
+        self.proxy.setSourceModel(self.model)
+        self.loader = self.model.loader
+        get_change_dispatcher().subscribe(self.on_changes, ('expenses',))
         self.setup_ui()
         self.load_expenses()
     
@@ -28,6 +36,13 @@ class ExpensesTab(QWidget):
         title.setStyleSheet("font-size: 24px; font-weight: bold;")
         header_layout.addWidget(title)
         
+        # Indicador de carregamento
+        self.loading_label = QLabel("Carregando...")
+        self.loading_label.setStyleSheet("color: gray;")
+        self.loading_label.hide()
+        self.loader.loading_changed.connect(self.loading_label.setVisible)
+        header_layout.addWidget(self.loading_label)
+        
         # Botão de adicionar
         self.add_button = QPushButton("Novo Gasto")
         self.add_button.setIcon(QIcon("resources/icons/add.png"))
@@ -41,56 +56,35 @@ class ExpensesTab(QWidget):
         search_layout.addWidget(QLabel("Buscar:"))
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Digite para filtrar por descrição ou categoria...")
-        self.search_input.textChanged.connect(self.filter_expenses)
         search_layout.addWidget(self.search_input)
+        self.table_search = TableSearch(self.search_input, self.model, self.proxy, self)
         layout.addLayout(search_layout)
         
         # Tabela de gastos
-        self.table = QTableWidget()
-        self.table.setColumnCount(6)
-        self.table.setHorizontalHeaderLabels(["ID", "Data", "Descrição", "Valor", "Categoria", "Forma de Pagamento"])
+        self.table = QTableView()
+        self.table.setModel(self.proxy)
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         self.table.setContextMenuPolicy(Qt.CustomContextMenu)
         self.table.customContextMenuRequested.connect(self.show_context_menu)
-        self.table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         layout.addWidget(self.table)
         
         self.setLayout(layout)
     
     def load_expenses(self):
         """Carrega os gastos do banco de dados para a tabela"""
-        expenses = self.expense_controller.get_all_expenses()
-        self.table.setRowCount(len(expenses))
-        
-        for row, expense in enumerate(expenses):
-            self.table.setItem(row, 0, QTableWidgetItem(str(expense['id'])))
-            self.table.setItem(row, 1, QTableWidgetItem(expense['date']))
-            self.table.setItem(row, 2, QTableWidgetItem(expense['description']))
-            self.table.setItem(row, 3, QTableWidgetItem(f"R$ {expense['value']:.2f}"))
-            self.table.setItem(row, 4, QTableWidgetItem(expense['category']))
-            self.table.setItem(row, 5, QTableWidgetItem(expense['payment_method']))
-            
-            # Armazenar o ID do gasto como dado do item
-            self.table.item(row, 0).setData(Qt.UserRole, expense['id'])
+        self.table_search.reload()
     
-    def filter_expenses(self):
-        """Filtra os gastos com base no texto digitado"""
-        search_text = self.search_input.text().lower()
-        for row in range(self.table.rowCount()):
-            visible = False
-            for col in range(1, 5):  # Colunas de data, descrição, valor e categoria
-                item = self.table.item(row, col)
-                if item and search_text in item.text().lower():
-                    visible = True
-                    break
-            self.table.setRowHidden(row, not visible)
+    def on_changes(self, changes):
+        """Aplica à tabela as alterações publicadas pelos controladores"""
+        self.model.apply_changes(changes, self.expense_controller.get_expense_by_id)
     
     def show_add_dialog(self):
         """Exibe o diálogo para adicionar um novo gasto"""
         dialog = ExpenseDialog(self)
         if dialog.exec_():
-            self.load_expenses()
+            self.model.upsert_row(dialog.saved_expense)
     
     def show_edit_dialog(self, expense_id):
         """Exibe o diálogo para editar um gasto existente"""
@@ -98,7 +92,7 @@ class ExpensesTab(QWidget):
         if expense:
             dialog = ExpenseDialog(self, expense)
             if dialog.exec_():
-                self.load_expenses()
+                self.model.upsert_row(dialog.saved_expense)
         else:
             QMessageBox.warning(self, "Erro", "Gasto não encontrado.")
     
@@ -114,19 +108,18 @@ class ExpensesTab(QWidget):
             success = self.expense_controller.delete_expense(expense_id)
             if success:
                 QMessageBox.information(self, "Sucesso", "Gasto excluído com sucesso!")
-                self.load_expenses()
+                self.model.remove_row(expense_id)
             else:
                 QMessageBox.critical(self, "Erro", "Não foi possível excluir o gasto.")
     
     def show_context_menu(self, position):
         """Exibe o menu de contexto ao clicar com o botão direito na tabela"""
-        indexes = self.table.selectedIndexes()
+        indexes = self.table.selectionModel().selectedRows()
         if not indexes:
             return
         
         # Obter o ID do gasto selecionado
-        row = indexes[0].row()
-        expense_id = self.table.item(row, 0).data(Qt.UserRole)
+        expense_id = indexes[0].data(Qt.UserRole)
         
         # Criar menu
         menu = QMenu()
@@ -1,11 +1,14 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
-                            QTableWidget, QTableWidgetItem, QHeaderView, 
+                            QTableView, QAbstractItemView, QHeaderView, 
                             QLineEdit, QLabel, QMessageBox, QMenu)
 from PyQt5.QtCore import Qt, pyqtSlot
 from PyQt5.QtGui import QIcon
 import logging
 from controllers.part_controller import PartController
 from ui.dialogs.part_dialog import PartDialog
+from ui.models.table_models import PartsTableModel
+from ui.models.search_filter import SearchFilterProxyModel, TableSearch
+from ui.change_dispatcher import get_change_dispatcher
 import config
 
 logger = logging.getLogger(config.APP_NAME)
@@ -16,6 +19,11 @@ class PartsTab(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.part_controller = PartController()
+        self.model = PartsTableModel(self.part_controller.get_parts_page, self)
+        self.proxy = SearchFilterProxyModel(self)
+        self.proxy.setSourceModel(self.model)
+        self.loader = self.model.loader
+        get_change_dispatcher().subscribe(self.on_changes, ('parts',))
         self.setup_ui()
         self.load_parts()
     
@@ -28,6 +36,13 @@ class PartsTab(QWidget):
         title.setStyleSheet("font-size: 24px; font-weight: bold;")
         header_layout.addWidget(title)
         
+        # Indicador de carregamento
+        self.loading_label = QLabel("Carregando...")
+        self.loading_label.setStyleSheet("color: gray;")
+        self.loading_label.hide()
+        self.loader.loading_changed.connect(self.loading_label.setVisible)
+        header_layout.addWidget(self.loading_label)
+        
         # Botão de adicionar
         self.add_button = QPushButton("Nova Peça")
         self.add_button.setIcon(QIcon("resources/icons/add.png"))
@@ -41,61 +56,35 @@ class PartsTab(QWidget):
         search_layout.addWidget(QLabel("Buscar:"))
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Digite para filtrar por código ou descrição...")
-        self.search_input.textChanged.connect(self.filter_parts)
         search_layout.addWidget(self.search_input)
+        self.table_search = TableSearch(self.search_input, self.model, self.proxy, self)
         layout.addLayout(search_layout)
         
         # Tabela de peças
-        self.table = QTableWidget()
-        self.table.setColumnCount(6)
-        self.table.setHorizontalHeaderLabels(["ID", "Código", "Descrição", "Estoque", "Preço de Compra", "Preço de Venda"])
+        self.table = QTableView()
+        self.table.setModel(self.proxy)
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         self.table.setContextMenuPolicy(Qt.CustomContextMenu)
         self.table.customContextMenuRequested.connect(self.show_context_menu)
-        self.table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         layout.addWidget(self.table)
         
         self.setLayout(layout)
     
     def load_parts(self):
         """Carrega as peças do banco de dados para a tabela"""
-        parts = self.part_controller.get_all_parts()
-        self.table.setRowCount(len(parts))
-        
-        for row, part in enumerate(parts):
-            self.table.setItem(row, 0, QTableWidgetItem(str(part['id'])))
-            self.table.setItem(row, 1, QTableWidgetItem(part['code']))
-            self.table.setItem(row, 2, QTableWidgetItem(part['description']))
-            self.table.setItem(row, 3, QTableWidgetItem(str(part['stock_quantity'])))
-            self.table.setItem(row, 4, QTableWidgetItem(f"R$ {part['buy_price']:.2f}"))
-            self.table.setItem(row, 5, QTableWidgetItem(f"R$ {part['sell_price']:.2f}"))
-            
-            # Armazenar o ID da peça como dado do item
-            self.table.item(row, 0).setData(Qt.UserRole, part['id'])
-            
-            # Colorir a linha se o estoque estiver baixo
-            if part['stock_quantity'] <= 5:
-                for col in range(6):
-                    self.table.item(row, col).setBackground(Qt.red)
+        self.table_search.reload()
     
-    def filter_parts(self):
-        """Filtra as peças com base no texto digitado"""
-        search_text = self.search_input.text().lower()
-        for row in range(self.table.rowCount()):
-            visible = False
-            for col in range(1, 3):  # Colunas de código e descrição
-                item = self.table.item(row, col)
-                if item and search_text in item.text().lower():
-                    visible = True
-                    break
-            self.table.setRowHidden(row, not visible)
+    def on_changes(self, changes):
+        """Aplica à tabela as alterações publicadas pelos controladores"""
+        self.model.apply_changes(changes, self.part_controller.get_part_by_id)
     
     def show_add_dialog(self):
         """Exibe o diálogo para adicionar uma nova peça"""
         dialog = PartDialog(self)
         if dialog.exec_():
-            self.load_parts()
+            self.model.upsert_row(dialog.saved_part)
     
     def show_edit_dialog(self, part_id):
         """Exibe o diálogo para editar uma peça existente"""
@@ -103,7 +92,7 @@ class PartsTab(QWidget):
         if part:
             dialog = PartDialog(self, part)
             if dialog.exec_():
-                self.load_parts()
+                self.model.upsert_row(dialog.saved_part)
         else:
             QMessageBox.warning(self, "Erro", "Peça não encontrada.")
     
@@ -119,7 +108,7 @@ class PartsTab(QWidget):
             success = self.part_controller.delete_part(part_id)
             if success:
                 QMessageBox.information(self, "Sucesso", "Peça excluída com sucesso!")
-                self.load_parts()
+                self.model.remove_row(part_id)
             else:
                 QMessageBox.critical(
                     self, "Erro", 
@@ -128,13 +117,12 @@ class PartsTab(QWidget):
     
     def show_context_menu(self, position):
         """Exibe o menu de contexto ao clicar com o botão direito na tabela"""
-        indexes = self.table.selectedIndexes()
+        indexes = self.table.selectionModel().selectedRows()
         if not indexes:
             return
         
         # Obter o ID da peça selecionada
-        row = indexes[0].row()
-        part_id = self.table.item(row, 0).data(Qt.UserRole)
+        part_id = indexes[0].data(Qt.UserRole)
         
         # Criar menu
         menu = QMenu()
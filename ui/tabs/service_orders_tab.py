@@ -1,5 +1,5 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
-                            QTableWidget, QTableWidgetItem, QHeaderView, 
+                            QTableView, QAbstractItemView, QHeaderView, 
                             QLineEdit, QLabel, QMessageBox, QMenu)
 from PyQt5.QtCore import Qt, pyqtSlot
 from PyQt5.QtGui import QIcon
@@ -7,6 +7,10 @@ import logging
 from controllers.service_order_controller import ServiceOrderController
 from ui.dialogs.service_order_dialog import ServiceOrderDialog
 from ui.dialogs.print_dialog import PrintDialog
+from ui.models.table_models import ServiceOrdersTableModel
+from ui.models.search_filter import SearchFilterProxyModel, TableSearch
+from ui.change_dispatcher import get_change_dispatcher
+from services.change_bus import INSERT
 import config
 
 logger = logging.getLogger(config.APP_NAME)
@@ -17,6 +21,11 @@ class ServiceOrdersTab(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.service_order_controller = ServiceOrderController()
+        self.model = ServiceOrdersTableModel(self.service_order_controller.get_orders_page, self)
+        self.proxy = SearchFilterProxyModel(self)
+        self.proxy.setSourceModel(self.model)
+        self.loader = self.model.loader
+        get_change_dispatcher().subscribe(self.on_changes, ('service_orders', 'vehicles', 'clients', 'employees'))
         self.setup_ui()
         self.load_orders()
     
@@ -29,6 +38,13 @@ class ServiceOrdersTab(QWidget):
         title.setStyleSheet("font-size: 24px; font-weight: bold;")
         header_layout.addWidget(title)
         
+        # Indicador de carregamento
+        self.loading_label = QLabel("Carregando...")
+        self.loading_label.setStyleSheet("color: gray;")
+        self.loading_label.hide()
+        self.loader.loading_changed.connect(self.loading_label.setVisible)
+        header_layout.addWidget(self.loading_label)
+        
         # Botão de adicionar
         self.add_button = QPushButton("Nova Ordem")
         self.add_button.setIcon(QIcon("resources/icons/add.png"))
@@ -42,68 +58,40 @@ class ServiceOrdersTab(QWidget):
         search_layout.addWidget(QLabel("Buscar:"))
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Digite para filtrar por número, veículo ou cliente...")
-        self.search_input.textChanged.connect(self.filter_orders)
         search_layout.addWidget(self.search_input)
+        self.table_search = TableSearch(self.search_input, self.model, self.proxy, self)
         layout.addLayout(search_layout)
         
         # Tabela de ordens
-        self.table = QTableWidget()
-        self.table.setColumnCount(7)
-        self.table.setHorizontalHeaderLabels(["ID", "Número", "Data", "Veículo", "Cliente", "Status", "Valor Total"])
+        self.table = QTableView()
+        self.table.setModel(self.proxy)
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         self.table.setContextMenuPolicy(Qt.CustomContextMenu)
         self.table.customContextMenuRequested.connect(self.show_context_menu)
-        self.table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         layout.addWidget(self.table)
         
         self.setLayout(layout)
     
     def load_orders(self):
         """Carrega as ordens de serviço do banco de dados para a tabela"""
-        orders = self.service_order_controller.get_all_orders()
-        self.table.setRowCount(len(orders))
-        
-        for row, order in enumerate(orders):
-            self.table.setItem(row, 0, QTableWidgetItem(str(order['id'])))
-            self.table.setItem(row, 1, QTableWidgetItem(order['number']))
-            self.table.setItem(row, 2, QTableWidgetItem(order['open_date'].split()[0]))
-            self.table.setItem(row, 3, QTableWidgetItem(order.get('vehicle_plate', 'N/A')))
-            self.table.setItem(row, 4, QTableWidgetItem(order.get('client_name', 'N/A')))
-            self.table.setItem(row, 5, QTableWidgetItem(order['status']))
-            self.table.setItem(row, 6, QTableWidgetItem(f"R$ {order['total_value']:.2f}"))
-            
-            # Armazenar o ID da ordem como dado do item
-            self.table.item(row, 0).setData(Qt.UserRole, order['id'])
-            
-            # Colorir a linha de acordo com o status
-            if order['status'] == 'em andamento':
-                for col in range(7):
-                    self.table.item(row, col).setBackground(Qt.yellow)
-            elif order['status'] == 'concluído':
-                for col in range(7):
-                    self.table.item(row, col).setBackground(Qt.cyan)
-            elif order['status'] == 'entregue':
-                for col in range(7):
-                    self.table.item(row, col).setBackground(Qt.green)
+        self.table_search.reload()
     
-    def filter_orders(self):
-        """Filtra as ordens com base no texto digitado"""
-        search_text = self.search_input.text().lower()
-        for row in range(self.table.rowCount()):
-            visible = False
-            for col in range(1, 5):  # Colunas de número, data, veículo e cliente
-                item = self.table.item(row, col)
-                if item and search_text in item.text().lower():
-                    visible = True
-                    break
-            self.table.setRowHidden(row, not visible)
+    def on_changes(self, changes):
+        """Aplica à tabela as alterações publicadas pelos controladores"""
+        own = [change for change in changes if change.entity == 'service_orders']
+        if any(change.entity != 'service_orders' and change.operation != INSERT for change in changes):
+            # Placa, cliente e funcionário aparecem nas linhas: recarregar a listagem
+            self.load_orders()
+        elif own:
+            self.model.apply_changes(own, self.service_order_controller.get_order_row)
     
     def show_add_dialog(self):
         """Exibe o diálogo para adicionar uma nova ordem de serviço"""
         dialog = ServiceOrderDialog(self)
         if dialog.exec_():
-            self.load_orders()
+            self.model.upsert_row(dialog.saved_order)
     
     def show_edit_dialog(self, order_id):
         """Exibe o diálogo para editar uma ordem de serviço existente"""
@@ -111,7 +99,7 @@ class ServiceOrdersTab(QWidget):
         if order:
             dialog = ServiceOrderDialog(self, order)
             if dialog.exec_():
-                self.load_orders()
+                self.model.upsert_row(dialog.saved_order)
         else:
             QMessageBox.warning(self, "Erro", "Ordem de serviço não encontrada.")
     
@@ -132,19 +120,18 @@ class ServiceOrdersTab(QWidget):
             success = self.service_order_controller.delete_order(order_id)
             if success:
                 QMessageBox.information(self, "Sucesso", "Ordem de serviço excluída com sucesso!")
-                self.load_orders()
+                self.model.remove_row(order_id)
             else:
                 QMessageBox.critical(self, "Erro", "Não foi possível excluir a ordem de serviço.")
     
     def show_context_menu(self, position):
         """Exibe o menu de contexto ao clicar com o botão direito na tabela"""
-        indexes = self.table.selectedIndexes()
+        indexes = self.table.selectionModel().selectedRows()
         if not indexes:
             return
         
         # Obter o ID da ordem selecionada
-        row = indexes[0].row()
-        order_id = self.table.item(row, 0).data(Qt.UserRole)
+        order_id = indexes[0].data(Qt.UserRole)
         
         # Criar menu
         menu = QMenu()
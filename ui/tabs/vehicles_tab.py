@@ -1,11 +1,15 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
-                            QTableWidget, QTableWidgetItem, QHeaderView, 
+                            QTableView, QAbstractItemView, QHeaderView, 
                             QLineEdit, QLabel, QMessageBox, QMenu)
 from PyQt5.QtCore import Qt, pyqtSlot
 from PyQt5.QtGui import QIcon
 import logging
 from controllers.vehicle_controller import VehicleController
 from ui.dialogs.vehicle_dialog import VehicleDialog
+from ui.models.table_models import VehiclesTableModel
+from ui.models.search_filter import SearchFilterProxyModel, TableSearch
+from ui.change_dispatcher import get_change_dispatcher
+from services.change_bus import INSERT
 import config
 
 logger = logging.getLogger(config.APP_NAME)
@@ -16,6 +20,11 @@ class VehiclesTab(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.vehicle_controller = VehicleController()
+        self.model = VehiclesTableModel(self.vehicle_controller.get_vehicles_page, self)
+        self.proxy = SearchFilterProxyModel(self)
+        self.proxy.setSourceModel(self.model)
+        self.loader = self.model.loader
+        get_change_dispatcher().subscribe(self.on_changes, ('vehicles', 'clients'))
         self.setup_ui()
         self.load_vehicles()
     
@@ -28,6 +37,13 @@ class VehiclesTab(QWidget):
         title.setStyleSheet("font-size: 24px; font-weight: bold;")
         header_layout.addWidget(title)
         
+        # Indicador de carregamento
+        self.loading_label = QLabel("Carregando...")
+        self.loading_label.setStyleSheet("color: gray;")
+        self.loading_label.hide()
+        self.loader.loading_changed.connect(self.loading_label.setVisible)
+        header_layout.addWidget(self.loading_label)
+        
         # Botão de adicionar
         self.add_button = QPushButton("Novo Veículo")
         self.add_button.setIcon(QIcon("resources/icons/add.png"))
@@ -41,57 +57,40 @@ class VehiclesTab(QWidget):
         search_layout.addWidget(QLabel("Buscar:"))
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Digite para filtrar por placa, marca ou modelo...")
-        self.search_input.textChanged.connect(self.filter_vehicles)
         search_layout.addWidget(self.search_input)
+        self.table_search = TableSearch(self.search_input, self.model, self.proxy, self)
         layout.addLayout(search_layout)
         
         # Tabela de veículos
-        self.table = QTableWidget()
-        self.table.setColumnCount(7)
-        self.table.setHorizontalHeaderLabels(["ID", "Placa", "Marca", "Modelo", "Ano", "Cor", "Cliente"])
+        self.table = QTableView()
+        self.table.setModel(self.proxy)
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         self.table.setContextMenuPolicy(Qt.CustomContextMenu)
         self.table.customContextMenuRequested.connect(self.show_context_menu)
-        self.table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         layout.addWidget(self.table)
         
         self.setLayout(layout)
     
     def load_vehicles(self):
         """Carrega os veículos do banco de dados para a tabela"""
-        vehicles = self.vehicle_controller.get_all_vehicles()
-        self.table.setRowCount(len(vehicles))
-        
-        for row, vehicle in enumerate(vehicles):
-            self.table.setItem(row, 0, QTableWidgetItem(str(vehicle['id'])))
-            self.table.setItem(row, 1, QTableWidgetItem(vehicle['plate']))
-            self.table.setItem(row, 2, QTableWidgetItem(vehicle['brand']))
-            self.table.setItem(row, 3, QTableWidgetItem(vehicle['model']))
-            self.table.setItem(row, 4, QTableWidgetItem(str(vehicle['year'])))
-            self.table.setItem(row, 5, QTableWidgetItem(vehicle['color']))
-            self.table.setItem(row, 6, QTableWidgetItem(vehicle.get('client_name', 'N/A')))
-            
-            # Armazenar o ID do veículo como dado do item
-            self.table.item(row, 0).setData(Qt.UserRole, vehicle['id'])
+        self.table_search.reload()
     
-    def filter_vehicles(self):
-        """Filtra os veículos com base no texto digitado"""
-        search_text = self.search_input.text().lower()
-        for row in range(self.table.rowCount()):
-            visible = False
-            for col in range(1, 7):  # Colunas de placa, marca, modelo, ano, cor e cliente
-                item = self.table.item(row, col)
-                if item and search_text in item.text().lower():
-                    visible = True
-                    break
-            self.table.setRowHidden(row, not visible)
+    def on_changes(self, changes):
+        """Aplica à tabela as alterações publicadas pelos controladores"""
+        own = [change for change in changes if change.entity == 'vehicles']
+        if any(change.entity != 'vehicles' and change.operation != INSERT for change in changes):
+            # O nome do cliente aparece nas linhas: recarregar a listagem
+            self.load_vehicles()
+        elif own:
+            self.model.apply_changes(own, self.vehicle_controller.get_vehicle_by_id)
     
     def show_add_dialog(self):
         """Exibe o diálogo para adicionar um novo veículo"""
         dialog = VehicleDialog(self)
         if dialog.exec_():
-            self.load_vehicles()
+            self.model.upsert_row(dialog.saved_vehicle)
     
     def show_edit_dialog(self, vehicle_id):
         """Exibe o diálogo para editar um veículo existente"""
@@ -99,7 +98,7 @@ class VehiclesTab(QWidget):
         if vehicle:
             dialog = VehicleDialog(self, vehicle)
             if dialog.exec_():
-                self.load_vehicles()
+                self.model.upsert_row(dialog.saved_vehicle)
         else:
             QMessageBox.warning(self, "Erro", "Veículo não encontrado.")
     
@@ -115,7 +114,7 @@ class VehiclesTab(QWidget):
             success = self.vehicle_controller.delete_vehicle(vehicle_id)
             if success:
                 QMessageBox.information(self, "Sucesso", "Veículo excluído com sucesso!")
-                self.load_vehicles()
+                self.model.remove_row(vehicle_id)
             else:
                 QMessageBox.critical(
                     self, "Erro", 
@@ -124,13 +123,12 @@ class VehiclesTab(QWidget):
     
     def show_context_menu(self, position):
         """Exibe o menu de contexto ao clicar com o botão direito na tabela"""
-        indexes = self.table.selectedIndexes()
+        indexes = self.table.selectionModel().selectedRows()
         if not indexes:
             return
         
         # Obter o ID do veículo selecionado
-        row = indexes[0].row()
-        vehicle_id = self.table.item(row, 0).data(Qt.UserRole)
+        vehicle_id = indexes[0].data(Qt.UserRole)
         
         # Criar menu
         menu = QMenu()
@@ -0,0 +1,46 @@
+"""
+Escolha da implementação dos gráficos do dashboard.
+
+Todo backend é um módulo que define PieChartWidget, BarChartWidget e
+LineChartWidget (QWidget) com os mesmos métodos:
+
+    PieChartWidget.update_chart(data, labels, title)
+    BarChartWidget.update_chart(data, categories, title, x_label, y_label)
+    LineChartWidget.update_chart(data, categories, title, x_label, y_label)
+
+O backend é definido por config.CHART_BACKEND. O padrão, "painter", desenha
+com QPainter e não depende de nenhum pacote além do PyQt5 (o NumPy só é usado
+para reduzir séries maiores que o gráfico, ver ui/widgets/downsample.py);
+"qtchart" usa o PyQt5.QtChart e "matplotlib" é opcional. Se o backend configurado não puder
+ser importado, os gráficos usam o "painter".
+"""
+
+import importlib
+import logging
+import config
+
+logger = logging.getLogger(config.APP_NAME)
+
+CHART_BACKENDS = {
+    'painter': 'ui.widgets.painter_chart',
+    'qtchart': 'ui.widgets.chart_widget',
+    'matplotlib': 'ui.widgets.matplotlib_chart',
+}
+DEFAULT_CHART_BACKEND = 'painter'
+
+
+def load_chart_backend(name=None):
+    """Importa e retorna o módulo do backend de gráficos configurado"""
+    name = name or config.CHART_BACKEND
+    module_name = CHART_BACKENDS.get(name)
+    if module_name is None:
+        logger.warning(f"Backend de gráficos desconhecido: {name}; usando {DEFAULT_CHART_BACKEND}")
+        module_name = CHART_BACKENDS[DEFAULT_CHART_BACKEND]
+
+    try:
+        return importlib.import_module(module_name)
+    except ImportError as e:
+        if module_name == CHART_BACKENDS[DEFAULT_CHART_BACKEND]:
+            raise
+        logger.warning(f"Backend de gráficos {name} indisponível ({str(e)}); usando {DEFAULT_CHART_BACKEND}")
+        return importlib.import_module(CHART_BACKENDS[DEFAULT_CHART_BACKEND])
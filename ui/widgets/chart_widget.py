@@ -1,18 +1,26 @@
 from PyQt5.QtWidgets import QWidget, QVBoxLayout
-from PyQt5.QtChart import QChart, QChartView, QPieSeries, QBarSeries, QBarSet, QBarCategoryAxis, QValueAxis
-from PyQt5.QtCore import Qt
+from PyQt5.QtChart import (QChart, QChartView, QPieSeries, QBarSeries, QBarSet, QBarCategoryAxis,
+                           QValueAxis, QLineSeries)
+from PyQt5.QtCore import Qt, QPointF, QTimer
 from PyQt5.QtGui import QPainter, QColor
 import logging
 import config
+from ui.widgets.downsample import fit_to_width
 
 logger = logging.getLogger(config.APP_NAME)
 
+# Os gráficos criam a série e os eixos uma única vez e, a cada atualização,
+# apenas trocam os valores dos itens existentes (fatias, barras e pontos).
+# Atualizações com os mesmos dados da anterior não redesenham nada. Séries
+# maiores que a largura do gráfico são reduzidas (LTTB) antes de exibidas.
+
 class PieChartWidget(QWidget):
     """Widget para exibir gráficos de pizza"""
     
     def __init__(self, parent=None, title="Gráfico de Pizza"):
         super().__init__(parent)
         self.title = title
+        self.last_update = None
         self.setup_ui()
     
     def setup_ui(self):
@@ -25,6 +33,9 @@ class PieChartWidget(QWidget):
         self.chart.legend().setVisible(True)
         self.chart.legend().setAlignment(Qt.AlignBottom)
         
+        self.series = QPieSeries()
+        self.chart.addSeries(self.series)
+        
         # Criar visualização do gráfico
         self.chart_view = QChartView(self.chart)
         self.chart_view.setRenderHint(QPainter.Antialiasing)
@@ -40,25 +51,74 @@ class PieChartWidget(QWidget):
             labels: Lista de rótulos
             title: Título do gráfico
         """
-        self.title = title
-        self.chart.setTitle(self.title)
+        update = (tuple(data), tuple(labels), title)
+        if update == self.last_update:
+            return
+        self.last_update = update
         
-        series = QPieSeries()
-        for label, value in zip(labels, data):
-            series.append(label, value)
+        if title != self.title:
+            self.title = title
+            self.chart.setTitle(self.title)
         
-        self.chart.removeAllSeries()
-        self.chart.addSeries(series)
-        self.chart.createDefaultAxes()
+        # Reaproveitar as fatias existentes; criar ou remover só a diferença
+        slices = self.series.slices()
+        for pie_slice in slices[len(data):]:
+            self.series.remove(pie_slice)
+        for index, (label, value) in enumerate(zip(labels, data)):
+            if index < len(slices):
+                slices[index].setLabel(label)
+                slices[index].setValue(value)
+            else:
+                self.series.append(label, value)
 
-class BarChartWidget(QWidget):
-    """Widget para exibir gráficos de barras"""
+class DownsampledChartWidget(QWidget):
+    """Base dos gráficos que reduzem a série à largura disponível"""
     
-    def __init__(self, parent=None, title="Gráfico de Barras"):
+    # Largura mínima de cada ponto (ou barra), em pixels
+    pixels_per_point = 1
+    
+    def __init__(self, parent=None, title=""):
         super().__init__(parent)
         self.title = title
+        self.last_update = None
+        self.data = []
+        self.categories = []
+        self.shown_indices = None
+        
+        # Refazer a redução ao redimensionar, no máximo a cada CHART_RESIZE_THROTTLE_MS
+        self.resize_timer = QTimer(self)
+        self.resize_timer.setSingleShot(True)
+        self.resize_timer.setInterval(config.CHART_RESIZE_THROTTLE_MS)
+        self.resize_timer.timeout.connect(self.apply_series)
+        
         self.setup_ui()
     
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if self.data and not self.resize_timer.isActive():
+            self.resize_timer.start()
+    
+    def apply_series(self):
+        """Exibe a série reduzida à largura atual, se os pontos exibidos mudarem"""
+        width = self.chart.plotArea().width() or self.chart_view.width()
+        indices = fit_to_width(self.data, width, self.pixels_per_point)
+        if indices == self.shown_indices:
+            return
+        self.shown_indices = indices
+        self.show_points(indices)
+    
+    def show_points(self, indices):
+        raise NotImplementedError
+
+class BarChartWidget(DownsampledChartWidget):
+    """Widget para exibir gráficos de barras"""
+    
+    pixels_per_point = 4
+    
+    def __init__(self, parent=None, title="Gráfico de Barras"):
+        super().__init__(parent, title)
+        self.shown_categories = None
+    
     def setup_ui(self):
         layout = QVBoxLayout()
         
@@ -66,6 +126,20 @@ class BarChartWidget(QWidget):
         self.chart = QChart()
         self.chart.setTitle(self.title)
         
+        self.series = QBarSeries()
+        self.bar_set = QBarSet("Valor")
+        self.series.append(self.bar_set)
+        self.chart.addSeries(self.series)
+        
+        self.axis_x = QBarCategoryAxis()
+        self.chart.addAxis(self.axis_x, Qt.AlignBottom)
+        self.series.attachAxis(self.axis_x)
+        
+        self.axis_y = QValueAxis()
+        self.axis_y.setLabelFormat('%i')
+        self.chart.addAxis(self.axis_y, Qt.AlignLeft)
+        self.series.attachAxis(self.axis_y)
+        
         # Criar visualização do gráfico
         self.chart_view = QChartView(self.chart)
         self.chart_view.setRenderHint(QPainter.Antialiasing)
@@ -83,32 +157,44 @@ class BarChartWidget(QWidget):
             x_label: Rótulo do eixo X
             y_label: Rótulo do eixo Y
         """
-        self.title = title
-        self.chart.setTitle(self.title)
+        update = (tuple(data), tuple(categories), title)
+        if update == self.last_update:
+            return
+        self.last_update = update
         
-        series = QBarSeries()
-        bar_set = QBarSet("Valor")
-        bar_set.append(data)
-        series.append(bar_set)
+        if title != self.title:
+            self.title = title
+            self.chart.setTitle(self.title)
         
-        self.chart.removeAllSeries()
-        self.chart.addSeries(series)
+        self.data = list(data)
+        self.categories = list(categories)
+        self.shown_indices = None
+        self.apply_series()
         
-        axis_x = QBarCategoryAxis()
-        axis_x.append(categories)
-        self.chart.setAxisX(axis_x, series)
+        self.axis_y.setRange(0, max(data, default=0) or 1)
+        self.axis_y.applyNiceNumbers()
+    
+    def show_points(self, indices):
+        # Alterar a altura das barras existentes; criar ou remover só a diferença
+        count = self.bar_set.count()
+        if count > len(indices):
+            self.bar_set.remove(len(indices), count - len(indices))
+        for position, index in enumerate(indices):
+            if position < count:
+                self.bar_set.replace(position, self.data[index])
+            else:
+                self.bar_set.append(self.data[index])
         
-        axis_y = QValueAxis()
-        axis_y.setLabelFormat('%i')
-        self.chart.setAxisY(axis_y, series)
+        categories = [self.categories[index] for index in indices]
+        if categories != self.shown_categories:
+            self.shown_categories = categories
+            self.axis_x.setCategories(categories)
 
-class LineChartWidget(QWidget):
+class LineChartWidget(DownsampledChartWidget):
     """Widget para exibir gráficos de linha"""
     
     def __init__(self, parent=None, title="Gráfico de Linha"):
-        super().__init__(parent)
-        self.title = title
-        self.setup_ui()
+        super().__init__(parent, title)
     
     def setup_ui(self):
         layout = QVBoxLayout()
@@ -118,6 +204,19 @@ class LineChartWidget(QWidget):
         self.chart.setTitle(self.title)
         self.chart.setAnimationOptions(QChart.SeriesAnimations)
         
+        self.series = QLineSeries()
+        self.chart.addSeries(self.series)
+        
+        self.axis_x = QValueAxis()
+        self.axis_x.setLabelFormat('%d')
+        self.chart.addAxis(self.axis_x, Qt.AlignBottom)
+        self.series.attachAxis(self.axis_x)
+        
+        self.axis_y = QValueAxis()
+        self.axis_y.setLabelFormat('%i')
+        self.chart.addAxis(self.axis_y, Qt.AlignLeft)
+        self.series.attachAxis(self.axis_y)
+        
         # Criar visualização do gráfico
         self.chart_view = QChartView(self.chart)
         self.chart_view.setRenderHint(QPainter.Antialiasing)
@@ -135,23 +234,28 @@ class LineChartWidget(QWidget):
             x_label: Rótulo do eixo X
             y_label: Rótulo do eixo Y
         """
-        self.title = title
-        self.chart.setTitle(self.title)
+        update = (tuple(data), tuple(categories), title, x_label, y_label)
+        if update == self.last_update:
+            return
+        self.last_update = update
         
-        series = QLineSeries()
-        for category, value in zip(categories, data):
-            series.append(categories.index(category), value)
+        if title != self.title:
+            self.title = title
+            self.chart.setTitle(self.title)
+        self.axis_x.setTitleText(x_label)
+        self.axis_y.setTitleText(y_label)
         
-        self.chart.removeAllSeries()
-        self.chart.addSeries(series)
+        self.data = list(data)
+        self.categories = list(categories)
+        self.shown_indices = None
+        self.apply_series()
         
-        axis_x = QValueAxis()
-        axis_x.setTitleText(x_label)
-        axis_x.setLabelFormat('%d')
-        axis_x.setTickCount(len(categories))
-        self.chart.setAxisX(axis_x, series)
-        
-        axis_y = QValueAxis()
-        axis_y.setLabelFormat('%i')
-        axis_y.setTitleText(y_label)
-        self.chart.setAxisY(axis_y, series)
+        self.axis_x.setRange(0, max(len(data) - 1, 1))
+        self.axis_x.setTickCount(max(min(len(categories), 12), 2))
+        self.axis_y.setRange(min(data, default=0), max(data, default=0) or 1)
+        self.axis_y.applyNiceNumbers()
+    
+    def show_points(self, indices):
+        # Trocar todos os pontos de uma vez (um único sinal de atualização),
+        # mantendo o índice original como posição X
+        self.series.replace([QPointF(index, self.data[index]) for index in indices])
@@ -0,0 +1,62 @@
+"""
+Redução de séries longas ao número de pontos que cabe no gráfico.
+
+Usa o algoritmo Largest-Triangle-Three-Buckets (LTTB): o primeiro e o último
+pontos são mantidos e os demais são divididos em baldes; de cada balde fica
+o ponto que forma o maior triângulo com o ponto escolhido no balde anterior
+e a média do balde seguinte. Picos e vales são preservados, ao contrário de
+uma amostragem a intervalos fixos.
+
+As médias dos baldes são calculadas de uma vez com somas acumuladas; cada
+balde é resolvido com operações vetorizadas do NumPy, então o custo é O(n)
+com um laço Python de apenas um passo por ponto exibido.
+"""
+
+
+def lttb_indices(values, threshold):
+    """Índices (crescentes) dos `threshold` pontos escolhidos de `values`"""
+    # Importação local: o NumPy só é carregado para séries que não cabem no gráfico
+    import numpy as np
+
+    y = np.asarray(values, dtype=float)
+    count = len(y)
+    if threshold >= count or threshold < 3:
+        return np.arange(count)
+
+    # Baldes entre o primeiro e o último ponto, que ficam sempre
+    buckets = threshold - 2
+    edges = np.linspace(1, count - 1, buckets + 1).astype(int)
+
+    # Média (x, y) do balde seguinte a cada balde; o último usa o ponto final
+    next_start = np.append(edges[1:buckets], count - 1)
+    next_end = np.append(edges[2:], count)
+    sums = np.concatenate(([0.0], np.cumsum(y)))
+    average_y = (sums[next_end] - sums[next_start]) / (next_end - next_start)
+    average_x = (next_start + next_end - 1) / 2
+
+    selected = np.empty(threshold, dtype=int)
+    selected[0], selected[-1] = 0, count - 1
+    previous = 0
+    for bucket in range(buckets):
+        start, end = edges[bucket], edges[bucket + 1]
+        x = np.arange(start, end)
+        # Dobro da área do triângulo (anterior, candidato, média do seguinte)
+        area = np.abs((previous - average_x[bucket]) * (y[start:end] - y[previous])
+                      - (previous - x) * (average_y[bucket] - y[previous]))
+        previous = start + int(np.argmax(area))
+        selected[bucket + 1] = previous
+    return selected
+
+
+def fit_to_width(values, width, pixels_per_point=1):
+    """Índices dos pontos a exibir em `width` pixels (todos, se couberem)
+
+    Args:
+        values: Lista de valores da série
+        width: Largura disponível em pixels
+        pixels_per_point: Largura mínima de cada ponto (ou barra)
+    """
+    budget = max(int(width // pixels_per_point), 3)
+    if len(values) <= budget:
+        return list(range(len(values)))
+    return lttb_indices(values, budget).tolist()
@@ -0,0 +1,172 @@
+import math
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.figure import Figure
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QSizePolicy
+from PyQt5.QtCore import QTimer, QSize
+from PyQt5.QtGui import QResizeEvent
+import config
+from ui.widgets.downsample import fit_to_width
+
+# Backend opcional (config.CHART_BACKEND = "matplotlib"). Os artistas (fatias,
+# barras, linha) são criados só quando muda a quantidade de itens; nas demais
+# atualizações apenas os valores são trocados e o redesenho é agendado com
+# draw_idle. O layout (tight_layout) é recalculado só ao recriar os artistas
+# ou redimensionar o widget, e os redimensionamentos são aplicados à figura no
+# máximo a cada config.CHART_RESIZE_THROTTLE_MS. Séries maiores que a largura
+# do gráfico são reduzidas (LTTB) antes de exibidas.
+
+class MatplotlibCanvas(FigureCanvas):
+    def __init__(self, parent=None, width=5, height=4, dpi=100):
+        self.fig = Figure(figsize=(width, height), dpi=dpi)
+        self.axes = self.fig.add_subplot(111)
+        
+        FigureCanvas.__init__(self, self.fig)
+        self.setParent(parent)
+        
+        FigureCanvas.setSizePolicy(self, QSizePolicy.Expanding, QSizePolicy.Expanding)
+        FigureCanvas.updateGeometry(self)
+        
+        self.pending_resize = None
+        self.resize_timer = QTimer(self)
+        self.resize_timer.setSingleShot(True)
+        self.resize_timer.setInterval(config.CHART_RESIZE_THROTTLE_MS)
+        self.resize_timer.timeout.connect(self.apply_resize)
+    
+    def resizeEvent(self, event):
+        # O evento é descartado pelo Qt após o retorno; guardar só os tamanhos
+        self.pending_resize = (QSize(event.size()), QSize(event.oldSize()))
+        if not self.resize_timer.isActive():
+            self.resize_timer.start()
+    
+    def apply_resize(self):
+        super().resizeEvent(QResizeEvent(*self.pending_resize))
+        self.fig.tight_layout()
+
+class MatplotlibChartWidget(QWidget):
+    """Base dos gráficos matplotlib"""
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.layout = QVBoxLayout(self)
+        self.canvas = MatplotlibCanvas(self, width=5, height=4)
+        self.layout.addWidget(self.canvas)
+        self.last_update = None
+        self.item_count = None
+    
+    def apply_update(self, update, item_count, build, set_values):
+        """Recria os artistas se a quantidade de itens mudou, senão só troca os valores"""
+        if update == self.last_update:
+            return
+        self.last_update = update
+        
+        if item_count != self.item_count:
+            self.item_count = item_count
+            self.canvas.axes.clear()
+            build()
+            self.canvas.fig.tight_layout()
+        else:
+            set_values()
+        self.canvas.draw_idle()
+
+class PieChartWidget(MatplotlibChartWidget):
+    def update_chart(self, data, labels, title=""):
+        axes = self.canvas.axes
+        total = sum(data)
+        
+        def build():
+            self.wedges, self.texts, self.autotexts = [], [], []
+            if total > 0:
+                self.wedges, self.texts, self.autotexts = axes.pie(
+                    data, labels=labels, autopct='%1.1f%%', startangle=90
+                )
+            axes.axis('equal')  # Equal aspect ratio ensures that pie is drawn as a circle
+            axes.set_title(title)
+        
+        def set_values():
+            if not self.wedges or total <= 0:
+                # Sem fatias para reaproveitar (ou sem valores para exibir)
+                axes.clear()
+                build()
+                return
+            # Mesmo cálculo de ângulos do axes.pie: sentido anti-horário a partir de 90°
+            theta = 90.0
+            for wedge, text, autotext, label, value in zip(self.wedges, self.texts, self.autotexts, labels, data):
+                span = 360.0 * value / total
+                wedge.set_theta1(theta)
+                wedge.set_theta2(theta + span)
+                middle = math.radians(theta + span / 2)
+                x, y = math.cos(middle), math.sin(middle)
+                text.set_text(label)
+                text.set_position((1.1 * x, 1.1 * y))
+                text.set_horizontalalignment('left' if x > 0 else 'right')
+                autotext.set_text(f"{value / total * 100:.1f}%")
+                autotext.set_position((0.6 * x, 0.6 * y))
+                theta += span
+            axes.set_title(title)
+        
+        self.apply_update((tuple(data), tuple(labels), title), len(data), build, set_values)
+
+class BarChartWidget(MatplotlibChartWidget):
+    def update_chart(self, data, categories, title="", xlabel="", ylabel=""):
+        axes = self.canvas.axes
+        update = (tuple(data), tuple(categories), title, xlabel, ylabel)
+        if update == self.last_update:
+            return
+        
+        # Barras de no mínimo 4 pixels
+        indices = fit_to_width(data, self.canvas.width(), 4)
+        data = [data[index] for index in indices]
+        categories = [categories[index] for index in indices]
+        
+        def set_labels():
+            axes.set_title(title)
+            axes.set_xlabel(xlabel)
+            axes.set_ylabel(ylabel)
+        
+        def build():
+            self.bars = axes.bar(categories, data)
+            set_labels()
+            axes.tick_params(axis='x', rotation=45)
+        
+        def set_values():
+            for bar, value in zip(self.bars, data):
+                bar.set_height(value)
+            axes.set_xticks(range(len(categories)))
+            axes.set_xticklabels(categories)
+            axes.relim()
+            axes.autoscale_view()
+            set_labels()
+        
+        self.apply_update(update, len(data), build, set_values)
+
+class LineChartWidget(MatplotlibChartWidget):
+    def update_chart(self, data, categories, title="", xlabel="", ylabel=""):
+        axes = self.canvas.axes
+        update = (tuple(data), tuple(categories), title, xlabel, ylabel)
+        if update == self.last_update:
+            return
+        
+        # Um ponto por pixel, na posição X do índice original
+        indices = fit_to_width(data, self.canvas.width())
+        data = [data[index] for index in indices]
+        categories = [categories[index] for index in indices]
+        
+        def set_labels():
+            axes.set_xticks(indices)
+            axes.set_xticklabels(categories)
+            axes.set_title(title)
+            axes.set_xlabel(xlabel)
+            axes.set_ylabel(ylabel)
+        
+        def build():
+            self.line, = axes.plot(indices, data, marker='o')
+            set_labels()
+            axes.tick_params(axis='x', rotation=45)
+        
+        def set_values():
+            self.line.set_data(indices, data)
+            axes.relim()
+            axes.autoscale_view()
+            set_labels()
+        
+        self.apply_update(update, len(data), build, set_values)
@@ -0,0 +1,305 @@
+from PyQt5.QtWidgets import QWidget, QSizePolicy
+from PyQt5.QtCore import Qt, QRectF, QPointF, QTimer
+from PyQt5.QtGui import QPainter, QColor, QPen, QPolygonF, QPixmap
+import math
+import config
+from ui.widgets.downsample import fit_to_width
+
+# Gráficos desenhados diretamente com QPainter, sem QtChart nem matplotlib.
+# Cada atualização só guarda os valores e agenda um repaint; o desenho é
+# feito em paintEvent, apenas quando o widget está visível, e guardado em um
+# QPixmap. Durante um redimensionamento o último desenho é reaproveitado
+# (esticado) e refeito no máximo a cada config.CHART_RESIZE_THROTTLE_MS.
+
+PALETTE = ['#3498db', '#2ecc71', '#e74c3c', '#f39c12', '#9b59b6', '#1abc9c', '#34495e', '#e67e22']
+GRID_COLOR = QColor('#e0e0e0')
+AXIS_COLOR = QColor('#808080')
+MARGIN = 8
+
+def nice_ticks(low, high, count=5):
+    """Divisões "redondas" (1, 2 ou 5 x 10^n, no mínimo 1) que cobrem o intervalo [low, high]"""
+    if high <= low:
+        high = low + 1
+    raw_step = (high - low) / count
+    magnitude = 10 ** math.floor(math.log10(raw_step))
+    step = max(next(m * magnitude for m in (1, 2, 5, 10) if m * magnitude >= raw_step), 1)
+    start = math.floor(low / step) * step
+    end = math.ceil(high / step) * step
+    return [start + i * step for i in range(int(round((end - start) / step)) + 1)]
+
+def format_value(value):
+    """Formata o valor de um eixo com separador de milhar"""
+    return f"{value:,.0f}".replace(',', '.')
+
+class PainterChartWidget(QWidget):
+    """Base dos gráficos desenhados com QPainter"""
+    
+    def __init__(self, parent=None, title=""):
+        super().__init__(parent)
+        self.title = title
+        self.last_update = None
+        self.values = []
+        self.labels = []
+        self.frame = None  # Último desenho (QPixmap)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        self.setMinimumSize(200, 180)
+        
+        self.resize_timer = QTimer(self)
+        self.resize_timer.setSingleShot(True)
+        self.resize_timer.setInterval(config.CHART_RESIZE_THROTTLE_MS)
+        self.resize_timer.timeout.connect(self.redraw)
+    
+    def set_data(self, update, values, labels, title):
+        """Guarda os dados e agenda o repaint; retorna False se nada mudou"""
+        if update == self.last_update:
+            return False
+        self.last_update = update
+        self.values = [float(value) for value in values]
+        self.labels = [str(label) for label in labels]
+        self.title = title
+        self.redraw()
+        return True
+    
+    def redraw(self):
+        """Descarta o último desenho e agenda um novo"""
+        self.frame = None
+        self.update()
+    
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if not self.resize_timer.isActive():
+            self.resize_timer.start()
+    
+    def paintEvent(self, event):
+        # Refazer o desenho só quando ele foi descartado ou quando o tamanho
+        # mudou e já passou o intervalo mínimo entre redesenhos
+        if self.frame is None or (self.frame.size() != self.frame_size() and not self.resize_timer.isActive()):
+            self.frame = self.render_frame()
+        painter = QPainter(self)
+        painter.drawPixmap(self.rect(), self.frame)
+        painter.end()
+    
+    def frame_size(self):
+        return self.size() * self.devicePixelRatioF()
+    
+    def render_frame(self):
+        frame = QPixmap(self.frame_size())
+        frame.setDevicePixelRatio(self.devicePixelRatioF())
+        frame.fill(Qt.white)
+        
+        painter = QPainter(frame)
+        painter.setFont(self.font())
+        painter.setRenderHint(QPainter.Antialiasing)
+        area = QRectF(self.rect()).adjusted(MARGIN, MARGIN, -MARGIN, -MARGIN)
+        
+        if self.title:
+            font = painter.font()
+            font.setBold(True)
+            painter.setFont(font)
+            height = painter.fontMetrics().height()
+            painter.drawText(QRectF(area.left(), area.top(), area.width(), height), Qt.AlignCenter, self.title)
+            font.setBold(False)
+            painter.setFont(font)
+            area.setTop(area.top() + height + MARGIN)
+        
+        if self.values and area.width() > 0 and area.height() > 0:
+            self.draw(painter, area)
+        painter.end()
+        return frame
+    
+    def draw(self, painter, area):
+        raise NotImplementedError
+
+class PieChartWidget(PainterChartWidget):
+    """Widget para exibir gráficos de pizza"""
+    
+    def __init__(self, parent=None, title="Gráfico de Pizza"):
+        super().__init__(parent, title)
+    
+    def update_chart(self, data, labels, title):
+        """Atualiza os dados do gráfico de pizza
+        
+        Args:
+            data: Lista de valores
+            labels: Lista de rótulos
+            title: Título do gráfico
+        """
+        self.set_data((tuple(data), tuple(labels), title), data, labels, title)
+    
+    def draw(self, painter, area):
+        metrics = painter.fontMetrics()
+        line_height = metrics.height()
+        
+        # Legenda abaixo do gráfico, com os itens quebrados em linhas
+        legend = []
+        x, y = 0, 0
+        for index, label in enumerate(self.labels):
+            width = 14 + metrics.horizontalAdvance(label) + 12
+            if x and x + width > area.width():
+                x, y = 0, y + line_height
+            legend.append((index, label, x, y, width))
+            x += width
+        legend_width = max((item_x + width for _, _, item_x, item_y, width in legend if item_y == y), default=0)
+        legend_top = area.bottom() - y - line_height
+        legend_left = area.left() + (area.width() - legend_width) / 2
+        
+        for index, label, item_x, item_y, width in legend:
+            left, top = legend_left + item_x, legend_top + item_y
+            painter.fillRect(QRectF(left, top + (line_height - 10) / 2, 10, 10), QColor(PALETTE[index % len(PALETTE)]))
+            painter.setPen(Qt.black)
+            painter.drawText(QRectF(left + 14, top, width - 14, line_height), Qt.AlignLeft | Qt.AlignVCenter, label)
+        
+        # Pizza centralizada no espaço restante, começando no topo e em sentido horário
+        total = sum(value for value in self.values if value > 0)
+        side = min(area.width(), legend_top - MARGIN - area.top())
+        if total <= 0 or side <= 0:
+            return
+        pie = QRectF(area.left() + (area.width() - side) / 2, area.top(), side, side)
+        
+        angle = 90.0
+        painter.setPen(QPen(Qt.white, 1))
+        for index, value in enumerate(self.values):
+            if value <= 0:
+                continue
+            span = -360.0 * value / total
+            painter.setBrush(QColor(PALETTE[index % len(PALETTE)]))
+            painter.drawPie(pie, int(angle * 16), int(span * 16))
+            
+            # Percentual dentro da fatia, quando ela tiver espaço para o texto
+            if value / total >= 0.05:
+                middle = math.radians(angle + span / 2)
+                center = QPointF(pie.center().x() + math.cos(middle) * side * 0.32,
+                                 pie.center().y() - math.sin(middle) * side * 0.32)
+                painter.drawText(QRectF(center.x() - 30, center.y() - line_height / 2, 60, line_height),
+                                 Qt.AlignCenter, f"{value / total * 100:.1f}%")
+            angle += span
+        painter.setBrush(Qt.NoBrush)
+
+class AxisChartWidget(PainterChartWidget):
+    """Base dos gráficos com eixo de valores (barras e linha)"""
+    
+    # Exibir os títulos dos eixos (x_label e y_label)
+    show_axis_titles = False
+    # Largura mínima de cada ponto; séries maiores que o gráfico são reduzidas (LTTB)
+    pixels_per_point = 1
+    
+    def __init__(self, parent=None, title=""):
+        super().__init__(parent, title)
+        self.ticks = []
+        self.x_label = ""
+        self.y_label = ""
+    
+    def update_chart(self, data, categories, title, x_label, y_label):
+        """Atualiza os dados do gráfico
+        
+        Args:
+            data: Lista de valores
+            categories: Lista de categorias (rótulos)
+            title: Título do gráfico
+            x_label: Rótulo do eixo X
+            y_label: Rótulo do eixo Y
+        """
+        update = (tuple(data), tuple(categories), title, x_label, y_label)
+        if not self.set_data(update, data, categories, title):
+            return
+        self.x_label = x_label
+        self.y_label = y_label
+        self.ticks = nice_ticks(min(min(self.values, default=0), 0), max(self.values, default=0))
+    
+    def draw(self, painter, area):
+        metrics = painter.fontMetrics()
+        line_height = metrics.height()
+        tick_labels = [format_value(tick) for tick in self.ticks]
+        
+        left = area.left() + max(metrics.horizontalAdvance(label) for label in tick_labels) + 6
+        bottom = area.bottom() - line_height - 4
+        if self.show_axis_titles and self.y_label:
+            left += line_height
+            painter.save()
+            painter.translate(area.left(), area.center().y())
+            painter.rotate(-90)
+            painter.drawText(QRectF(-area.height() / 2, 0, area.height(), line_height), Qt.AlignCenter, self.y_label)
+            painter.restore()
+        if self.show_axis_titles and self.x_label:
+            bottom -= line_height
+            painter.drawText(QRectF(left, area.bottom() - line_height, area.right() - left, line_height),
+                             Qt.AlignCenter, self.x_label)
+        
+        plot = QRectF(left, area.top() + line_height / 2, area.right() - left, bottom - area.top() - line_height / 2)
+        if plot.width() <= 0 or plot.height() <= 0:
+            return
+        
+        # Linhas de grade e rótulos do eixo de valores
+        low, high = self.ticks[0], self.ticks[-1]
+        for tick, label in zip(self.ticks, tick_labels):
+            y = self.to_y(tick, plot, low, high)
+            painter.setPen(GRID_COLOR)
+            painter.drawLine(QPointF(plot.left(), y), QPointF(plot.right(), y))
+            painter.setPen(Qt.black)
+            painter.drawText(QRectF(area.left(), y - line_height / 2, plot.left() - area.left() - 6, line_height),
+                             Qt.AlignRight | Qt.AlignVCenter, label)
+        
+        painter.setPen(AXIS_COLOR)
+        painter.drawLine(QPointF(plot.left(), plot.top()), QPointF(plot.left(), plot.bottom()))
+        painter.drawLine(QPointF(plot.left(), plot.bottom()), QPointF(plot.right(), plot.bottom()))
+        
+        indices = fit_to_width(self.values, plot.width(), self.pixels_per_point)
+        positions = self.draw_series(painter, plot, low, high, indices)
+        
+        # Rótulos das categorias, omitindo os que se sobreporiam ao anterior
+        painter.setPen(Qt.black)
+        last_right = None
+        for x, label in zip(positions, (self.labels[index] for index in indices)):
+            width = metrics.horizontalAdvance(label)
+            if last_right is not None and x - width / 2 < last_right + 4:
+                continue
+            painter.drawText(QRectF(x - width / 2, plot.bottom() + 4, width, line_height), Qt.AlignCenter, label)
+            last_right = x + width / 2
+    
+    @staticmethod
+    def to_y(value, plot, low, high):
+        return plot.bottom() - (value - low) / (high - low) * plot.height()
+    
+    def draw_series(self, painter, plot, low, high, indices):
+        """Desenha os valores dos índices informados e retorna a posição X de cada um"""
+        raise NotImplementedError
+
+class BarChartWidget(AxisChartWidget):
+    """Widget para exibir gráficos de barras"""
+    
+    pixels_per_point = 4
+    
+    def __init__(self, parent=None, title="Gráfico de Barras"):
+        super().__init__(parent, title)
+    
+    def draw_series(self, painter, plot, low, high, indices):
+        slot = plot.width() / len(indices)
+        base = self.to_y(max(low, 0), plot, low, high)
+        color = QColor(PALETTE[0])
+        positions = []
+        for slot_index, index in enumerate(indices):
+            left = plot.left() + slot * slot_index
+            top = self.to_y(self.values[index], plot, low, high)
+            painter.fillRect(QRectF(left + slot * 0.2, min(top, base), slot * 0.6, abs(base - top)), color)
+            positions.append(left + slot / 2)
+        return positions
+
+class LineChartWidget(AxisChartWidget):
+    """Widget para exibir gráficos de linha"""
+    
+    show_axis_titles = True
+    
+    def __init__(self, parent=None, title="Gráfico de Linha"):
+        super().__init__(parent, title)
+    
+    def draw_series(self, painter, plot, low, high, indices):
+        # Posição X pelo índice original, mantendo o espaçamento entre os pontos
+        count = len(self.values)
+        step = plot.width() / (count - 1) if count > 1 else 0
+        start = plot.left() if count > 1 else plot.center().x()
+        positions = [start + step * index for index in indices]
+        
+        painter.setPen(QPen(QColor(PALETTE[0]), 2))
+        painter.drawPolyline(QPolygonF([QPointF(x, self.to_y(self.values[index], plot, low, high))
+                                        for x, index in zip(positions, indices)]))
+        return positions
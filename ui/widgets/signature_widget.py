@@ -15,6 +15,10 @@ class SignatureWidget(QWidget):
         self.image = QPixmap(400, 200)
         self.image.fill(Qt.white)
         
+        # Assinatura carregada do banco e se ela foi alterada desde então
+        self.loaded_base64 = None
+        self.modified = False
+        
         self.setup_ui()
     
     def setup_ui(self):
@@ -62,6 +66,7 @@ class SignatureWidget(QWidget):
                 
                 self.signature_area.setPixmap(self.image)
                 self.lastPoint = pos
+                self.modified = True
     
     def mouseReleaseEvent(self, event):
         if event.button() == Qt.LeftButton:
@@ -71,9 +76,14 @@ class SignatureWidget(QWidget):
         """Limpa a assinatura"""
         self.image.fill(Qt.white)
         self.signature_area.setPixmap(self.image)
+        self.modified = True
     
     def get_signature_base64(self):
         """Retorna a assinatura como uma string base64"""
+        # Sem alterações, devolver os mesmos dados carregados em vez de recodificar o PNG
+        if not self.modified and self.loaded_base64:
+            return self.loaded_base64
+        
         buffer = QBuffer()
         buffer.open(QIODevice.WriteOnly)  # Abre o buffer para escrita
         self.image.save(buffer, "PNG")  # Salva a imagem no buffer
@@ -83,6 +93,8 @@ class SignatureWidget(QWidget):
         """Define a assinatura a partir de uma string base64"""
         if not base64_data:
             self.clear_signature()
+            self.loaded_base64 = None
+            self.modified = False
             return
         
         try:
@@ -92,9 +104,22 @@ class SignatureWidget(QWidget):
                 raise ValueError("Falha ao carregar os dados da assinatura.")
             self.image = pixmap
             self.signature_area.setPixmap(self.image)
+            self.loaded_base64 = base64_data
+            self.modified = False
         except Exception as e:
             print(f"Erro ao carregar assinatura: {str(e)}")
             self.clear_signature()
+            self.loaded_base64 = None
+            self.modified = False
+    
+    def mark_saved(self, base64_data):
+        """Registra que a assinatura atual foi gravada com os dados informados"""
+        self.loaded_base64 = base64_data
+        self.modified = False
+    
+    def is_modified(self):
+        """Indica se a assinatura foi desenhada ou limpa desde que foi carregada"""
+        return self.modified
 
     
     def has_signature(self):
@@ -0,0 +1,161 @@
+"""
+Execução de consultas fora da thread da interface.
+
+As chamadas aos controladores rodam em um QThreadPool próprio (ver
+thread_pool) e os resultados voltam para a thread da interface por sinais. Cada view usa um
+BackgroundLoader, que descarta respostas de carregamentos já substituídos
+por um mais recente.
+"""
+
+import logging
+from PyQt5.QtCore import QObject, QRunnable, QThread, QThreadPool, pyqtSignal, pyqtSlot
+import config
+
+logger = logging.getLogger(config.APP_NAME)
+
+_thread_pool = None
+
+
+def thread_pool() -> QThreadPool:
+    """Pool das tarefas Python em segundo plano
+
+    Não usa QThreadPool.globalInstance(): o Qt usa o pool global
+    internamente (ex.: conversão de imagens ao criar ícones) e espera por ele
+    segurando a thread da interface. Um worker Python ocupando esse pool e
+    aguardando o GIL, que está com a thread da interface, trava o aplicativo.
+    """
+    global _thread_pool
+    if _thread_pool is None:
+        _thread_pool = QThreadPool()
+        _thread_pool.setMaxThreadCount(max(2, QThread.idealThreadCount()))
+    return _thread_pool
+
+
+class WorkerSignals(QObject):
+    """Sinais de um Worker, entregues na thread da interface"""
+    finished = pyqtSignal(object)
+    error = pyqtSignal(str)
+    progress = pyqtSignal(int, int)
+    done = pyqtSignal()         # emitido sempre ao terminar, mesmo se cancelado
+
+
+class Worker(QRunnable):
+    """Executa uma função (em geral um método de controlador) no QThreadPool"""
+
+    def __init__(self, fn, *args, **kwargs):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = WorkerSignals()
+        self.cancelled = False
+
+    def cancel(self):
+        """Marca o worker como cancelado; o resultado não será entregue"""
+        self.cancelled = True
+
+    @pyqtSlot()
+    def run(self):
+        try:
+            self._run()
+        finally:
+            self.signals.done.emit()
+
+    def _run(self):
+        if self.cancelled:
+            return
+
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            logger.error(f"Erro em tarefa de segundo plano: {str(e)}")
+            if not self.cancelled:
+                self.signals.error.emit(str(e))
+            return
+
+        if not self.cancelled:
+            self.signals.finished.emit(result)
+
+
+def run_in_background(fn, *args, on_result=None, on_error=None, on_progress=None, **kwargs) -> Worker:
+    """Executa `fn` no QThreadPool e entrega o resultado em `on_result` na thread da interface
+
+    Com `on_progress`, `fn` também recebe `progress(feito, total)`, cujas
+    chamadas chegam a `on_progress` na thread da interface, e
+    `is_cancelled()`, para interromper tarefas longas após worker.cancel().
+    """
+    worker = Worker(fn, *args, **kwargs)
+    if on_result:
+        worker.signals.finished.connect(on_result)
+    if on_error:
+        worker.signals.error.connect(on_error)
+    if on_progress:
+        worker.signals.progress.connect(on_progress)
+        worker.kwargs.update(progress=worker.signals.progress.emit, is_cancelled=lambda: worker.cancelled)
+    thread_pool().start(worker)
+    return worker
+
+
+class BackgroundLoader(QObject):
+    """Carregador de dados em segundo plano de uma view
+
+    Cada novo carregamento cancela o anterior; respostas que chegam depois de
+    terem sido substituídas são ignoradas. `loading_changed` indica quando a
+    view deve mostrar o estado de carregamento.
+    """
+    loading_changed = pyqtSignal(bool)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._generation = 0
+        self._current = None
+        self._workers = set()
+
+    def is_loading(self):
+        return self._current is not None
+
+    def load(self, fn, on_result, *args, on_error=None, **kwargs):
+        """Executa `fn(*args, **kwargs)` em segundo plano e chama `on_result` com o resultado"""
+        self.cancel()
+        self._generation += 1
+        generation = self._generation
+
+        worker = Worker(fn, *args, **kwargs)
+        worker.signals.finished.connect(
+            lambda result: self._deliver(generation, on_result, result)
+        )
+        worker.signals.error.connect(
+            lambda message: self._fail(generation, on_error, message)
+        )
+
+        # Manter a referência Python até o worker terminar, inclusive se for cancelado
+        worker.signals.done.connect(lambda: self._workers.discard(worker))
+        self._workers.add(worker)
+        self._current = worker
+        self.loading_changed.emit(True)
+        thread_pool().start(worker)
+
+    def cancel(self):
+        """Cancela o carregamento em andamento, se houver"""
+        if self._current is not None:
+            self._current.cancel()
+            self._generation += 1
+            self._current = None
+            self.loading_changed.emit(False)
+
+    def _deliver(self, generation, callback, result):
+        if generation != self._generation:
+            return
+
+        self._current = None
+        self.loading_changed.emit(False)
+        callback(result)
+
+    def _fail(self, generation, callback, message):
+        if generation != self._generation:
+            return
+
+        self._current = None
+        self.loading_changed.emit(False)
+        if callback:
+            callback(message)